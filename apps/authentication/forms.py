@@ -7,6 +7,8 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
 
+from .models import Client, Developer
+
 User = get_user_model()
 
 
@@ -60,3 +62,37 @@ class SignUpForm(UserCreationForm):
     class Meta:
         model = User
         fields = ('username', 'email', 'password1', 'password2')
+
+
+class ClientSignUpForm(SignUpForm):
+    companyName = forms.CharField(
+        max_length=100,
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Company",
+                "class": "form-control"
+            }
+        ))
+
+    def save(self, commit=True):
+        user = super().save(commit)
+        if commit:
+            Client.objects.create(user=user, companyName=self.cleaned_data["companyName"])
+        return user
+
+
+class DeveloperSignUpForm(SignUpForm):
+    programmingLanguage = forms.CharField(
+        max_length=50,
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Programming language",
+                "class": "form-control"
+            }
+        ))
+
+    def save(self, commit=True):
+        user = super().save(commit)
+        if commit:
+            Developer.objects.create(user=user, programmingLanguage=self.cleaned_data["programmingLanguage"])
+        return user
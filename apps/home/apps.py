@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HomeConfig(AppConfig):
+    name = 'apps.home'
+    label = 'home'
+
+    def ready(self):
+        from apps.home import signals  # noqa: F401
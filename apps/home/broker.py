@@ -0,0 +1,218 @@
+"""
+Publish/subscribe broker used to push kanban changes to open boards.
+
+By default events are fanned out in-process, which is enough when the
+server runs a single worker process. Set BROKER_URL (e.g.
+redis://localhost:6379/0) to route events through any Redis-compatible
+server so that every worker process sees every event; gunicorn-prod.py
+warns at startup when it runs several workers without one.
+"""
+import asyncio
+import json
+import os
+import queue
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+CHANNEL_PREFIX = 'planny:'
+
+# Messages buffered per connected board before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def project_channel(project_id):
+    return f"{CHANNEL_PREFIX}kanban:project:{project_id}"
+
+
+# Boards showing every project listen here
+ALL_PROJECTS_CHANNEL = f"{CHANNEL_PREFIX}kanban:all"
+
+
+class Subscription:
+    """
+    One connected client. deliver() may be called from any thread; the
+    messages are consumed with `await get()` on the subscriber's event loop.
+    """
+
+    def __init__(self, broker, channels, loop, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.broker = broker
+        self.channels = list(channels)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, message):
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event loop already closed: the client is gone
+            pass
+
+    def _put(self, message):
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer: drop the backlog and ask it to reload instead
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait({'type': 'resync'})
+
+    async def get(self):
+        message = await self._queue.get()
+        if message.get('type') == 'resync':
+            self.overflowed = False
+        return message
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BlockingSubscription:
+    """
+    One connected client served by a worker thread (the WSGI event stream):
+    messages are consumed with get(timeout), which blocks that thread.
+    """
+
+    def __init__(self, broker, channels, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.broker = broker
+        self.channels = list(channels)
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.overflowed = False
+
+    def deliver(self, message):
+        with self._lock:
+            if self.overflowed:
+                return
+            try:
+                self._queue.put_nowait(message)
+            except queue.Full:
+                # Slow consumer: drop the backlog and ask it to reload instead
+                self.overflowed = True
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+                self._queue.put_nowait({'type': 'resync'})
+
+    def get(self, timeout=None):
+        """
+        The next message, or None if none arrived within `timeout` seconds
+        """
+        try:
+            message = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if message.get('type') == 'resync':
+            with self._lock:
+                self.overflowed = False
+        return message
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fans published messages out to the subscriptions of this process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, channels, loop=None):
+        return self._add(Subscription(self, channels, loop or asyncio.get_event_loop()))
+
+    def subscribe_blocking(self, channels):
+        return self._add(BlockingSubscription(self, channels))
+
+    def _add(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, channel, message):
+        self._fan_out(channel, message)
+
+    def _fan_out(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Publishes through Redis pub/sub; a background thread relays every
+    message back into the local fan-out of each process.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        import redis
+        self._redis = redis.Redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{f"{CHANNEL_PREFIX}*": self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, channel, message):
+        self._redis.publish(channel, json.dumps(message))
+
+    def _on_message(self, item):
+        channel = item['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        self._fan_out(channel, json.loads(item['data']))
+
+
+_broker = None
+_broker_pid = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Returns the process-wide broker, created lazily so that forked
+    workers each get their own Redis connection and relay thread.
+    """
+    global _broker, _broker_pid
+    pid = os.getpid()
+    if _broker is None or _broker_pid != pid:
+        with _broker_lock:
+            if _broker is None or _broker_pid != pid:
+                url = getattr(settings, 'BROKER_URL', '')
+                _broker = RedisBroker(url) if url else InProcessBroker()
+                _broker_pid = pid
+    return _broker
+
+
+def publish_task_event(event_type, project_id, payload):
+    """
+    Publishes a kanban event to the project channel and the all-projects channel
+    """
+    message = dict(payload, type=event_type, projectID=project_id)
+    broker = get_broker()
+    if project_id is not None:
+        broker.publish(project_channel(project_id), message)
+    broker.publish(ALL_PROJECTS_CHANNEL, message)
@@ -0,0 +1,200 @@
+"""
+Per-user calendar events (userCalendarEvent).
+
+Events are read per user and date window through the composite
+(userID, startDate) index: the window query is a single index range scan
+on startDate, which is bounded below by limiting how long an event may
+last (MAX_EVENT_SPAN_DAYS).
+"""
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+
+from apps.home.ics import invalidate_user_feeds
+
+# Longest event accepted; lets window queries put a lower bound on startDate
+MAX_EVENT_SPAN_DAYS = 366
+
+# Most events accepted by one bulk create / update request
+MAX_BULK_EVENTS = 500
+
+# API field -> column, for the fields a client may write
+EVENT_FIELDS = {
+    'eventTitle': 'eventTitle',
+    'eventDescription': 'eventDescription',
+    'startDate': 'startDate',
+    'endDate': 'endDate',
+    'taskID': 'taskID',
+}
+
+EVENT_COLUMNS = """
+    eventID, taskID, eventTitle, eventDescription, startDate, endDate, isTaskBased, createdAt
+"""
+
+
+def get_user_id(username):
+    """
+    userID of the `user` row for a login username, or None
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT userID FROM user WHERE username = %s", [username])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def parse_event_date(value, field):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a YYYY-MM-DD date")
+
+
+def clean_event_fields(data, partial=False):
+    """
+    Validates client input and returns {column: value} for the given fields.
+    With partial=False eventTitle and startDate are required.
+    Raises ValueError on invalid input.
+    """
+    values = {}
+    for field, column in EVENT_FIELDS.items():
+        if field not in data:
+            continue
+        value = data[field]
+        if field == 'eventTitle':
+            value = str(value or '').strip()
+            if not value:
+                raise ValueError('eventTitle is required')
+            value = value[:255]
+        elif field in ('startDate', 'endDate'):
+            value = parse_event_date(value, field) if value else None
+            if field == 'startDate' and value is None:
+                raise ValueError('startDate is required')
+        elif field == 'taskID':
+            value = int(value) if value not in (None, '') else None
+        values[column] = value
+
+    if not partial:
+        if 'eventTitle' not in values:
+            raise ValueError('eventTitle is required')
+        if 'startDate' not in values:
+            raise ValueError('startDate is required')
+        check_event_span(values['startDate'], values.get('endDate'))
+    return values
+
+
+def check_event_span(start_date, end_date):
+    if start_date and end_date:
+        if end_date < start_date:
+            raise ValueError('endDate cannot be before startDate')
+        if (end_date - start_date).days > MAX_EVENT_SPAN_DAYS:
+            raise ValueError(f'Events cannot last more than {MAX_EVENT_SPAN_DAYS} days')
+
+
+def event_to_json(row):
+    """
+    Row (EVENT_COLUMNS) -> the event format documented in CALENDAR_EVENTS_SETUP.md.
+    end.date is null for events without an endDate, so a client that sends an
+    event back as it read it does not turn them into explicit one-day events.
+    """
+    event_id, task_id, title, description, start_date, end_date, is_task_based, created_at = row
+    return {
+        'eventID': event_id,
+        'taskID': task_id,
+        'summary': title,
+        'description': description or '',
+        'start': {'date': start_date.strftime('%Y-%m-%d') if start_date else None},
+        'end': {'date': end_date.strftime('%Y-%m-%d') if end_date else None},
+        'isTaskBased': bool(is_task_based),
+        'createdAt': created_at.isoformat() if created_at else None,
+    }
+
+
+def fetch_user_events(user_id, window_start=None, window_end=None):
+    """
+    Events of one user overlapping [window_start, window_end] (either bound may be None),
+    ordered by start date.
+    """
+    query = f"SELECT {EVENT_COLUMNS} FROM userCalendarEvent WHERE userID = %s"
+    params = [user_id]
+    if window_end:
+        query += " AND startDate <= %s"
+        params.append(window_end)
+    if window_start:
+        # The first condition is the index range, the second the exact overlap test
+        query += " AND startDate >= %s AND COALESCE(endDate, startDate) >= %s"
+        params.extend([window_start - timedelta(days=MAX_EVENT_SPAN_DAYS), window_start])
+    query += " ORDER BY startDate, eventID"
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return [event_to_json(row) for row in cursor.fetchall()]
+
+
+def create_events(user_id, events):
+    """
+    Inserts validated events ({column: value} dicts) for a user in one
+    transaction and returns their eventIDs in order
+    """
+    event_ids = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for values in events:
+            cursor.execute("""
+                INSERT INTO userCalendarEvent
+                (userID, taskID, eventTitle, eventDescription, startDate, endDate, isTaskBased)
+                VALUES (%s, %s, %s, %s, %s, %s, 0)
+            """, [
+                user_id, values.get('taskID'), values['eventTitle'], values.get('eventDescription'),
+                values['startDate'], values.get('endDate'),
+            ])
+            event_ids.append(cursor.lastrowid)
+        invalidate_user_feeds([user_id])
+    return event_ids
+
+
+def update_events(user_id, updates):
+    """
+    Applies [(eventID, {column: value})] to the user's own events in one
+    transaction. Returns the set of eventIDs that were found; task events
+    are projections (apps.home.calendar_sync) and are never found here.
+    Raises ValueError if an update would leave an event with an invalid span.
+    """
+    if not updates:
+        return set()
+    event_ids = [event_id for event_id, _ in updates]
+    placeholders = ','.join(['%s'] * len(event_ids))
+    lock = ' FOR UPDATE' if connection.features.has_select_for_update else ''
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT eventID, startDate, endDate FROM userCalendarEvent
+            WHERE userID = %s AND isTaskBased = 0 AND eventID IN ({placeholders}){lock}
+        """, [user_id] + event_ids)
+        current = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        for event_id, values in updates:
+            if event_id not in current or not values:
+                continue
+            start_date, end_date = current[event_id]
+            check_event_span(values.get('startDate', start_date), values.get('endDate', end_date))
+            assignments = ', '.join(f"{column} = %s" for column in values)
+            cursor.execute(
+                f"UPDATE userCalendarEvent SET {assignments} WHERE eventID = %s AND userID = %s",
+                list(values.values()) + [event_id, user_id]
+            )
+        invalidate_user_feeds([user_id])
+    return set(current)
+
+
+def delete_event(user_id, event_id):
+    """
+    Deletes one of the user's own (non task) events; returns False if it does not exist
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM userCalendarEvent WHERE eventID = %s AND userID = %s AND isTaskBased = 0",
+            [event_id, user_id]
+        )
+        deleted = cursor.rowcount > 0
+    if deleted:
+        invalidate_user_feeds([user_id])
+    return deleted
@@ -0,0 +1,180 @@
+"""
+Projection of assigned tasks into userCalendarEvent.
+
+Every task that has an assignee and at least one of startDate / dueDate
+gets one calendar event (isTaskBased = 1) for the assigned user, carrying
+the task title and project name. The calendar page then reads these rows
+like any other event, with no task/project/user join at view time.
+
+Projections are derived data: a sync deletes the projected rows of the
+affected tasks and re-inserts them from one SELECT of the tasks, so it is
+idempotent and never needs to diff. The event dates are worked out in
+Python (task_event_span) so the SQL stays portable. Callers sync inside
+the transaction that changed the tasks; `rebuild_calendar_events` redoes
+everything. The ICS feeds of every user who gained or lost an event are
+invalidated.
+"""
+from datetime import timedelta
+
+from django.db import connection
+
+from apps.home.calendar_events import MAX_EVENT_SPAN_DAYS
+from apps.home.ics import invalidate_all_feeds, invalidate_user_feeds
+
+# Tasks per projection batch during a full rebuild
+REBUILD_CHUNK_SIZE = 5000
+
+PROJECTION_SELECT = """
+    SELECT t.assignedTo, t.taskID, t.taskTitle, p.projectName, t.startDate, t.dueDate
+    FROM task t
+    JOIN user u ON u.userID = t.assignedTo
+    LEFT JOIN project p ON p.projectID = t.projectID
+    WHERE (t.startDate IS NOT NULL OR t.dueDate IS NOT NULL)
+"""
+
+
+def task_event_span(start_date, due_date):
+    """
+    Task dates as the (first, last) day of its event, even when only one is
+    set or they are swapped. The start is clamped so the event span stays
+    within MAX_EVENT_SPAN_DAYS, which the calendar's (userID, startDate)
+    window queries rely on.
+    """
+    days = [day for day in (start_date, due_date) if day is not None]
+    first, last = min(days), max(days)
+    return max(first, last - timedelta(days=MAX_EVENT_SPAN_DAYS)), last
+
+
+def _projected_users(cursor, task_filter, params):
+    """
+    Users currently holding a projection of, or assigned to, the matching tasks
+    """
+    cursor.execute(f"""
+        SELECT e.userID FROM userCalendarEvent e
+        JOIN task t ON t.taskID = e.taskID
+        WHERE e.isTaskBased = 1 AND {task_filter}
+        UNION
+        SELECT t.assignedTo FROM task t
+        WHERE t.assignedTo IS NOT NULL AND {task_filter}
+    """, params + params)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _project(cursor, task_filter, params, invalidate_feeds=True):
+    """
+    Replaces the projections of the tasks matching `task_filter` (SQL on alias t).
+    Returns the number of events written.
+    """
+    if invalidate_feeds:
+        # Old assignees lose events, new ones gain them
+        invalidate_user_feeds(_projected_users(cursor, task_filter, params))
+    cursor.execute(f"""
+        DELETE FROM userCalendarEvent
+        WHERE isTaskBased = 1 AND taskID IN (SELECT t.taskID FROM task t WHERE {task_filter})
+    """, params)
+    cursor.execute(f"{PROJECTION_SELECT} AND {task_filter}", params)
+    events = []
+    for user_id, task_id, title, project_name, start_date, due_date in cursor.fetchall():
+        first, last = task_event_span(start_date, due_date)
+        events.append((user_id, task_id, (title or '')[:255], f"Project: {project_name or ''}", first, last))
+    if events:
+        cursor.executemany("""
+            INSERT INTO userCalendarEvent
+            (userID, taskID, eventTitle, eventDescription, startDate, endDate, isTaskBased)
+            VALUES (%s, %s, %s, %s, %s, %s, 1)
+        """, events)
+    return len(events)
+
+
+def sync_task_events(task_ids):
+    """
+    Re-projects the given tasks (after a create or an edit of dates, title or assignee)
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    placeholders = ','.join(['%s'] * len(task_ids))
+    with connection.cursor() as cursor:
+        return _project(cursor, f"t.taskID IN ({placeholders})", task_ids)
+
+
+def sync_project_events(project_id):
+    """
+    Re-projects every task of a project (generated tasks, project renamed)
+    """
+    with connection.cursor() as cursor:
+        return _project(cursor, "t.projectID = %s", [project_id])
+
+
+def remove_task_events(task_ids):
+    """
+    Drops the projections of tasks about to be deleted (the taskID foreign
+    key would otherwise just be set to NULL, leaving orphans behind)
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+    placeholders = ','.join(['%s'] * len(task_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT DISTINCT userID FROM userCalendarEvent
+            WHERE isTaskBased = 1 AND taskID IN ({placeholders})
+        """, task_ids)
+        invalidate_user_feeds(row[0] for row in cursor.fetchall())
+        cursor.execute(f"""
+            DELETE FROM userCalendarEvent
+            WHERE isTaskBased = 1 AND taskID IN ({placeholders})
+        """, task_ids)
+        return cursor.rowcount
+
+
+def remove_project_events(project_id):
+    """
+    Drops the projections of every task of a project about to be deleted
+    """
+    with connection.cursor() as cursor:
+        invalidate_user_feeds(_projected_users(cursor, "t.projectID = %s", [project_id]))
+        cursor.execute("""
+            DELETE FROM userCalendarEvent
+            WHERE isTaskBased = 1 AND taskID IN (SELECT t.taskID FROM task t WHERE t.projectID = %s)
+        """, [project_id])
+        return cursor.rowcount
+
+
+def rebuild_calendar_events(project_ids=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Re-projects all tasks (or those of project_ids) in taskID ranges of
+    chunk_size, and removes projections whose task no longer exists.
+    Returns (events_written, orphans_removed).
+    """
+    written = 0
+    with connection.cursor() as cursor:
+        invalidate_all_feeds()
+        cursor.execute("""
+            DELETE FROM userCalendarEvent
+            WHERE isTaskBased = 1 AND (
+                taskID IS NULL
+                OR NOT EXISTS (SELECT 1 FROM task t WHERE t.taskID = userCalendarEvent.taskID)
+            )
+        """)
+        orphans = cursor.rowcount
+
+        scope = ""
+        scope_params = []
+        if project_ids:
+            scope = f" AND t.projectID IN ({','.join(['%s'] * len(project_ids))})"
+            scope_params = list(project_ids)
+
+        cursor.execute(f"SELECT MIN(t.taskID), MAX(t.taskID) FROM task t WHERE 1 = 1{scope}", scope_params)
+        low, high = cursor.fetchone()
+        if low is None:
+            return written, orphans
+
+        for start in range(low, high + 1, chunk_size):
+            written += _project(
+                cursor,
+                f"t.taskID BETWEEN %s AND %s{scope}",
+                [start, start + chunk_size - 1] + scope_params,
+                invalidate_feeds=False,
+            )
+    return written, orphans
@@ -0,0 +1,121 @@
+"""
+Task change feed for kanban delta sync.
+
+Every task write stamps the row with a revision allocated from the
+taskRevision AUTO_INCREMENT table, and deletes leave a row in taskTombstone.
+Clients keep the highest revision they have seen (the watermark) and ask
+for everything newer, so a refresh costs time proportional to what changed.
+
+Revisions are allocated without a lock held to commit, so writers never
+wait for each other here. The price:
+- Revisions have gaps. A rolled-back write burns its number, and clients
+  never assume consecutive revisions.
+- Transactions may commit out of revision order. current_revision()
+  therefore stops at the first recent gap: that gap may be a write still
+  in flight, and a client must not move past it. A gap older than
+  REVISION_SETTLE_SECONDS counts as rolled back, so a write transaction
+  running longer than that may be missed by delta sync until the next
+  full reload.
+"""
+from datetime import datetime, timedelta
+
+from django.db import connection
+
+# Past this many changed rows the client is told to do a full reload instead
+MAX_CHANGES = 2000
+
+# Age after which a gap in the revisions counts as a rolled-back write
+REVISION_SETTLE_SECONDS = 30
+
+# Every REVISION_PRUNE_EVERY allocations, drop all but the last REVISION_KEEP rows
+REVISION_PRUNE_EVERY = 1000
+REVISION_KEEP = 1000
+
+
+def _utc_now(seconds_ago=0):
+    # DATETIME(6) literal, compared as such on MySQL and as text on SQLite
+    return (datetime.utcnow() - timedelta(seconds=seconds_ago)).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def next_revision():
+    """
+    Allocates the next revision number. Only the INSERT statement holds the
+    AUTO_INCREMENT lock, so concurrent write transactions do not serialize.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO taskRevision (allocatedAt) VALUES (%s)", [_utc_now()])
+        revision = cursor.lastrowid
+        if revision % REVISION_PRUNE_EVERY == 0:
+            # The newest row always stays, so the counter survives a restart
+            cursor.execute("DELETE FROM taskRevision WHERE revision <= %s", [revision - REVISION_KEEP])
+    return revision
+
+
+def current_revision():
+    """
+    The watermark: the highest revision up to which every write is
+    committed (or rolled back), see the module docstring
+    """
+    horizon = _utc_now(REVISION_SETTLE_SECONDS)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MAX(revision) FROM taskRevision WHERE allocatedAt < %s", [horizon])
+        settled = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT revision FROM taskRevision WHERE allocatedAt >= %s ORDER BY revision", [horizon]
+        )
+        recent = [row[0] for row in cursor.fetchall()]
+
+    if settled is None:
+        settled = recent[0] - 1 if recent else 0
+    watermark = settled
+    for revision in recent:
+        if revision <= watermark:
+            continue
+        if revision != watermark + 1:
+            break
+        watermark = revision
+    return watermark
+
+
+def record_task_tombstones(task_ids, revision):
+    """
+    Writes tombstones for tasks that are about to be deleted
+    (must run before the DELETE so projectID can still be read).
+    """
+    if not task_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO taskTombstone (taskID, projectID, revision)
+            SELECT taskID, projectID, %s FROM task
+            WHERE taskID IN ({', '.join(['%s'] * len(task_ids))})
+        """, [revision] + list(task_ids))
+
+
+def record_project_tombstones(project_id, revision):
+    """
+    Writes tombstones for every task of a project that is about to be deleted
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO taskTombstone (taskID, projectID, revision)
+            SELECT taskID, projectID, %s FROM task WHERE projectID = %s
+        """, [revision, project_id])
+
+
+def fetch_tombstones(since, until, project_ids=None):
+    """
+    Returns [{'taskID', 'projectID', 'revision'}] deleted in (since, until]
+    """
+    query = "SELECT taskID, projectID, revision FROM taskTombstone WHERE revision > %s AND revision <= %s"
+    params = [since, until]
+    if project_ids:
+        query += f" AND projectID IN ({', '.join(['%s'] * len(project_ids))})"
+        params.extend(project_ids)
+    query += " ORDER BY revision LIMIT %s"
+    params.append(MAX_CHANGES + 1)
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+    return [{'taskID': r[0], 'projectID': r[1], 'revision': r[2]} for r in rows]
@@ -0,0 +1,183 @@
+"""
+Per-user iCalendar (RFC 5545) feed of userCalendarEvent rows, i.e. the
+user's own events plus their projected task events (apps.home.calendar_sync).
+
+Calendar clients poll feeds constantly, so the serialized body and its
+ETag are cached per user. A poll that hits the cache is answered without
+touching the database, and with a 304 when the client's copy is current.
+Any write to a user's events drops that user's entry (invalidate_user_feeds).
+
+Feeds are addressed by a signed token instead of a login session, since
+calendar clients cannot log in. The token signs the userID together with
+the user's key version (calendarFeedKey); rotate_feed_token() bumps the
+version, which revokes every token handed out before. Only the body is
+cached: the version is read on every request (one primary-key lookup), so
+a rotation revokes the old URL on every worker at once, shared cache or not.
+"""
+import hashlib
+from datetime import timedelta, timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection, transaction
+
+FEED_TOKEN_SALT = 'planny.calendar-feed'
+
+# Upper bound on staleness where the cache is not shared between processes
+FEED_CACHE_TIMEOUT = 5 * 60
+
+# Bumped by rebuilds to drop every cached feed at once
+FEED_GENERATION_KEY = 'ics-feed-generation'
+
+PRODID = '-//Planny//Planny Calendar//EN'
+
+
+def feed_key_version(user_id):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT keyVersion FROM calendarFeedKey WHERE userID = %s", [user_id])
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def make_feed_token(user_id, key_version=None):
+    if key_version is None:
+        key_version = feed_key_version(user_id)
+    return signing.Signer(salt=FEED_TOKEN_SALT).sign(f"{user_id}.{key_version}")
+
+
+def read_feed_token(token):
+    """
+    (userID, key version) from a feed token; raises signing.BadSignature if
+    it was tampered with. Tokens from before key versions read as version 0.
+    """
+    user_id, _, key_version = signing.Signer(salt=FEED_TOKEN_SALT).unsign(token).partition('.')
+    return int(user_id), int(key_version or 0)
+
+
+def rotate_feed_token(user_id):
+    """
+    Revokes the user's current feed URL and returns the token of the new one
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE calendarFeedKey SET keyVersion = keyVersion + 1 WHERE userID = %s", [user_id]
+            )
+            if cursor.rowcount == 0:
+                cursor.execute("INSERT INTO calendarFeedKey (userID, keyVersion) VALUES (%s, 1)", [user_id])
+        key_version = feed_key_version(user_id)
+    return make_feed_token(user_id, key_version)
+
+
+def escape_text(value):
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """
+    Splits a content line into 75-octet pieces joined by CRLF + space
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        size = 75 if not parts else 74
+        # Never cut a multi-byte UTF-8 character in half
+        while size < len(encoded) and (encoded[size] & 0xC0) == 0x80:
+            size -= 1
+        parts.append(encoded[:size].decode('utf-8'))
+        encoded = encoded[size:]
+    return '\r\n '.join(parts)
+
+
+def event_lines(row):
+    """
+    (eventID, taskID, eventTitle, eventDescription, startDate, endDate, isTaskBased, updatedAt) -> VEVENT lines
+    """
+    event_id, task_id, title, description, start_date, end_date, is_task_based, updated_at = row
+    uid = f"task-{task_id}@planny" if is_task_based and task_id else f"event-{event_id}@planny"
+    stamp = updated_at.astimezone(timezone.utc) if updated_at.tzinfo else updated_at
+    # All-day events: DTEND is exclusive
+    last_day = end_date or start_date
+    return [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f"DTSTAMP:{stamp.strftime('%Y%m%dT%H%M%SZ')}",
+        f"DTSTART;VALUE=DATE:{start_date.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(last_day + timedelta(days=1)).strftime('%Y%m%d')}",
+        f'SUMMARY:{escape_text(title)}',
+        f'DESCRIPTION:{escape_text(description)}',
+        'END:VEVENT',
+    ]
+
+
+def build_user_feed(user_id):
+    """
+    Serialized VCALENDAR with all of a user's events (one indexed query)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT eventID, taskID, eventTitle, eventDescription, startDate, endDate, isTaskBased, updatedAt
+            FROM userCalendarEvent
+            WHERE userID = %s AND startDate IS NOT NULL
+            ORDER BY startDate, eventID
+        """, [user_id])
+        rows = cursor.fetchall()
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        'X-WR-CALNAME:Planny',
+    ]
+    for row in rows:
+        lines.extend(event_lines(row))
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(fold_line(line) for line in lines) + '\r\n'
+
+
+def _feed_cache_key(user_id):
+    generation = cache.get_or_set(FEED_GENERATION_KEY, 0, None)
+    return f"ics-feed:{generation}:{user_id}"
+
+
+def get_user_feed(user_id):
+    """
+    Returns (etag, body) for a user's feed, from cache when possible
+    """
+    key = _feed_cache_key(user_id)
+    cached = cache.get(key)
+    if cached is None:
+        body = build_user_feed(user_id)
+        etag = '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+        cached = (etag, body)
+        cache.set(key, cached, FEED_CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_user_feeds(user_ids):
+    """
+    Drops the cached feeds of these users once the current transaction commits
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        transaction.on_commit(lambda: cache.delete_many([_feed_cache_key(user_id) for user_id in user_ids]))
+
+
+def invalidate_all_feeds():
+    def _bump():
+        try:
+            cache.incr(FEED_GENERATION_KEY)
+        except ValueError:
+            cache.set(FEED_GENERATION_KEY, 1, None)
+    transaction.on_commit(_bump)
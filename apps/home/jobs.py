@@ -0,0 +1,348 @@
+"""
+Durable outbound job queue.
+
+Slow third-party calls (the Google Apps Script web app behind calendar
+events and invitation emails) are not made inside the request any more.
+The view stores a job row in outboundJob and returns its ID at once; the
+`run_outbound_jobs` management command claims due jobs, runs them and
+retries failures with exponential backoff.
+
+    status: queued -> running -> succeeded
+                              -> queued (retry, runAfter pushed back)
+                              -> failed (attempts exhausted or permanent error)
+
+All timestamps are taken from the database clock (UTC_TIMESTAMP; see
+_db_now() for the SQLite form used by the test suite) so any number of web
+and worker processes agree on what is due.
+
+A job that finds the outbound circuit open is put back until the circuit
+may close again without using up an attempt, so an outage of the remote
+service delays the queue instead of failing it.
+"""
+import json
+import math
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, connections, transaction
+
+from apps.home.outbound_http import CircuitOpenError, get_gas_client
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Jobs per INSERT statement in enqueue_jobs(), keeps each statement well under max_allowed_packet
+ENQUEUE_CHUNK_SIZE = 500
+
+# Retry delay: BACKOFF_BASE_SECONDS * 2^(attempt-1), capped, plus up to 10% jitter
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+
+# A job still 'running' after this long is assumed to belong to a dead worker
+STALE_JOB_SECONDS = 10 * 60
+
+# Longest error / response text kept on the job row
+MAX_STORED_TEXT = 4000
+
+
+def _db_now(shifted=False):
+    """
+    SQL for the database's current UTC time with microseconds; with
+    shifted=True it takes one %s parameter, a signed number of seconds
+    to add. Literal percent signs are doubled: every caller passes params
+    """
+    if connection.vendor == 'sqlite':
+        if shifted:
+            return "strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now', %s || ' seconds')"
+        return "strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now')"
+    if shifted:
+        return "UTC_TIMESTAMP(6) + INTERVAL %s SECOND"
+    return "UTC_TIMESTAMP(6)"
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (e.g. a 4xx response)"""
+
+
+def post_to_gas(payload):
+    """
+    Sends one payload to the Google Apps Script web app and returns its response text.
+    While the circuit is open this raises CircuitOpenError without calling out,
+    and run_job() defers the job without counting an attempt.
+    """
+    response = get_gas_client().post_json(payload['action'], payload)
+    if 400 <= response.status_code < 500 and response.status_code != 429:
+        raise PermanentJobError(f"HTTP {response.status_code}: {response.text[:200]}")
+    response.raise_for_status()
+    return response.text
+
+
+# action -> callable(payload) returning the text stored on the job
+JOB_HANDLERS = {
+    'calendar': post_to_gas,
+    'email': post_to_gas,
+}
+
+
+def enqueue_job(action, payload, created_by=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Stores a job that is due immediately and returns its jobID
+    """
+    if action not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job action: {action}")
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO outboundJob (action, payload, status, maxAttempts, runAfter, createdBy)
+            VALUES (%s, %s, %s, %s, {_db_now()}, %s)
+        """, [action, json.dumps(payload), JOB_QUEUED, max_attempts, created_by])
+        return cursor.lastrowid
+
+
+def enqueue_jobs(action, payloads, created_by=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Stores several jobs in one transaction, one multi-row INSERT per
+    ENQUEUE_CHUNK_SIZE payloads, and returns their jobIDs in payload order.
+
+    One INSERT with a known row count gets a consecutive block of jobIDs
+    (InnoDB reserves it up front; SQLite runs one writer at a time, and
+    auto_increment_increment is assumed to be 1), so the IDs follow from
+    cursor.lastrowid: the first row's on MySQL, the last row's on SQLite.
+    """
+    if action not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job action: {action}")
+    payloads = list(payloads)
+    job_ids = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for i in range(0, len(payloads), ENQUEUE_CHUNK_SIZE):
+            chunk = payloads[i:i + ENQUEUE_CHUNK_SIZE]
+            values = ', '.join([f"(%s, %s, %s, %s, {_db_now()}, %s)"] * len(chunk))
+            params = []
+            for payload in chunk:
+                params += [action, json.dumps(payload), JOB_QUEUED, max_attempts, created_by]
+            cursor.execute(f"""
+                INSERT INTO outboundJob (action, payload, status, maxAttempts, runAfter, createdBy)
+                VALUES {values}
+            """, params)
+            first_id = cursor.lastrowid
+            if connection.vendor == 'sqlite':
+                first_id -= len(chunk) - 1
+            job_ids.extend(range(first_id, first_id + len(chunk)))
+    return job_ids
+
+
+JOB_COLUMNS = """
+    jobID, action, status, attempts, maxAttempts, runAfter,
+    lastError, responseText, createdBy, createdAt, updatedAt
+"""
+
+
+def get_job(job_id):
+    """
+    Returns the job as a dict, or None if it does not exist
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {JOB_COLUMNS} FROM outboundJob WHERE jobID = %s", [job_id])
+        row = cursor.fetchone()
+    return _job_from_row(row) if row else None
+
+
+def get_jobs(job_ids):
+    """
+    Returns the existing jobs among job_ids as dicts, in jobID order
+    """
+    if not job_ids:
+        return []
+    placeholders = ','.join(['%s'] * len(job_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT {JOB_COLUMNS} FROM outboundJob
+            WHERE jobID IN ({placeholders})
+            ORDER BY jobID
+        """, list(job_ids))
+        return [_job_from_row(row) for row in cursor.fetchall()]
+
+
+def _job_from_row(row):
+    return {
+        'jobID': row[0],
+        'action': row[1],
+        'status': row[2],
+        'attempts': row[3],
+        'maxAttempts': row[4],
+        'runAfter': row[5].isoformat() if row[5] else None,
+        'lastError': row[6],
+        'response': row[7],
+        'createdBy': row[8],
+        'createdAt': row[9].isoformat() if row[9] else None,
+        'updatedAt': row[10].isoformat() if row[10] else None,
+    }
+
+
+def requeue_stale_jobs(stale_seconds=STALE_JOB_SECONDS):
+    """
+    Puts jobs left 'running' by a crashed worker back in the queue.
+    Returns the number of jobs requeued.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            UPDATE outboundJob
+            SET status = %s, lockedAt = NULL
+            WHERE status = %s AND lockedAt < {_db_now(shifted=True)}
+        """, [JOB_QUEUED, JOB_RUNNING, -int(stale_seconds)])
+        return cursor.rowcount
+
+
+def claim_next_job():
+    """
+    Marks the oldest due job as running and returns (jobID, action, payload, attempts, maxAttempts),
+    or None when nothing is due. SKIP LOCKED lets several workers claim in parallel.
+    """
+    lock = ''
+    if connection.features.has_select_for_update:
+        # SQLite (tests) has no row locks; it serializes writers instead
+        lock = ' FOR UPDATE'
+        if connection.features.has_select_for_update_skip_locked:
+            lock += ' SKIP LOCKED'
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT jobID, action, payload, attempts, maxAttempts
+            FROM outboundJob
+            WHERE status = %s AND runAfter <= {_db_now()}
+            ORDER BY runAfter, jobID
+            LIMIT 1{lock}
+        """, [JOB_QUEUED])
+        row = cursor.fetchone()
+        if not row:
+            return None
+        job_id, action, payload, attempts, max_attempts = row
+        cursor.execute(f"""
+            UPDATE outboundJob
+            SET status = %s, attempts = attempts + 1, lockedAt = {_db_now()}
+            WHERE jobID = %s
+        """, [JOB_RUNNING, job_id])
+    return job_id, action, json.loads(payload), attempts + 1, max_attempts
+
+
+def backoff_seconds(attempt):
+    """
+    Delay before retrying after the given (1-based) failed attempt
+    """
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+    return delay + random.uniform(0, delay * 0.1)
+
+
+def complete_job(job_id, response_text):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE outboundJob
+            SET status = %s, responseText = %s, lastError = NULL, lockedAt = NULL
+            WHERE jobID = %s
+        """, [JOB_SUCCEEDED, (response_text or '')[:MAX_STORED_TEXT], job_id])
+
+
+def fail_job(job_id, error, attempt, max_attempts, permanent=False):
+    """
+    Schedules a retry with backoff, or marks the job failed once attempts are exhausted.
+    Returns the new status.
+    """
+    error = str(error)[:MAX_STORED_TEXT]
+    with connection.cursor() as cursor:
+        if permanent or attempt >= max_attempts:
+            cursor.execute("""
+                UPDATE outboundJob
+                SET status = %s, lastError = %s, lockedAt = NULL
+                WHERE jobID = %s
+            """, [JOB_FAILED, error, job_id])
+            return JOB_FAILED
+
+        cursor.execute(f"""
+            UPDATE outboundJob
+            SET status = %s, lastError = %s, lockedAt = NULL,
+                runAfter = {_db_now(shifted=True)}
+            WHERE jobID = %s
+        """, [JOB_QUEUED, error, int(backoff_seconds(attempt)), job_id])
+        return JOB_QUEUED
+
+
+def defer_job(job_id, error, delay_seconds):
+    """
+    Puts a claimed job back in the queue for later without counting the
+    attempt it was claimed for. Returns the new status.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            UPDATE outboundJob
+            SET status = %s, attempts = attempts - 1, lastError = %s, lockedAt = NULL,
+                runAfter = {_db_now(shifted=True)}
+            WHERE jobID = %s
+        """, [JOB_QUEUED, str(error)[:MAX_STORED_TEXT], math.ceil(delay_seconds), job_id])
+    return JOB_QUEUED
+
+
+def run_job(job):
+    """
+    Runs one claimed job and records the outcome. Returns the new status.
+    """
+    job_id, action, payload, attempt, max_attempts = job
+    handler = JOB_HANDLERS.get(action)
+    if handler is None:
+        return fail_job(job_id, f"Unknown job action: {action}", attempt, max_attempts, permanent=True)
+    try:
+        response_text = handler(payload)
+    except CircuitOpenError as e:
+        # The call was never made; spread the retries over a little while
+        # so the half-open trial is not met by the whole queue at once
+        return defer_job(job_id, e, e.retry_after + random.uniform(1, 1 + e.retry_after * 0.1))
+    except PermanentJobError as e:
+        return fail_job(job_id, e, attempt, max_attempts, permanent=True)
+    except Exception as e:
+        return fail_job(job_id, e, attempt, max_attempts)
+    complete_job(job_id, response_text)
+    return JOB_SUCCEEDED
+
+
+def run_due_jobs(limit=None, workers=1):
+    """
+    Claims and runs due jobs until none are left (or `limit` were run).
+    With workers > 1 jobs run on a bounded thread pool, each thread with its
+    own DB connection; the outbound client's rate limit still applies.
+    Returns {status: count} for the jobs processed.
+    """
+    results = {}
+    lock = threading.Lock()
+    # Claim attempts so far, shared so threads stop together at `limit`
+    taken = [0]
+
+    def drain():
+        while True:
+            with lock:
+                if limit is not None and taken[0] >= limit:
+                    return
+                taken[0] += 1
+            job = claim_next_job()
+            if job is None:
+                return
+            status = run_job(job)
+            with lock:
+                results[status] = results.get(status, 0) + 1
+
+    if workers <= 1:
+        drain()
+        return results
+
+    def drain_in_thread():
+        try:
+            drain()
+        finally:
+            # Django connections are per thread; release this thread's
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(drain_in_thread) for _ in range(workers)]:
+            future.result()
+    return results
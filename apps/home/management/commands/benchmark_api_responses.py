@@ -0,0 +1,93 @@
+"""
+Measure bytes on the wire and latency of the JSON API with and without
+core.api_middleware (ETag / 304 and compression), in-process against the
+configured database.
+
+    python manage.py benchmark_api_responses --username admin
+    python manage.py benchmark_api_responses --username admin --repeat 20 \\
+        --path "/api/kanban-tasks/?limit=2000" --path /api/projects/
+
+For a large task set, seed first (see seed_data in apps/home/tests.py) or
+point DATABASE_URL at a copy of production.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+
+from core import api_middleware
+
+MIDDLEWARE_PATH = 'core.api_middleware.ApiResponseMiddleware'
+
+DEFAULT_PATHS = ['/api/kanban-tasks/?limit=2000', '/api/projects/', '/api/developers/']
+
+
+def body_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class Command(BaseCommand):
+    help = 'Compare API response sizes and latency before/after ETag and compression'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='Login account to request as')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"API path to request (can be repeated; default {' '.join(DEFAULT_PATHS)})")
+        parser.add_argument('--repeat', type=int, default=10, help='Timed requests per mode (median reported)')
+
+    def measure(self, client, path, **headers):
+        """
+        (status, body bytes, Content-Encoding, median ms, last response)
+        """
+        client.get(path, **headers)  # warm-up
+        timings = []
+        for _ in range(max(1, self.repeat)):
+            started = time.perf_counter()
+            response = client.get(path, **headers)
+            size = body_size(response)
+            timings.append((time.perf_counter() - started) * 1000)
+        return response.status_code, size, response.get('Content-Encoding', '-'), statistics.median(timings), response
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No account named {options['username']!r}")
+
+        host = settings.ALLOWED_HOSTS[0]
+
+        def make_client():
+            client = Client(HTTP_HOST=host)
+            client.force_login(user)
+            return client
+
+        modes = [('gzip', 'gzip')]
+        if api_middleware.brotli is not None:
+            modes.append(('br', 'br, gzip'))
+
+        self.stdout.write(f"{'path':<36} {'mode':<12} {'status':>6} {'bytes':>10} {'encoding':>9} {'median ms':>10}")
+        for path in options['paths'] or DEFAULT_PATHS:
+            rows = []
+            with override_settings(MIDDLEWARE=[m for m in settings.MIDDLEWARE if m != MIDDLEWARE_PATH]):
+                rows.append(('before',) + self.measure(make_client(), path, HTTP_ACCEPT_ENCODING='gzip')[:4])
+
+            client = make_client()
+            etag = None
+            for label, accept in modes:
+                result = self.measure(client, path, HTTP_ACCEPT_ENCODING=accept)
+                rows.append((label,) + result[:4])
+                etag = result[4].get('ETag', etag)
+            if etag:
+                rows.append(('revalidate',) + self.measure(
+                    client, path, HTTP_ACCEPT_ENCODING=modes[-1][1], HTTP_IF_NONE_MATCH=etag
+                )[:4])
+
+            for label, status, size, encoding, median_ms in rows:
+                self.stdout.write(f"{path[:36]:<36} {label:<12} {status:>6} {size:>10} {encoding:>9} {median_ms:>10.1f}")
@@ -0,0 +1,53 @@
+"""
+Measure sprint-scheduling throughput on synthetic projects (no database needed).
+
+    python manage.py benchmark_scheduler
+    python manage.py benchmark_scheduler --sizes 10000 250000 --repeat 10 --sprints 40
+"""
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.home.scheduling import schedule_tasks
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark apps.home.scheduling on synthetic 10k-1M task projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                            help='Task counts to schedule')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per size (the median is reported)')
+        parser.add_argument('--days', type=int, default=5 * 365,
+                            help='Project length in days')
+        parser.add_argument('--sprints', type=int, default=None,
+                            help='Fixed sprint count (default: 2-week sprints)')
+        parser.add_argument('--materialize', action='store_true',
+                            help='Also iterate every task with its dates, as task generation does')
+
+    def handle(self, *args, **options):
+        start = date(2025, 1, 6)
+        end = start + timedelta(days=options['days'])
+
+        self.stdout.write(f"{'tasks':>10} {'sprints':>8} {'median ms':>10} {'min ms':>10} {'tasks/s':>14}")
+        for size in options['sizes']:
+            timings = []
+            for _ in range(max(1, options['repeat'])):
+                began = time.perf_counter()
+                schedule = schedule_tasks(size, start, end, options['sprints'])
+                if options['materialize']:
+                    for _row in schedule.iter_tasks():
+                        pass
+                timings.append(time.perf_counter() - began)
+
+            median = statistics.median(timings)
+            throughput = size / median if median else float('inf')
+            self.stdout.write(
+                f"{size:>10} {schedule.num_sprints:>8} {median * 1000:>10.2f} "
+                f"{min(timings) * 1000:>10.2f} {throughput:>14,.0f}"
+            )
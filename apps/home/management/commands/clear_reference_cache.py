@@ -0,0 +1,25 @@
+"""
+Drop the cached reference data (see apps/home/reference_cache.py), e.g.
+after clients or developers were changed directly in the database.
+Only reaches the web workers when they share a cache (CACHE_URL); the
+default per-process cache expires on REFERENCE_CACHE_TIMEOUT instead.
+
+    python manage.py clear_reference_cache
+    python manage.py clear_reference_cache --list clients --list developers
+"""
+from django.core.management.base import BaseCommand
+
+from apps.home.reference_cache import LOADERS, clear_reference_data
+
+
+class Command(BaseCommand):
+    help = 'Drop cached clients, developers, statuses and project names'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--list', action='append', dest='kinds', choices=sorted(LOADERS),
+                            help='Only drop this list (can be repeated)')
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or sorted(LOADERS)
+        clear_reference_data(*kinds)
+        self.stdout.write(self.style.SUCCESS(f"Dropped {', '.join(kinds)}"))
@@ -0,0 +1,55 @@
+"""
+EXPLAIN the SQL each home view runs and report full table / index scans
+(see apps/home/query_plans.py).
+
+    python manage.py explain_queries
+    python manage.py explain_queries --view kanban_tasks_api --verbose
+    python manage.py explain_queries --min-rows 0 --fail-on-scan    # CI
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.home.query_plans import check_views, full_scans
+
+# Scans of smaller tables (statuses, clients) are cheaper than an index lookup
+DEFAULT_MIN_ROWS = 1000
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the queries of each home view and report full scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', action='append', dest='views',
+                            help='Only check this URL name (can be repeated)')
+        parser.add_argument('--min-rows', type=int, default=DEFAULT_MIN_ROWS,
+                            help=f'Ignore scans estimated below this many rows (default {DEFAULT_MIN_ROWS})')
+        parser.add_argument('--verbose', action='store_true',
+                            help='Print every plan, not only the statements with full scans')
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error if any full scan was found')
+
+    def handle(self, *args, **options):
+        scan_count = 0
+        failed = 0
+
+        for label, result in check_views(options['views']):
+            if isinstance(result, Exception):
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{label}: could not run ({result})"))
+                continue
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {len(result)} statement(s)"))
+            for sql, plan in result:
+                scans = full_scans(plan, options['min_rows'])
+                scan_count += len(scans)
+                if not scans and not options['verbose']:
+                    continue
+                self.stdout.write('  ' + ' '.join(sql.split())[:200])
+                for entry in plan:
+                    line = (f"    {entry['table'] or '-'}: type={entry['type']} key={entry['key'] or '-'} "
+                            f"rows={entry['rows'] if entry['rows'] is not None else '?'} {entry['extra']}")
+                    self.stdout.write(self.style.WARNING(line) if entry in scans else line)
+
+        summary = f"{scan_count} full scan(s), {failed} view(s) could not be run"
+        if options['fail_on_scan'] and (scan_count or failed):
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary) if not scan_count else self.style.WARNING(summary))
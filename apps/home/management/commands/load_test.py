@@ -0,0 +1,202 @@
+"""
+Load-test gunicorn profiles against each other.
+
+Starts gunicorn with each --config in turn on a local port, logs in once,
+then has --concurrency client threads cycle through --path for --duration
+seconds over keep-alive connections, and prints throughput and latency
+percentiles per profile.
+
+    python manage.py load_test --username admin --password secret
+    python manage.py load_test --username admin --password secret \\
+        --config gunicorn-cfg.py --config gunicorn-prod.py --concurrency 64 --duration 30
+    python manage.py load_test --target http://127.0.0.1:5005 --username admin --password secret
+
+Run it against a database with realistic volumes (see the seeding in
+apps/home/tests.py); with DEBUG=True every query is also kept in memory.
+"""
+import http.client
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_CONFIGS = ['gunicorn-cfg.py', 'gunicorn-prod.py']
+DEFAULT_PATHS = ['/tables/', '/projects/', '/api/kanban-tasks/', '/api/projects/', '/api/developers/']
+
+# Seconds to wait for a started server to accept connections
+STARTUP_TIMEOUT = 60
+
+_CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def _cookies(response, jar):
+    for header in response.msg.get_all('Set-Cookie') or []:
+        cookie = SimpleCookie(header)
+        for name, morsel in cookie.items():
+            jar[name] = morsel.value
+    return jar
+
+
+def _cookie_header(jar):
+    return '; '.join(f'{name}={value}' for name, value in jar.items())
+
+
+def login(host, port, username, password):
+    """
+    Logs in through /login/ and returns the Cookie header for the session
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request('GET', '/login/')
+        response = conn.getresponse()
+        page = response.read().decode('utf-8', 'replace')
+        jar = _cookies(response, {})
+        token = _CSRF_INPUT.search(page)
+        body = urlencode({
+            'username': username,
+            'password': password,
+            'csrfmiddlewaretoken': token.group(1) if token else jar.get('csrftoken', ''),
+        })
+        conn.request('POST', '/login/', body=body, headers={
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Cookie': _cookie_header(jar),
+            'Referer': f'http://{host}:{port}/login/',
+        })
+        response = conn.getresponse()
+        response.read()
+        _cookies(response, jar)
+    finally:
+        conn.close()
+    if 'sessionid' not in jar:
+        raise CommandError(f"Login as {username!r} failed (HTTP {response.status})")
+    return _cookie_header(jar)
+
+
+def run_load(host, port, paths, cookie, concurrency, duration):
+    """
+    Returns (latencies in seconds, error count) from `concurrency` threads
+    requesting `paths` round robin until `duration` has passed
+    """
+    deadline = time.monotonic() + duration
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def client(offset):
+        conn = http.client.HTTPConnection(host, port, timeout=60)
+        local, failed = [], 0
+        i = offset
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Cookie': cookie})
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def start_server(config, port):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', config, '--bind', f'127.0.0.1:{port}'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"gunicorn --config {config} exited with code {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/login/')
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise CommandError(f"gunicorn --config {config} did not start within {STARTUP_TIMEOUT}s")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = 'Compare the throughput of gunicorn profiles under concurrent logged-in traffic'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--config', action='append', dest='configs',
+                            help=f"gunicorn config file to start (can be repeated; default {' '.join(DEFAULT_CONFIGS)})")
+        parser.add_argument('--target', help='Load an already running server (http://host:port) instead')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"Path to request (can be repeated; default {' '.join(DEFAULT_PATHS)})")
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--concurrency', type=int, default=32, help='Client threads')
+        parser.add_argument('--duration', type=float, default=20, help='Seconds of load per profile')
+        parser.add_argument('--warmup', type=float, default=3, help='Seconds of untimed load first')
+        parser.add_argument('--port', type=int, default=8765, help='Port for the started servers')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        if options['target']:
+            url = urlsplit(options['target'])
+            runs = [(options['target'], None, url.hostname, url.port or 80)]
+        else:
+            runs = [(config, config, '127.0.0.1', options['port']) for config in options['configs'] or DEFAULT_CONFIGS]
+
+        self.stdout.write(
+            f"{'profile':<24} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for label, config, host, port in runs:
+            process = start_server(config, port) if config else None
+            try:
+                cookie = login(host, port, options['username'], options['password'])
+                if options['warmup'] > 0:
+                    run_load(host, port, paths, cookie, options['concurrency'], options['warmup'])
+                latencies, errors = run_load(host, port, paths, cookie, options['concurrency'], options['duration'])
+            finally:
+                if process:
+                    stop_server(process)
+
+            latencies.sort()
+            self.stdout.write(
+                f"{label:<24} {len(latencies):>9} {len(latencies) / options['duration']:>9.1f} "
+                f"{statistics.median(latencies) * 1000 if latencies else 0:>8.1f} "
+                f"{percentile(latencies, 0.95) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{errors:>7}"
+            )
@@ -0,0 +1,27 @@
+"""
+Rebuild the task projections in userCalendarEvent (see apps/home/calendar_sync.py).
+
+    python manage.py rebuild_calendar_events
+    python manage.py rebuild_calendar_events --project 4 --project 7
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.home.calendar_sync import REBUILD_CHUNK_SIZE, rebuild_calendar_events
+
+
+class Command(BaseCommand):
+    help = 'Re-project assigned tasks into per-user calendar events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help='Limit to this project ID (can be repeated)')
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE,
+                            help=f'Tasks per projection batch (default {REBUILD_CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written, orphans = rebuild_calendar_events(options['projects'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} task event(s), removed {orphans} orphaned projection(s)"
+        ))
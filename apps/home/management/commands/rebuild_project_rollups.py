@@ -0,0 +1,40 @@
+"""
+Rebuild (or check) the per-project task counters in projectRollup.
+
+    python manage.py rebuild_project_rollups            # rebuild everything
+    python manage.py rebuild_project_rollups --check    # report drift only
+    python manage.py rebuild_project_rollups --project 4 --project 7
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.home.rollup import find_rollup_drift, rebuild_project_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild project task counters from the task table and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only report projects whose counters have drifted; exit 1 if any did')
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help='Limit to this project ID (can be repeated)')
+
+    def handle(self, *args, **options):
+        project_ids = options['projects']
+        drift = find_rollup_drift(project_ids)
+
+        for project_id, stored, actual in drift:
+            self.stdout.write(f"Project {project_id}: stored={stored} actual={actual}")
+
+        if options['check']:
+            if drift:
+                raise CommandError(f"{len(drift)} project(s) have drifted counters")
+            self.stdout.write(self.style.SUCCESS('No drift detected'))
+            return
+
+        with transaction.atomic():
+            rebuilt = rebuild_project_rollups(project_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt counters for {rebuilt} project(s), {len(drift)} had drifted"
+        ))
@@ -0,0 +1,53 @@
+"""
+Worker for the outbound job queue (see apps/home/jobs.py).
+
+    python manage.py run_outbound_jobs             # poll forever
+    python manage.py run_outbound_jobs --once      # drain due jobs and exit (cron)
+    python manage.py run_outbound_jobs --poll 5 --concurrency 8
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.home.jobs import requeue_stale_jobs, run_due_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued outbound jobs (calendar events, invitation emails) with retry and backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Run the jobs that are due now, then exit')
+        parser.add_argument('--poll', type=float, default=2.0,
+                            help='Seconds to sleep when the queue is empty (default 2)')
+        parser.add_argument('--batch', type=int, default=50,
+                            help='Jobs to run before re-checking for stale jobs (default 50)')
+        parser.add_argument('--concurrency', type=int, default=settings.OUTBOUND_JOB_CONCURRENCY,
+                            help='Jobs run in parallel threads (default OUTBOUND_JOB_CONCURRENCY); '
+                                 'calls are still capped at GAS_RATE_LIMIT per second')
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                close_old_connections()
+                requeued = requeue_stale_jobs()
+                if requeued:
+                    self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+                results = run_due_jobs(limit=options['batch'], workers=options['concurrency'])
+                if results:
+                    summary = ', '.join(f"{status}={count}" for status, count in sorted(results.items()))
+                    self.stdout.write(f"Processed {sum(results.values())} job(s): {summary}")
+
+                if options['once']:
+                    if sum(results.values()) < options['batch']:
+                        break
+                    continue
+                if not results:
+                    time.sleep(options['poll'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping outbound job worker')
+        finally:
+            close_old_connections()
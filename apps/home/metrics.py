@@ -0,0 +1,58 @@
+"""
+Prometheus text exposition for /metrics/: request metrics from
+core.instrumentation plus the connection pool, outbound HTTP clients and
+reference-data cache.
+All numbers are per worker process.
+"""
+from core.db_pool.pool import pool_metrics
+from core.instrumentation import format_metric, render_request_metrics
+
+from apps.home.outbound_http import outbound_http_metrics
+from apps.home.reference_cache import reference_cache_metrics
+
+
+def render_pool_metrics():
+    samples = {}
+    for alias, metrics in pool_metrics().items():
+        for key, value in metrics.items():
+            if key != 'pid' and isinstance(value, (int, float)) and not isinstance(value, bool):
+                samples.setdefault(key, []).append(({'alias': alias}, value))
+    return '\n'.join(
+        format_metric(f'planny_db_pool_{key}', 'gauge', f'Connection pool {key}', values)
+        for key, values in sorted(samples.items())
+    )
+
+
+def render_outbound_http_metrics():
+    latency, circuit_open = [], []
+    for client, metrics in outbound_http_metrics().items():
+        circuit_open.append(({'client': client}, int(metrics['circuit']['state'] != 'closed')))
+        for action, histogram in metrics['latency'].items():
+            labels = {'client': client, 'action': action}
+            for bound, count in histogram['buckets'].items():
+                latency.append(('_bucket', dict(labels, le=bound), count))
+            latency.append(('_sum', labels, histogram['sum']))
+            latency.append(('_count', labels, histogram['count']))
+    return '\n'.join([
+        format_metric('planny_outbound_http_duration_seconds', 'histogram', 'Outbound HTTP call latency', latency),
+        format_metric('planny_outbound_http_circuit_open', 'gauge', '1 while the circuit breaker is not closed',
+                      circuit_open),
+    ])
+
+
+def render_reference_cache_metrics():
+    samples = []
+    for kind, counts in reference_cache_metrics().items():
+        samples.append(({'cache': kind, 'result': 'hit'}, counts['hits']))
+        samples.append(({'cache': kind, 'result': 'miss'}, counts['misses']))
+    return format_metric('planny_reference_cache_requests_total', 'counter',
+                         'Reference-data cache lookups by list and result', samples)
+
+
+def render_metrics():
+    return '\n'.join([
+        render_request_metrics(),
+        render_pool_metrics(),
+        render_outbound_http_metrics(),
+        render_reference_cache_metrics(),
+    ]) + '\n'
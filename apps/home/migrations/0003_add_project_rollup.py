@@ -0,0 +1,55 @@
+# Migration to add the per-project task rollup table
+
+from django.db import migrations
+
+# Self-contained on purpose: a migration must keep doing what it did when
+# it shipped, whatever apps.home.rollup looks like later
+BACKFILL_SQL = [
+    """
+    INSERT INTO projectRollup
+        (projectID, totalTasks, pendingTasks, inProgressTasks, completedTasks, cancelledTasks)
+    SELECT p.projectID,
+           COUNT(t.taskID),
+           SUM(CASE WHEN t.statusID = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN t.statusID = 2 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN t.statusID = 3 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN t.statusID = 4 THEN 1 ELSE 0 END)
+    FROM project p
+    LEFT JOIN task t ON t.projectID = p.projectID
+    GROUP BY p.projectID;
+    """,
+    """
+    UPDATE project p
+    JOIN projectRollup r ON r.projectID = p.projectID
+    SET p.projectProgress = CASE
+        WHEN r.totalTasks = 0 THEN 0
+        ELSE FLOOR((r.completedTasks + r.inProgressTasks * 0.5) / r.totalTasks * 100)
+    END;
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_add_user_calendar_events'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS projectRollup (
+                projectID INT NOT NULL PRIMARY KEY,
+                totalTasks INT NOT NULL DEFAULT 0,
+                pendingTasks INT NOT NULL DEFAULT 0,
+                inProgressTasks INT NOT NULL DEFAULT 0,
+                completedTasks INT NOT NULL DEFAULT 0,
+                cancelledTasks INT NOT NULL DEFAULT 0,
+                updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (projectID) REFERENCES project(projectID) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS projectRollup;"
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,53 @@
+# Migration to add change tracking (revision + tombstones) for kanban delta sync
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_add_project_rollup'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE task
+                ADD COLUMN revision BIGINT NOT NULL DEFAULT 0,
+                ADD COLUMN updatedAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+                ADD INDEX idx_task_revision (revision, taskID);
+            """,
+            reverse_sql="""
+            ALTER TABLE task
+                DROP INDEX idx_task_revision,
+                DROP COLUMN updatedAt,
+                DROP COLUMN revision;
+            """
+        ),
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS taskRevisionSeq (
+                id TINYINT NOT NULL PRIMARY KEY,
+                revision BIGINT NOT NULL DEFAULT 0
+            ) ENGINE=InnoDB;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS taskRevisionSeq;"
+        ),
+        migrations.RunSQL(
+            "INSERT INTO taskRevisionSeq (id, revision) VALUES (1, 0);",
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS taskTombstone (
+                tombstoneID INT AUTO_INCREMENT PRIMARY KEY,
+                taskID INT NOT NULL,
+                projectID INT,
+                revision BIGINT NOT NULL,
+                deletedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_tombstone_revision (revision)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS taskTombstone;"
+        ),
+    ]
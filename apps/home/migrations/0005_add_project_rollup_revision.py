@@ -0,0 +1,46 @@
+# Migration to track a per-project revision (bumped on every task write) for timeline caching
+
+from django.db import migrations
+
+# Recounts every project and stamps it with the current change-feed revision.
+# Plain SQL so this migration never depends on the live apps.home.rollup code.
+BACKFILL_SQL = [
+    "DELETE FROM projectRollup;",
+    """
+    INSERT INTO projectRollup
+        (projectID, totalTasks, pendingTasks, inProgressTasks, completedTasks, cancelledTasks, revision)
+    SELECT p.projectID,
+           COUNT(t.taskID),
+           SUM(CASE WHEN t.statusID = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN t.statusID = 2 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN t.statusID = 3 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN t.statusID = 4 THEN 1 ELSE 0 END),
+           COALESCE((SELECT revision FROM taskRevisionSeq WHERE id = 1), 0)
+    FROM project p
+    LEFT JOIN task t ON t.projectID = p.projectID
+    GROUP BY p.projectID;
+    """,
+    """
+    UPDATE project p
+    JOIN projectRollup r ON r.projectID = p.projectID
+    SET p.projectProgress = CASE
+        WHEN r.totalTasks = 0 THEN 0
+        ELSE FLOOR((r.completedTasks + r.inProgressTasks * 0.5) / r.totalTasks * 100)
+    END;
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_add_task_revision'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "ALTER TABLE projectRollup ADD COLUMN revision BIGINT NOT NULL DEFAULT 0;",
+            reverse_sql="ALTER TABLE projectRollup DROP COLUMN revision;"
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,34 @@
+# Migration to add the durable outbound job queue (Google Apps Script calls)
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0005_add_project_rollup_revision'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS outboundJob (
+                jobID INT AUTO_INCREMENT PRIMARY KEY,
+                action VARCHAR(32) NOT NULL,
+                payload LONGTEXT NOT NULL,
+                status VARCHAR(16) NOT NULL DEFAULT 'queued',
+                attempts INT NOT NULL DEFAULT 0,
+                maxAttempts INT NOT NULL DEFAULT 5,
+                runAfter DATETIME(6) NOT NULL,
+                lockedAt DATETIME(6) NULL,
+                lastError TEXT NULL,
+                responseText TEXT NULL,
+                createdBy INT NULL,
+                createdAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+                updatedAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+                INDEX idx_outbound_job_due (status, runAfter)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS outboundJob;"
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Migration to serve per-user calendar date windows from one composite index
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0006_add_outbound_jobs'),
+    ]
+
+    operations = [
+        # (userID, startDate) also backs the userID foreign key, so the
+        # single-column userID index becomes redundant
+        migrations.RunSQL(
+            """
+            ALTER TABLE userCalendarEvent
+                ADD INDEX idx_calendar_event_user_start (userID, startDate),
+                DROP INDEX userID;
+            """,
+            reverse_sql="""
+            ALTER TABLE userCalendarEvent
+                ADD INDEX userID (userID),
+                DROP INDEX idx_calendar_event_user_start;
+            """
+        ),
+    ]
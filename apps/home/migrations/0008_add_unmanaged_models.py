@@ -0,0 +1,135 @@
+# Migration state for the unmanaged models in apps/home/models.py.
+# The tables already exist, so this changes no schema.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0007_add_calendar_event_user_start_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Status',
+            fields=[
+                ('statusID', models.AutoField(primary_key=True, serialize=False)),
+                ('statusDesc', models.CharField(max_length=50)),
+            ],
+            options={
+                'db_table': 'status',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Client',
+            fields=[
+                ('clientID', models.AutoField(primary_key=True, serialize=False)),
+                ('companyName', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'client',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Member',
+            fields=[
+                ('userID', models.AutoField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('firstName', models.CharField(max_length=100, null=True)),
+                ('lastName', models.CharField(max_length=100, null=True)),
+                ('email', models.CharField(max_length=255, null=True)),
+            ],
+            options={
+                'db_table': 'user',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Developer',
+            fields=[
+                ('user', models.OneToOneField(db_column='developerID', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='developer', serialize=False, to='home.member')),
+            ],
+            options={
+                'db_table': 'developer',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('projectID', models.AutoField(primary_key=True, serialize=False)),
+                ('projectName', models.CharField(max_length=255)),
+                ('projectType', models.CharField(max_length=100, null=True)),
+                ('startDate', models.DateField(null=True)),
+                ('endDate', models.DateField(null=True)),
+                ('projectProgress', models.IntegerField(default=0)),
+                ('client', models.ForeignKey(db_column='clientID', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='projects', to='home.client')),
+                ('createdBy', models.ForeignKey(db_column='createdBy', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='created_projects', to='home.member')),
+                ('status', models.ForeignKey(db_column='statusID', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='projects', to='home.status')),
+            ],
+            options={
+                'db_table': 'project',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectAssignment',
+            fields=[
+                ('project', models.ForeignKey(db_column='projectID', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='assignments', serialize=False, to='home.project')),
+                ('roleInProject', models.CharField(max_length=50, null=True)),
+                ('developer', models.ForeignKey(db_column='developerID', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='assignments', to='home.developer')),
+            ],
+            options={
+                'db_table': 'projectAssignment',
+                'managed': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='developers',
+            field=models.ManyToManyField(related_name='projects', through='home.ProjectAssignment', to='home.Developer'),
+        ),
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('taskID', models.AutoField(primary_key=True, serialize=False)),
+                ('taskTitle', models.CharField(max_length=255)),
+                ('taskDescription', models.TextField(null=True)),
+                ('startDate', models.DateField(null=True)),
+                ('dueDate', models.DateField(null=True)),
+                ('priority', models.CharField(max_length=20, null=True)),
+                ('revision', models.BigIntegerField(default=0)),
+                ('updatedAt', models.DateTimeField(null=True)),
+                ('assignedTo', models.ForeignKey(db_column='assignedTo', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='assigned_tasks', to='home.member')),
+                ('project', models.ForeignKey(db_column='projectID', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='tasks', to='home.project')),
+                ('status', models.ForeignKey(db_column='statusID', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='tasks', to='home.status')),
+            ],
+            options={
+                'db_table': 'task',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserCalendarEvent',
+            fields=[
+                ('eventID', models.AutoField(primary_key=True, serialize=False)),
+                ('eventTitle', models.CharField(max_length=255)),
+                ('eventDescription', models.TextField(null=True)),
+                ('startDate', models.DateField(null=True)),
+                ('endDate', models.DateField(null=True)),
+                ('isTaskBased', models.BooleanField(default=False)),
+                ('createdAt', models.DateTimeField(null=True)),
+                ('updatedAt', models.DateTimeField(null=True)),
+                ('task', models.ForeignKey(db_column='taskID', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='calendar_events', to='home.task')),
+                ('user', models.ForeignKey(db_column='userID', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='calendar_events', to='home.member')),
+            ],
+            options={
+                'db_table': 'userCalendarEvent',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Migration to index the predicates and sort orders of the hot view queries.
+# `python manage.py explain_queries` checks the resulting plans.
+#
+# project ORDER BY projectID DESC needs no index of its own: InnoDB reads
+# the primary key backwards.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0008_add_unmanaged_models'),
+    ]
+
+    operations = [
+        # Kanban keyset pages (ORDER BY projectID, statusID, taskID), the
+        # projectID filter of every per-project task query, and the grouped
+        # progress aggregate (projectID, statusID), all from one index
+        migrations.RunSQL(
+            "ALTER TABLE task ADD INDEX idx_task_board (projectID, statusID, taskID);",
+            reverse_sql="ALTER TABLE task DROP INDEX idx_task_board;"
+        ),
+        # Timeline rows: WHERE projectID = ? ... ORDER BY startDate, taskID
+        migrations.RunSQL(
+            "ALTER TABLE task ADD INDEX idx_task_project_start (projectID, startDate, taskID);",
+            reverse_sql="ALTER TABLE task DROP INDEX idx_task_project_start;"
+        ),
+        # Kanban ?assignee= (with ?due_from= / ?due_to=) and the calendar
+        # projection's per-assignee lookups
+        migrations.RunSQL(
+            "ALTER TABLE task ADD INDEX idx_task_assignee_due (assignedTo, dueDate);",
+            reverse_sql="ALTER TABLE task DROP INDEX idx_task_assignee_due;"
+        ),
+        # Assignment lists and deletes by project; covering for developerID
+        migrations.RunSQL(
+            "ALTER TABLE projectAssignment ADD INDEX idx_assignment_project (projectID, developerID);",
+            reverse_sql="ALTER TABLE projectAssignment DROP INDEX idx_assignment_project;"
+        ),
+        # Login username -> userID lookup done by most user-scoped views
+        migrations.RunSQL(
+            "ALTER TABLE user ADD INDEX idx_user_username (username);",
+            reverse_sql="ALTER TABLE user DROP INDEX idx_user_username;"
+        ),
+        # Developer lists: developer JOIN user ORDER BY firstName, lastName
+        migrations.RunSQL(
+            "ALTER TABLE user ADD INDEX idx_user_name (firstName, lastName);",
+            reverse_sql="ALTER TABLE user DROP INDEX idx_user_name;"
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Migration to add per-user calendar feed key versions. Feed tokens carry
+# the version they were signed with; bumping it revokes every older token.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0009_add_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS calendarFeedKey (
+                userID INT NOT NULL PRIMARY KEY,
+                keyVersion INT NOT NULL DEFAULT 0,
+                rotatedAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS calendarFeedKey;"
+        ),
+    ]
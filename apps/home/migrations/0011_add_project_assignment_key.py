@@ -0,0 +1,63 @@
+# Migration to give projectAssignment a key of its own. The model used
+# projectID as a stand-in primary key, which made instance save()/delete()
+# touch every assignment of the project. Duplicate (projectID, developerID)
+# rows are dropped before the pair is made unique.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0010_add_calendar_feed_key'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "ALTER TABLE projectAssignment ADD COLUMN assignmentID INT AUTO_INCREMENT PRIMARY KEY FIRST;",
+                    reverse_sql="ALTER TABLE projectAssignment DROP COLUMN assignmentID;"
+                ),
+                migrations.RunSQL(
+                    """
+                    DELETE a FROM projectAssignment a
+                    JOIN projectAssignment b
+                      ON b.projectID = a.projectID AND b.developerID = a.developerID
+                     AND b.assignmentID < a.assignmentID;
+                    """,
+                    reverse_sql=migrations.RunSQL.noop
+                ),
+                migrations.RunSQL(
+                    """
+                    ALTER TABLE projectAssignment
+                        DROP INDEX idx_assignment_project,
+                        ADD UNIQUE INDEX idx_assignment_project (projectID, developerID);
+                    """,
+                    reverse_sql="""
+                    ALTER TABLE projectAssignment
+                        DROP INDEX idx_assignment_project,
+                        ADD INDEX idx_assignment_project (projectID, developerID);
+                    """
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='projectassignment',
+                    name='project',
+                    field=models.ForeignKey(db_column='projectID', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='assignments', to='home.project'),
+                ),
+                migrations.AddField(
+                    model_name='projectassignment',
+                    name='assignmentID',
+                    field=models.AutoField(primary_key=True, serialize=False),
+                    preserve_default=False,
+                ),
+                migrations.AlterUniqueTogether(
+                    name='projectassignment',
+                    unique_together={('project', 'developer')},
+                ),
+            ],
+        ),
+    ]
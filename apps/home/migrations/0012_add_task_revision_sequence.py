@@ -0,0 +1,45 @@
+# Migration to allocate change-feed revisions from an AUTO_INCREMENT table
+# instead of the single taskRevisionSeq row. Updating that row locked it
+# until the writing transaction committed, so all task writes queued behind
+# each other. InnoDB releases the AUTO_INCREMENT lock at the end of the
+# INSERT statement. The counter continues from the old one.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0011_add_project_assignment_key'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS taskRevision (
+                revision BIGINT AUTO_INCREMENT PRIMARY KEY,
+                allocatedAt DATETIME(6) NOT NULL
+            ) ENGINE=InnoDB;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS taskRevision;"
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO taskRevision (revision, allocatedAt)
+            SELECT revision, UTC_TIMESTAMP(6) - INTERVAL 1 DAY FROM taskRevisionSeq
+            WHERE id = 1 AND revision > 0;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            "DROP TABLE taskRevisionSeq;",
+            reverse_sql="""
+            CREATE TABLE taskRevisionSeq (
+                id TINYINT NOT NULL PRIMARY KEY,
+                revision BIGINT NOT NULL DEFAULT 0
+            ) ENGINE=InnoDB;
+            INSERT INTO taskRevisionSeq (id, revision)
+            SELECT 1, COALESCE(MAX(revision), 0) FROM taskRevision;
+            """
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Migration to shorten calendar events written before the 366-day limit
+# (calendar_events.MAX_EVENT_SPAN_DAYS). Window queries only look 366 days
+# back from the window start, so a longer event dropped out of the windows
+# near its end. Like the task projection (calendar_sync.task_event_span),
+# the last 366 days are kept: the start moves up, the end stays.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0012_add_task_revision_sequence'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            UPDATE userCalendarEvent
+            SET startDate = endDate - INTERVAL 366 DAY
+            WHERE endDate > startDate + INTERVAL 366 DAY;
+            """,
+            # The original start dates are not kept
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
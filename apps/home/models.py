@@ -1,10 +1,170 @@
 # -*- encoding: utf-8 -*-
 """
 Copyright (c) 2019 - present AppSeed.us
+
+Unmanaged models over the application's MySQL tables.
+
+The tables are created and altered by hand-written SQL (see the home
+migrations), so Django never creates, alters or drops them: every model
+here is `managed = False` and mirrors the existing columns. Foreign keys
+use db_constraint=False and DO_NOTHING for the same reason.
+
+`Member` is the raw `user` table, not the login model (authentication.User);
+the two are matched on username.
 """
 
 from django.db import models
-from django.contrib.auth.models import User
 
-# Create your models here.
 
+class Status(models.Model):
+    statusID = models.AutoField(primary_key=True)
+    statusDesc = models.CharField(max_length=50)
+
+    class Meta:
+        managed = False
+        db_table = 'status'
+
+    def __str__(self):
+        return self.statusDesc
+
+
+class Client(models.Model):
+    clientID = models.AutoField(primary_key=True)
+    companyName = models.CharField(max_length=100)
+
+    class Meta:
+        managed = False
+        db_table = 'client'
+
+    def __str__(self):
+        return self.companyName
+
+
+class Member(models.Model):
+    userID = models.AutoField(primary_key=True)
+    username = models.CharField(max_length=150)
+    firstName = models.CharField(max_length=100, null=True)
+    lastName = models.CharField(max_length=100, null=True)
+    email = models.CharField(max_length=255, null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'user'
+
+    def __str__(self):
+        return self.username
+
+
+class Developer(models.Model):
+    # developerID is the userID of the developer's `user` row
+    user = models.OneToOneField(
+        Member, primary_key=True, db_column='developerID', related_name='developer',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'developer'
+
+
+class Project(models.Model):
+    projectID = models.AutoField(primary_key=True)
+    projectName = models.CharField(max_length=255)
+    projectType = models.CharField(max_length=100, null=True)
+    status = models.ForeignKey(
+        Status, db_column='statusID', null=True, related_name='projects',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    startDate = models.DateField(null=True)
+    endDate = models.DateField(null=True)
+    # Kept up to date by apps.home.rollup on every task write
+    projectProgress = models.IntegerField(default=0)
+    createdBy = models.ForeignKey(
+        Member, db_column='createdBy', null=True, related_name='created_projects',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    client = models.ForeignKey(
+        Client, db_column='clientID', null=True, related_name='projects',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    developers = models.ManyToManyField(Developer, through='ProjectAssignment', related_name='projects')
+
+    class Meta:
+        managed = False
+        db_table = 'project'
+
+    def __str__(self):
+        return self.projectName
+
+
+class ProjectAssignment(models.Model):
+    assignmentID = models.AutoField(primary_key=True)
+    project = models.ForeignKey(
+        Project, db_column='projectID', related_name='assignments',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    developer = models.ForeignKey(
+        Developer, db_column='developerID', related_name='assignments',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    roleInProject = models.CharField(max_length=50, null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'projectAssignment'
+        unique_together = [('project', 'developer')]
+
+
+class Task(models.Model):
+    taskID = models.AutoField(primary_key=True)
+    project = models.ForeignKey(
+        Project, db_column='projectID', null=True, related_name='tasks',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    taskTitle = models.CharField(max_length=255)
+    taskDescription = models.TextField(null=True)
+    status = models.ForeignKey(
+        Status, db_column='statusID', null=True, related_name='tasks',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    startDate = models.DateField(null=True)
+    dueDate = models.DateField(null=True)
+    assignedTo = models.ForeignKey(
+        Member, db_column='assignedTo', null=True, related_name='assigned_tasks',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    priority = models.CharField(max_length=20, null=True)
+    # Change-feed position, assigned by apps.home.changefeed.next_revision
+    revision = models.BigIntegerField(default=0)
+    updatedAt = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'task'
+
+    def __str__(self):
+        return self.taskTitle
+
+
+class UserCalendarEvent(models.Model):
+    eventID = models.AutoField(primary_key=True)
+    user = models.ForeignKey(
+        Member, db_column='userID', related_name='calendar_events',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    task = models.ForeignKey(
+        Task, db_column='taskID', null=True, related_name='calendar_events',
+        on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    eventTitle = models.CharField(max_length=255)
+    eventDescription = models.TextField(null=True)
+    startDate = models.DateField(null=True)
+    endDate = models.DateField(null=True)
+    # 1 for projections maintained by apps.home.calendar_sync
+    isTaskBased = models.BooleanField(default=False)
+    createdAt = models.DateTimeField(null=True)
+    updatedAt = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'userCalendarEvent'
@@ -0,0 +1,254 @@
+"""
+Shared outbound HTTP client for third-party web services.
+
+One keep-alive requests.Session per process, so repeated calls to the
+same host reuse the TLS connection from urllib3's pool instead of doing a
+fresh handshake each time. Every call has connect/read timeouts, goes
+through a circuit breaker that fails fast while the endpoint is degraded,
+and is timed into a per-action latency histogram.
+
+The Google Apps Script web app (calendar events, invitation emails) is the
+only consumer today, see get_gas_client().
+"""
+import os
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open"""
+
+    def __init__(self, message, retry_after=0.0):
+        super().__init__(message)
+        # Seconds until the circuit lets a trial call through
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    closed    -> calls go through; `failure_threshold` consecutive failures open it
+    open      -> calls fail fast with CircuitOpenError for `reset_timeout` seconds
+    half_open -> one trial call; success closes the circuit, failure re-opens it
+
+    `clock` returns seconds (time.monotonic by default; tests pass a fake).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = int(failure_threshold)
+        self.reset_timeout = float(reset_timeout)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.stats = {'opened': 0, 'rejected': 0}
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.reset_timeout - (self.clock() - self.opened_at)
+                if remaining > 0:
+                    self.stats['rejected'] += 1
+                    raise CircuitOpenError('Circuit open, endpoint is failing', retry_after=remaining)
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self.trial_in_flight:
+                    self.stats['rejected'] += 1
+                    raise CircuitOpenError('Circuit half-open, trial call in progress', retry_after=1.0)
+                self.trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.stats['opened'] += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                **self.stats,
+            }
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all threads of the process: at most `rate` calls
+    per second on average, with bursts of up to `burst` calls.
+    `clock` and `sleep` default to time.monotonic and time.sleep.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def acquire(self):
+        """
+        Blocks until a call may be made
+        """
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+class LatencyHistogram:
+    """
+    Cumulative (Prometheus-style) latency buckets plus count/sum/errors
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds, error=False):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.total += seconds
+            if error:
+                self.errors += 1
+
+    def metrics(self):
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, n in zip(self.buckets + ('+Inf',), self.counts):
+                cumulative += n
+                buckets[str(bound)] = cumulative
+            return {'count': self.count, 'sum': round(self.total, 6), 'errors': self.errors, 'buckets': buckets}
+
+
+class OutboundClient:
+    """
+    Keep-alive JSON client for one endpoint.
+    timeout: (connect, read) seconds, can be overridden per call.
+    rate_limiter: optional RateLimiter applied to every call the circuit lets through.
+    """
+
+    def __init__(self, url, timeout=(3.05, 30), pool_maxsize=10, breaker=None, rate_limiter=None):
+        self.url = url
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.breaker = breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+
+    @property
+    def session(self):
+        # A session inherited across fork() would share sockets with the parent
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session, self._pid = session, os.getpid()
+            return self._session
+
+    def histogram(self, action):
+        with self._lock:
+            if action not in self.histograms:
+                self.histograms[action] = LatencyHistogram()
+            return self.histograms[action]
+
+    def post_json(self, action, payload, timeout=None):
+        """
+        POSTs `payload` as JSON and returns the response.
+        Connection errors, timeouts, 5xx and 429 count as failures for the
+        circuit breaker; other responses (including 4xx) are returned as-is.
+        """
+        # Ask the circuit first: a call it rejects must not spend a rate-limit token
+        self.breaker.before_call()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.post(self.url, json=payload, timeout=timeout or self.timeout)
+            failed = response.status_code >= 500 or response.status_code == 429
+            return response
+        finally:
+            self.histogram(action).observe(time.perf_counter() - started, error=failed)
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+    def metrics(self):
+        return {
+            'circuit': self.breaker.metrics(),
+            'latency': {action: h.metrics() for action, h in list(self.histograms.items())},
+        }
+
+
+_gas_client = None
+_gas_client_lock = threading.Lock()
+
+
+def get_gas_client():
+    """
+    Process-wide client for the Google Apps Script web app
+    """
+    global _gas_client
+    with _gas_client_lock:
+        if _gas_client is None:
+            _gas_client = OutboundClient(
+                settings.GAS_WEBAPP_URL,
+                timeout=(settings.GAS_CONNECT_TIMEOUT, settings.GAS_READ_TIMEOUT),
+                breaker=CircuitBreaker(settings.GAS_CIRCUIT_FAILURES, settings.GAS_CIRCUIT_RESET_SECONDS),
+                rate_limiter=RateLimiter(settings.GAS_RATE_LIMIT) if settings.GAS_RATE_LIMIT > 0 else None,
+            )
+        return _gas_client
+
+
+def outbound_http_metrics():
+    """
+    {client: metrics} for the outbound clients created in this process
+    """
+    return {'gas': _gas_client.metrics()} if _gas_client is not None else {}
@@ -0,0 +1,192 @@
+"""
+Server-Sent Events endpoint for live kanban updates.
+
+Each connection subscribes to the broker and relays task events to the
+browser, so one task write reaches every open board without any further
+DB work.
+
+    GET /api/kanban-events/             events for every project
+    GET /api/kanban-events/?project=4   events for project 4 only
+
+Under ASGI (uvicorn workers) kanban_events_app is mounted by core/asgi.py
+in front of Django, as Django 3.2 cannot stream from async views, and a
+stream costs next to nothing. Under WSGI (gthread / sync workers) the same
+route is the kanban_events view, and each open stream holds a worker
+thread: at most KANBAN_EVENTS_MAX_STREAMS run per process (others get a
+503 and the board polls the change feed), and each ends after
+KANBAN_EVENTS_MAX_SECONDS so the browser reconnects and threads turn over.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.cookies import SimpleCookie
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+
+from apps.home.broker import ALL_PROJECTS_CHANNEL, get_broker, project_channel
+
+KANBAN_EVENTS_PATH = '/api/kanban-events/'
+
+# Comment line sent when idle so proxies do not drop the connection
+KEEPALIVE_SECONDS = 15
+
+# First line of every stream: how long the browser waits before reconnecting
+RETRY_LINE = b'retry: 5000\n\n'
+
+_streams_lock = threading.Lock()
+_open_streams = 0
+
+
+def format_event(message):
+    return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n".encode()
+
+
+def events_channel(project_id):
+    return project_channel(project_id) if project_id is not None else ALL_PROJECTS_CHANNEL
+
+
+def open_event_stream(project_id):
+    """
+    Subscribes a WSGI client and returns its EventStream, or None when this
+    process already serves KANBAN_EVENTS_MAX_STREAMS streams
+    """
+    global _open_streams
+    with _streams_lock:
+        if _open_streams >= getattr(settings, 'KANBAN_EVENTS_MAX_STREAMS', 2):
+            return None
+        _open_streams += 1
+    subscription = get_broker().subscribe_blocking([events_channel(project_id)])
+    return EventStream(subscription, getattr(settings, 'KANBAN_EVENTS_MAX_SECONDS', 300))
+
+
+class EventStream:
+    """
+    Body of a WSGI event stream. The server calls close() when the response
+    ends, whether or not the body was ever iterated, which gives the slot
+    and the subscription back.
+    """
+
+    def __init__(self, subscription, max_seconds):
+        self.subscription = subscription
+        self.max_seconds = max_seconds
+        self._closed = False
+
+    def __iter__(self):
+        yield RETRY_LINE
+        deadline = time.monotonic() + self.max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            message = self.subscription.get(timeout=min(KEEPALIVE_SECONDS, remaining))
+            # A failed keepalive write is how a disconnected client is noticed
+            yield format_event(message) if message else b': keepalive\n\n'
+
+    def close(self):
+        global _open_streams
+        if self._closed:
+            return
+        self._closed = True
+        self.subscription.close()
+        with _streams_lock:
+            _open_streams -= 1
+
+
+def session_user_id(cookie_header):
+    """
+    ID of the active user logged in by the session cookie, or None. Resolved
+    like django.contrib.auth.get_user, so sessions invalidated by a password
+    change (session auth hash) or of deactivated users are refused.
+    """
+    cookies = SimpleCookie()
+    cookies.load(cookie_header)
+    morsel = cookies.get(settings.SESSION_COOKIE_NAME)
+    if not morsel:
+        return None
+    engine = import_module(settings.SESSION_ENGINE)
+    user = get_user(SimpleNamespace(session=engine.SessionStore(morsel.value)))
+    return user.pk if user.is_authenticated else None
+
+
+def _authenticate(cookie_header):
+    close_old_connections()
+    try:
+        return session_user_id(cookie_header)
+    finally:
+        close_old_connections()
+
+
+async def _send_text_response(send, status, text):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+    })
+    await send({'type': 'http.response.body', 'body': text.encode()})
+
+
+async def kanban_events_app(scope, receive, send):
+    headers = dict(scope.get('headers') or [])
+    user_id = await sync_to_async(_authenticate)(headers.get(b'cookie', b'').decode('latin-1'))
+    if not user_id:
+        await _send_text_response(send, 403, 'Authentication required')
+        return
+
+    query = parse_qs(scope.get('query_string', b'').decode())
+    try:
+        project_id = int(query['project'][0]) if query.get('project') else None
+    except ValueError:
+        await _send_text_response(send, 400, 'Invalid project')
+        return
+
+    subscription = get_broker().subscribe([events_channel(project_id)], asyncio.get_running_loop())
+
+    async def wait_for_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': RETRY_LINE, 'more_body': True})
+
+        while not disconnected.done():
+            next_message = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait(
+                {next_message, disconnected},
+                timeout=KEEPALIVE_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if next_message in done:
+                body = format_event(next_message.result())
+            else:
+                next_message.cancel()
+                if disconnected in done:
+                    break
+                body = b': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+        await send({'type': 'http.response.body', 'body': b''})
+    except OSError:
+        # Client went away mid-write
+        pass
+    finally:
+        subscription.close()
+        disconnected.cancel()
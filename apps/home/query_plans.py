@@ -0,0 +1,165 @@
+"""
+Query plan checks for the home views (used by `manage.py explain_queries`).
+
+Each view in VIEW_CHECKS is called in-process with a sample project and
+user taken from the database. The SELECT statements it runs are captured
+through connection.execute_wrapper and then EXPLAINed against the live
+schema, so the report reflects the SQL the views actually send, including
+the ORM queries from apps.home.repositories.
+
+Work answered from cache (timeline sprint overview, ICS feeds) issues no
+query and therefore shows up in no plan.
+"""
+import re
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+# (url name, needs a project ID, query string). Query values may use
+# {project}, {user}, {from} and {to}.
+VIEW_CHECKS = [
+    ('projects', False, {}),
+    ('tables', False, {}),
+    ('edit_project', True, {}),
+    ('project_timeline', True, {}),
+    ('project_timeline_api', True, {'from': '{from}', 'to': '{to}'}),
+    ('kanban_tasks_api', False, {}),
+    ('kanban_tasks_api', False, {'project': '{project}'}),
+    ('kanban_tasks_api', False, {'assignee': '{user}', 'due_from': '{from}', 'due_to': '{to}'}),
+    ('kanban_task_changes_api', False, {'since': '0'}),
+    ('projects_api', False, {}),
+    ('developers_api', False, {}),
+    ('calendar', False, {}),
+    ('user_calendar_events_api', False, {'from': '{from}', 'to': '{to}'}),
+]
+
+# Plan access types that read a whole table or a whole index
+FULL_SCAN_TYPES = ('ALL', 'index')
+
+_SQLITE_TABLE = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+
+
+def sample_ids():
+    """
+    (projectID, userID, username) to run the views with: the newest project
+    and the user with the most assigned tasks (or any user)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MAX(projectID) FROM project")
+        project_id = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT u.userID, u.username FROM user u
+            LEFT JOIN task t ON t.assignedTo = u.userID
+            GROUP BY u.userID, u.username
+            ORDER BY COUNT(t.taskID) DESC, u.userID
+            LIMIT 1
+        """)
+        row = cursor.fetchone()
+    user_id, username = row if row else (None, '')
+    return project_id, user_id, username
+
+
+def capture_view_queries(url_name, args, query, username):
+    """
+    Calls a view and returns the distinct SELECT statements it ran as [(sql, params)]
+    """
+    path = reverse(url_name, args=args)
+    request = RequestFactory().get(path, query, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+    # Unsaved login user: passes login_required and maps to the sample `user` row by username
+    request.user = get_user_model()(username=username, is_staff=True)
+    request.resolver_match = match = resolve(path)
+
+    statements = {}
+
+    def capture(execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            statements.setdefault(sql, params)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+    return list(statements.items())
+
+
+def explain(sql, params):
+    """
+    Plan of one statement as [{'table', 'type', 'key', 'rows', 'extra'}].
+    MySQL rows come from EXPLAIN; SQLite ones from EXPLAIN QUERY PLAN
+    (no row estimates, so 'rows' is None).
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = []
+            for row in cursor.fetchall():
+                detail = row[-1]
+                match = _SQLITE_TABLE.match(detail)
+                plan.append({
+                    'table': match.group(1) if match else '',
+                    'type': ('index' if 'USING' in detail else 'ALL') if match else 'ref',
+                    'key': None,
+                    'rows': None,
+                    'extra': detail,
+                })
+            return plan
+
+        cursor.execute('EXPLAIN ' + sql, params)
+        columns = [col[0].lower() for col in cursor.description]
+        return [
+            {
+                'table': entry.get('table') or '',
+                'type': entry.get('type') or '',
+                'key': entry.get('key'),
+                'rows': entry.get('rows'),
+                'extra': entry.get('extra') or '',
+            }
+            for entry in (dict(zip(columns, row)) for row in cursor.fetchall())
+        ]
+
+
+def full_scans(plan, min_rows=0):
+    """
+    Plan entries reading a whole table or index of at least min_rows
+    estimated rows (always reported when the estimate is unknown)
+    """
+    return [
+        entry for entry in plan
+        if entry['type'] in FULL_SCAN_TYPES and (entry['rows'] is None or entry['rows'] >= min_rows)
+    ]
+
+
+def check_views(url_names=None):
+    """
+    Yields (label, [(sql, plan)]) per entry of VIEW_CHECKS, or (label, exception)
+    when the view could not be run
+    """
+    project_id, user_id, username = sample_ids()
+    today = date.today()
+    values = {
+        'project': project_id,
+        'user': user_id,
+        'from': (today - timedelta(days=30)).isoformat(),
+        'to': (today + timedelta(days=30)).isoformat(),
+    }
+
+    for url_name, needs_project, query in VIEW_CHECKS:
+        if url_names and url_name not in url_names:
+            continue
+        query = {key: value.format(**values) for key, value in query.items()}
+        label = url_name + ('?' + '&'.join(f'{k}={v}' for k, v in query.items()) if query else '')
+        if needs_project and project_id is None:
+            yield label, LookupError('no project rows to run it with')
+            continue
+        try:
+            args = [project_id] if needs_project else []
+            statements = capture_view_queries(url_name, args, query, username)
+            yield label, [(sql, explain(sql, params)) for sql, params in statements]
+        except Exception as e:
+            yield label, e
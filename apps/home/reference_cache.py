@@ -0,0 +1,104 @@
+"""
+Cache for rarely-changing reference data: clients, developers, statuses and
+the project name list.
+
+The lists are kept in Django's default cache (CACHES in core/settings.py:
+per-process memory unless CACHE_URL points at Redis) for
+REFERENCE_CACHE_TIMEOUT seconds, and dropped as soon as a write through
+Django touches them: ORM saves/deletes of the unmanaged models and login
+accounts (apps/home/signals.py), and the views that write the tables with
+raw SQL (projects, client and developer sign-up). Rows written outside
+Django show up after the timeout, or, with a shared (Redis)
+cache, immediately after `python manage.py clear_reference_cache`.
+
+Hits and misses are counted per list and process, and exported on /metrics/.
+"""
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.home.repositories import list_clients, list_developers, list_project_names, list_statuses
+
+CACHE_KEY_PREFIX = 'reference'
+
+LOADERS = {
+    'clients': list_clients,
+    'developers': list_developers,
+    'statuses': list_statuses,
+    'project_names': list_project_names,
+}
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def _cache_key(kind):
+    return f"{CACHE_KEY_PREFIX}:{kind}"
+
+
+def _count(kind, outcome):
+    with _counters_lock:
+        _counters[(kind, outcome)] += 1
+
+
+def get_reference(kind):
+    """
+    The cached list for `kind` (a key of LOADERS), loaded on a miss
+    """
+    key = _cache_key(kind)
+    value = cache.get(key)
+    if value is None:
+        _count(kind, 'miss')
+        value = LOADERS[kind]()
+        cache.set(key, value, getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 300))
+    else:
+        _count(kind, 'hit')
+    return value
+
+
+def get_clients(order_by_name=False):
+    clients = get_reference('clients')
+    if order_by_name:
+        clients = sorted(clients, key=lambda c: (c['companyName'] or '').lower())
+    return clients
+
+
+def get_developers():
+    return get_reference('developers')
+
+
+def get_status_names():
+    return get_reference('statuses')
+
+
+def get_project_names():
+    return get_reference('project_names')
+
+
+def clear_reference_data(*kinds):
+    """
+    Drops the given lists (all of them when none are given) right away
+    """
+    cache.delete_many([_cache_key(kind) for kind in (kinds or LOADERS)])
+
+
+def invalidate_reference_data(*kinds):
+    """
+    Drops the given lists (all of them when none are given) once the
+    current transaction commits
+    """
+    transaction.on_commit(lambda: clear_reference_data(*kinds))
+
+
+def reference_cache_metrics():
+    """
+    {kind: {'hits': n, 'misses': n}} for this process
+    """
+    with _counters_lock:
+        return {
+            kind: {'hits': _counters[(kind, 'hit')], 'misses': _counters[(kind, 'miss')]}
+            for kind in LOADERS
+        }
@@ -0,0 +1,171 @@
+"""
+Query layer over the unmanaged models in apps.home.models.
+
+Views get querysets and plain dicts from here instead of building SQL
+and indexing result tuples. Every function issues a fixed number of
+queries regardless of row count (joins through select_related, narrow
+columns through only()/values()), which the budgets in apps/home/tests.py
+rely on.
+
+
+The reference lists (clients, developers, statuses, project names) are
+plain dicts so apps.home.reference_cache can cache them as they are.
+
+The iter_*_chunks() generators behind the exports are the exception to
+the fixed query count: one query per chunk of rows.
+"""
+from django.db.models import F, Q
+
+from apps.home.models import Client, Developer, Project, ProjectAssignment, Status, Task
+
+PROJECT_LIST_FIELDS = (
+    'projectID', 'projectName', 'startDate', 'endDate', 'projectProgress', 'status',
+    'client__companyName',
+)
+
+
+def list_clients(order_by_name=False):
+    """
+    [{'clientID', 'companyName'}] for client selects
+    """
+    clients = Client.objects.values('clientID', 'companyName')
+    if order_by_name:
+        clients = clients.order_by('companyName')
+    return list(clients)
+
+
+def list_developers():
+    """
+    [{'developerID', 'username', 'firstName', 'lastName', 'email'}] from the
+    developer's `user` row, ordered by name (one joined query)
+    """
+    return list(
+        Developer.objects.values(
+            developerID=F('user_id'),
+            username=F('user__username'),
+            firstName=F('user__firstName'),
+            lastName=F('user__lastName'),
+            email=F('user__email'),
+        ).order_by('user__firstName', 'user__lastName')
+    )
+
+
+def list_statuses():
+    """
+    {statusID: statusDesc}
+    """
+    return dict(Status.objects.values_list('statusID', 'statusDesc'))
+
+
+def list_projects():
+    """
+    Projects with their client name, newest first (one joined query).
+    Status names come from the cached list_statuses() instead of a join.
+    """
+    return list(
+        Project.objects.select_related('client')
+        .only(*PROJECT_LIST_FIELDS)
+        .order_by('-projectID')
+    )
+
+
+def iter_project_chunks(chunk_size, status_ids=None, client_ids=None):
+    """
+    Yields lists of at most chunk_size projects, loaded like list_projects(),
+    keyset-paged on projectID
+    """
+    projects = Project.objects.select_related('client').only(*PROJECT_LIST_FIELDS).order_by('-projectID')
+    if status_ids:
+        projects = projects.filter(status_id__in=status_ids)
+    if client_ids:
+        projects = projects.filter(client_id__in=client_ids)
+
+    last_id = None
+    while True:
+        page = projects if last_id is None else projects.filter(projectID__lt=last_id)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1].projectID
+
+
+def iter_assignment_chunks(chunk_size, project_ids=None, developer_ids=None):
+    """
+    Yields lists of at most chunk_size assignment dicts ({'projectID',
+    'projectName', 'developerID', 'username', 'firstName', 'lastName',
+    'roleInProject'}), keyset-paged on (projectID, developerID)
+    """
+    assignments = ProjectAssignment.objects.values(
+        'roleInProject',
+        projectID=F('project_id'),
+        projectName=F('project__projectName'),
+        developerID=F('developer_id'),
+        username=F('developer__user__username'),
+        firstName=F('developer__user__firstName'),
+        lastName=F('developer__user__lastName'),
+    ).order_by('project_id', 'developer_id')
+    if project_ids:
+        assignments = assignments.filter(project_id__in=project_ids)
+    if developer_ids:
+        assignments = assignments.filter(developer_id__in=developer_ids)
+
+    last = None
+    while True:
+        page = assignments
+        if last is not None:
+            page = assignments.filter(
+                Q(project_id__gt=last['projectID'])
+                | Q(project_id=last['projectID'], developer_id__gt=last['developerID'])
+            )
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[-1]
+
+
+def list_project_names():
+    """
+    [{'projectID', 'projectName'}] ordered by name
+    """
+    return list(Project.objects.values('projectID', 'projectName').order_by('projectName'))
+
+
+def get_project(project_id):
+    """
+    The project row, or None
+    """
+    return Project.objects.filter(projectID=project_id).first()
+
+
+def assigned_developer_ids(project_id):
+    return list(
+        ProjectAssignment.objects.filter(project_id=project_id).values_list('developer_id', flat=True)
+    )
+
+
+def assign_developers(project_id, developer_ids, role='Developer'):
+    """
+    Adds one projectAssignment row per developer in a single INSERT
+    (a developer listed twice is assigned once)
+    """
+    ProjectAssignment.objects.bulk_create([
+        ProjectAssignment(project_id=project_id, developer_id=developer_id, roleInProject=role)
+        for developer_id in dict.fromkeys(developer_ids)
+    ])
+
+
+def delete_project_rows(project_id):
+    """
+    Deletes a project with its tasks and assignments. The models use
+    DO_NOTHING, so each delete is a single DELETE ... WHERE statement.
+    Callers handle tombstones, calendar projections and the rollup first.
+    """
+    Task.objects.filter(project_id=project_id).delete()
+    ProjectAssignment.objects.filter(project_id=project_id).delete()
+    Project.objects.filter(projectID=project_id).delete()
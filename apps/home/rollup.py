@@ -0,0 +1,263 @@
+"""
+Per-project task rollup.
+
+The projectRollup table keeps task counters for every project and
+project.projectProgress is kept in step with it, so list pages and the
+timeline can read progress straight from the project row instead of
+recomputing it from the task table on every hit.
+
+Every code path that inserts, updates or deletes tasks must call
+apply_task_change() (or rebuild_project_rollups() for bulk changes).
+The row also carries the project's revision (the change-feed revision of
+its latest write), which caches such as the timeline key on.
+"""
+from django.db import connection
+
+from apps.home.changefeed import next_revision
+
+# task.statusID values used by the progress weighting
+STATUS_PENDING = 1
+STATUS_IN_PROGRESS = 2
+STATUS_COMPLETED = 3
+STATUS_CANCELLED = 4
+
+STATUS_COLUMNS = {
+    STATUS_PENDING: 'pendingTasks',
+    STATUS_IN_PROGRESS: 'inProgressTasks',
+    STATUS_COMPLETED: 'completedTasks',
+    STATUS_CANCELLED: 'cancelledTasks',
+}
+
+COUNTER_COLUMNS = ['totalTasks', 'pendingTasks', 'inProgressTasks', 'completedTasks', 'cancelledTasks']
+
+
+def progress_from_counters(total, in_progress, completed):
+    """
+    Same weighting as calculate_project_progress:
+    Completed = 1.0, In Progress = 0.5, everything else = 0.0
+    """
+    if not total:
+        return 0
+    weighted_score = completed + in_progress * 0.5
+    return int((weighted_score / total) * 100)
+
+
+def _status_id(status_id):
+    if status_id is None:
+        return None
+    try:
+        return int(status_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_task_change(project_id, old_status=None, new_status=None, count=1, created=False, deleted=False,
+                      revision=None):
+    """
+    Adjust the counters of one project for `count` tasks whose status moved
+    from old_status to new_status, and record the write's revision.
+    - created=True: the tasks are new (old_status is ignored)
+    - deleted=True: the tasks were removed (new_status is ignored)
+    A project without a rollup row is rebuilt from the task table instead.
+    """
+    if project_id is None or count <= 0:
+        return
+
+    old_status = None if created else _status_id(old_status)
+    new_status = None if deleted else _status_id(new_status)
+
+    deltas = dict.fromkeys(COUNTER_COLUMNS, 0)
+    if created:
+        deltas['totalTasks'] += count
+    if deleted:
+        deltas['totalTasks'] -= count
+    if old_status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[old_status]] -= count
+    if new_status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[new_status]] += count
+
+    if not any(deltas.values()):
+        # Counters unchanged (e.g. a title edit) but caches still need the new revision
+        if revision is not None:
+            touch_project_revision(project_id, revision)
+        return
+
+    assignments = ', '.join(f"{col} = {col} + %s" for col in COUNTER_COLUMNS)
+    values = [deltas[col] for col in COUNTER_COLUMNS]
+    if revision is not None:
+        assignments += ", revision = %s"
+        values.append(revision)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE projectRollup SET {assignments} WHERE projectID = %s",
+            values + [project_id]
+        )
+        if cursor.rowcount == 0:
+            # No counters yet (new project or never backfilled): the task
+            # table already reflects this write, so just rebuild the row
+            rebuild_project_rollups([project_id])
+            return
+
+        cursor.execute(
+            "SELECT totalTasks, inProgressTasks, completedTasks FROM projectRollup WHERE projectID = %s",
+            [project_id]
+        )
+        total, in_progress, completed = cursor.fetchone()
+        cursor.execute(
+            "UPDATE project SET projectProgress = %s WHERE projectID = %s",
+            [progress_from_counters(total, in_progress, completed), project_id]
+        )
+
+
+def lock_task(task_id):
+    """
+    Returns (projectID, statusID) of a task, or None, locking the row until
+    the enclosing transaction ends so concurrent writes to the same task
+    apply their counter deltas one after the other
+    """
+    query = "SELECT projectID, statusID FROM task WHERE taskID = %s"
+    if connection.features.has_select_for_update:
+        query += " FOR UPDATE"
+    with connection.cursor() as cursor:
+        cursor.execute(query, [task_id])
+        return cursor.fetchone()
+
+
+def touch_project_revision(project_id, revision=None):
+    """
+    Marks a project as changed without touching its counters
+    (e.g. after its dates were edited). Allocates a new revision by default.
+    """
+    if revision is None:
+        revision = next_revision()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE projectRollup SET revision = %s WHERE projectID = %s",
+            [revision, project_id]
+        )
+        if cursor.rowcount == 0:
+            rebuild_project_rollups([project_id])
+
+
+def get_project_rollup(project_id):
+    """
+    Returns the counters of one project as a dict, or None if the project
+    has no rollup row.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {', '.join(COUNTER_COLUMNS)} FROM projectRollup WHERE projectID = %s",
+            [project_id]
+        )
+        row = cursor.fetchone()
+    if not row:
+        return None
+    return dict(zip(COUNTER_COLUMNS, row))
+
+
+def compute_project_rollups(project_ids=None):
+    """
+    Recomputes the counters from the task table.
+    Returns {projectID: {column: value}} for the given projects (all
+    projects when project_ids is None), including projects without tasks.
+    """
+    query = """
+        SELECT p.projectID,
+               COUNT(t.taskID),
+               SUM(CASE WHEN t.statusID = 1 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN t.statusID = 2 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN t.statusID = 3 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN t.statusID = 4 THEN 1 ELSE 0 END)
+        FROM project p
+        LEFT JOIN task t ON t.projectID = p.projectID
+    """
+    params = []
+    if project_ids is not None:
+        if not project_ids:
+            return {}
+        query += f" WHERE p.projectID IN ({', '.join(['%s'] * len(project_ids))})"
+        params = list(project_ids)
+    query += " GROUP BY p.projectID"
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    return {
+        row[0]: dict(zip(COUNTER_COLUMNS, [int(v or 0) for v in row[1:]]))
+        for row in rows
+    }
+
+
+def rebuild_project_rollups(project_ids=None):
+    """
+    Rebuilds counters and project.projectProgress from scratch for the given
+    projects (all projects when project_ids is None).
+    Returns the number of projects rebuilt.
+    """
+    if project_ids is not None:
+        project_ids = list(dict.fromkeys(project_ids))
+    rollups = compute_project_rollups(project_ids)
+    # A fresh revision, so anything cached before the rebuild is older
+    revision = next_revision()
+
+    with connection.cursor() as cursor:
+        if project_ids is None:
+            cursor.execute("DELETE FROM projectRollup")
+        elif project_ids:
+            cursor.execute(
+                f"DELETE FROM projectRollup WHERE projectID IN ({', '.join(['%s'] * len(project_ids))})",
+                project_ids
+            )
+
+        if rollups:
+            cursor.executemany(
+                f"INSERT INTO projectRollup (projectID, {', '.join(COUNTER_COLUMNS)}, revision) "
+                f"VALUES (%s, {', '.join(['%s'] * len(COUNTER_COLUMNS))}, %s)",
+                [
+                    [pid] + [counters[col] for col in COUNTER_COLUMNS] + [revision]
+                    for pid, counters in rollups.items()
+                ]
+            )
+            cursor.executemany(
+                "UPDATE project SET projectProgress = %s WHERE projectID = %s",
+                [
+                    [progress_from_counters(c['totalTasks'], c['inProgressTasks'], c['completedTasks']), pid]
+                    for pid, c in rollups.items()
+                ]
+            )
+
+    return len(rollups)
+
+
+def delete_project_rollup(project_id):
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM projectRollup WHERE projectID = %s", [project_id])
+
+
+def find_rollup_drift(project_ids=None):
+    """
+    Compares stored counters with the task table.
+    Returns a list of (projectID, stored_counters, actual_counters) for every
+    project whose rollup row is missing or out of date.
+    """
+    actual = compute_project_rollups(project_ids)
+
+    query = f"SELECT projectID, {', '.join(COUNTER_COLUMNS)} FROM projectRollup"
+    params = []
+    if project_ids is not None:
+        if not project_ids:
+            return []
+        query += f" WHERE projectID IN ({', '.join(['%s'] * len(project_ids))})"
+        params = list(project_ids)
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        stored = {row[0]: dict(zip(COUNTER_COLUMNS, row[1:])) for row in cursor.fetchall()}
+
+    drift = []
+    for project_id in sorted(set(actual) | set(stored)):
+        if stored.get(project_id) != actual.get(project_id):
+            drift.append((project_id, stored.get(project_id), actual.get(project_id)))
+    return drift
@@ -0,0 +1,149 @@
+"""
+Sprint scheduling engine.
+
+Pure date arithmetic with no database or Django dependency, shared by task
+generation (apps.home.sprint_planning), the project list and the timeline.
+
+Schedules are stored as compact integer arrays: sprint boundaries as date
+ordinals and one sprint index per task. Dates are only materialised on
+demand, so planning a million tasks costs a handful of per-sprint date
+computations plus integer arithmetic per task.
+"""
+import math
+from array import array
+from datetime import date
+
+# Agile Strategy: Target 2-week Sprints (14 days)
+TARGET_SPRINT_DAYS = 14
+
+
+def sprint_layout(num_tasks, start_date, end_date, num_sprints_input=None):
+    """
+    Returns (num_sprints, sprint_days, tasks_per_sprint) for spreading
+    num_tasks over the project timeline.
+    """
+    total_days = (end_date - start_date).days
+    if total_days < 1:
+        total_days = 1
+
+    if num_sprints_input and num_sprints_input > 0:
+        num_sprints = num_sprints_input
+    else:
+        # Calculate how many sprints fit in the timeline, but never more
+        # sprints than tasks so no sprint is left empty
+        num_sprints = math.ceil(total_days / TARGET_SPRINT_DAYS)
+        if num_sprints > num_tasks:
+            num_sprints = num_tasks
+        if num_sprints < 1:
+            num_sprints = 1
+
+    sprint_days = total_days // num_sprints
+    if sprint_days < 1:
+        sprint_days = 1
+
+    # Round up to ensure all tasks are covered
+    tasks_per_sprint = math.ceil(num_tasks / num_sprints) if num_tasks else 0
+    return num_sprints, sprint_days, tasks_per_sprint
+
+
+class SprintSchedule:
+    """
+    Sprint boundaries and task -> sprint assignments as compact arrays.
+
+    sprint_starts / sprint_ends: date ordinals, one entry per sprint
+    task_sprints: 0-based sprint index, one entry per task
+    """
+
+    __slots__ = ('sprint_starts', 'sprint_ends', 'task_sprints')
+
+    def __init__(self, sprint_starts, sprint_ends, task_sprints):
+        self.sprint_starts = sprint_starts
+        self.sprint_ends = sprint_ends
+        self.task_sprints = task_sprints
+
+    @property
+    def num_sprints(self):
+        return len(self.sprint_starts)
+
+    @property
+    def num_tasks(self):
+        return len(self.task_sprints)
+
+    def sprint_dates(self, sprint_i):
+        return date.fromordinal(self.sprint_starts[sprint_i]), date.fromordinal(self.sprint_ends[sprint_i])
+
+    def task_dates(self, task_i):
+        return self.sprint_dates(self.task_sprints[task_i])
+
+    def iter_tasks(self):
+        """
+        Yields (task_index, sprint_number, start_date, due_date); dates are
+        converted once per sprint, not once per task.
+        """
+        dates = [self.sprint_dates(i) for i in range(self.num_sprints)]
+        for task_i, sprint_i in enumerate(self.task_sprints):
+            start, due = dates[sprint_i]
+            yield task_i, sprint_i + 1, start, due
+
+
+def schedule_tasks(num_tasks, start_date, end_date, num_sprints_input=None):
+    """
+    Assigns num_tasks tasks (in order) to sprints.
+    Sprint i starts sprint_days * i after the project start and lasts
+    sprint_days days; the last sprint of the layout ends on the deadline.
+    """
+    num_sprints, sprint_days, tasks_per_sprint = sprint_layout(
+        num_tasks, start_date, end_date, num_sprints_input
+    )
+
+    first = start_date.toordinal()
+    sprint_starts = array('l', range(first, first + num_sprints * sprint_days, sprint_days))
+    sprint_ends = array('l', (s + sprint_days - 1 for s in sprint_starts))
+    sprint_ends[-1] = end_date.toordinal()
+
+    task_sprints = array('l')
+    if num_tasks:
+        # Whole sprints are filled in one go; only the last one is partial
+        full_sprints, remainder = divmod(num_tasks, tasks_per_sprint)
+        for sprint_i in range(full_sprints):
+            task_sprints.extend(array('l', [sprint_i]) * tasks_per_sprint)
+        if remainder:
+            task_sprints.extend(array('l', [full_sprints]) * remainder)
+
+    return SprintSchedule(sprint_starts, sprint_ends, task_sprints)
+
+
+def estimate_sprint_count(start_date, end_date):
+    """
+    Number of 2-week sprints covering a project (at least 1)
+    """
+    if not (start_date and end_date):
+        return 1
+    days = (end_date - start_date).days
+    if days < 1:
+        return 1
+    return math.ceil(days / TARGET_SPRINT_DAYS)
+
+
+def sprint_number(project_start, task_start):
+    """
+    1-based 2-week sprint a task falls into, counted from the project start
+    """
+    sprint_num = ((task_start - project_start).days // TARGET_SPRINT_DAYS) + 1
+    return sprint_num if sprint_num > 0 else 1
+
+
+def timeline_sprints(project_start, project_end):
+    """
+    Fixed 2-week sprint windows used by the timeline overview.
+    Returns [(sprint_number, start_date, end_date)]; windows are capped at
+    the project end date.
+    """
+    first = project_start.toordinal()
+    last = project_end.toordinal()
+    windows = []
+    for i in range(estimate_sprint_count(project_start, project_end)):
+        s_start = first + i * TARGET_SPRINT_DAYS
+        s_end = min(s_start + TARGET_SPRINT_DAYS, last)
+        windows.append((i + 1, date.fromordinal(s_start), date.fromordinal(s_end)))
+    return windows
@@ -0,0 +1,33 @@
+"""
+Drops cached reference data (apps/home/reference_cache.py) when its rows
+are written through Django. Connected by HomeConfig.ready().
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.home.models import Client, Developer, Member, Status
+from apps.home.reference_cache import invalidate_reference_data
+
+
+@receiver([post_save, post_delete], sender=Client)
+def client_changed(sender, **kwargs):
+    invalidate_reference_data('clients')
+
+
+@receiver([post_save, post_delete], sender=Status)
+def status_changed(sender, **kwargs):
+    invalidate_reference_data('statuses')
+
+
+@receiver([post_save, post_delete], sender=Member)
+@receiver([post_save, post_delete], sender=Developer)
+def developer_changed(sender, **kwargs):
+    invalidate_reference_data('developers')
+
+
+# Sign-ups and profile edits go through the login model; the developer
+# list shows names from the matching `user` row
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def account_changed(sender, **kwargs):
+    invalidate_reference_data('developers')
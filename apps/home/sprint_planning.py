@@ -0,0 +1,75 @@
+"""
+Sprint planning for generated project tasks.
+
+The whole schedule is computed in memory first and then written with a
+single multi-row INSERT (MySQLdb turns executemany() on an INSERT ... VALUES
+statement into one statement per chunk) inside one transaction.
+"""
+from django.db import connection, transaction
+
+from apps.home.changefeed import next_revision
+from apps.home.rollup import STATUS_PENDING, apply_task_change
+from apps.home.scheduling import schedule_tasks
+
+# Rows per INSERT statement, keeps each statement well under max_allowed_packet
+INSERT_CHUNK_SIZE = 500
+
+
+def plan_project_tasks(project_id, titles, start_date, end_date, num_sprints_input=None,
+                       description=lambda sprint: f"Sprint {sprint}"):
+    """
+    Distributes task titles into sprints.
+    Returns a list of dicts (projectID, taskTitle, taskDescription, statusID,
+    startDate, dueDate, sprint); `description` builds the task description
+    from the 1-based sprint number.
+    The last sprint of the layout always ends on the project deadline.
+    """
+    if not titles:
+        return []
+
+    schedule = schedule_tasks(len(titles), start_date, end_date, num_sprints_input)
+
+    planned = []
+    for task_i, sprint, sprint_start, sprint_end in schedule.iter_tasks():
+        planned.append({
+            'projectID': project_id,
+            'taskTitle': titles[task_i],
+            'taskDescription': description(sprint),
+            'statusID': STATUS_PENDING,
+            'startDate': sprint_start,
+            'dueDate': sprint_end,
+            'sprint': sprint,
+        })
+    return planned
+
+
+def insert_planned_tasks(project_id, planned):
+    """
+    Persists planned tasks in one transaction with chunked multi-row INSERTs,
+    stamping them with one change-feed revision and updating the rollup.
+    Returns the planned rows (with 'revision' set) so callers need not read them back.
+    """
+    if not planned:
+        return planned
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        revision = next_revision()
+        rows = []
+        for task in planned:
+            task['revision'] = revision
+            rows.append([
+                task['projectID'], task['taskTitle'], task['taskDescription'],
+                task['statusID'], task['startDate'], task['dueDate'], revision,
+            ])
+
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            cursor.executemany("""
+                INSERT INTO task
+                (projectID, taskTitle, taskDescription, statusID, startDate, dueDate, revision)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, rows[i:i + INSERT_CHUNK_SIZE])
+
+        apply_task_change(project_id, new_status=STATUS_PENDING, count=len(rows), created=True,
+                          revision=revision)
+
+    return planned
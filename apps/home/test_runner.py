@@ -0,0 +1,95 @@
+"""
+Test runner for the project (TEST_RUNNER in core/settings.py).
+
+The home tables are normally created outside Django and extended by
+raw-SQL MySQL migrations, so test databases skip those migrations and get
+the schema below instead.
+"""
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+def home_schema(vendor):
+    """
+    CREATE TABLE statements for the home tables the views read,
+    valid on both SQLite and MySQL
+    """
+    pk = 'INTEGER PRIMARY KEY AUTOINCREMENT' if vendor == 'sqlite' else 'INT AUTO_INCREMENT PRIMARY KEY'
+    big_pk = 'INTEGER PRIMARY KEY AUTOINCREMENT' if vendor == 'sqlite' else 'BIGINT AUTO_INCREMENT PRIMARY KEY'
+    return [
+        "CREATE TABLE status (statusID INT PRIMARY KEY, statusDesc VARCHAR(50))",
+        f"CREATE TABLE client (clientID {pk}, companyName VARCHAR(100))",
+        f"""CREATE TABLE user (
+            userID {pk}, username VARCHAR(150), firstName VARCHAR(100),
+            lastName VARCHAR(100), email VARCHAR(255)
+        )""",
+        "CREATE TABLE developer (developerID INT PRIMARY KEY)",
+        f"""CREATE TABLE project (
+            projectID {pk}, projectName VARCHAR(255), projectType VARCHAR(100),
+            statusID INT, startDate DATE, endDate DATE, projectProgress INT DEFAULT 0,
+            createdBy INT, clientID INT
+        )""",
+        f"CREATE TABLE projectAssignment (assignmentID {pk}, projectID INT, developerID INT, roleInProject VARCHAR(50))",
+        f"""CREATE TABLE task (
+            taskID {pk}, projectID INT, taskTitle VARCHAR(255), taskDescription TEXT,
+            statusID INT, startDate DATE, dueDate DATE, assignedTo INT, priority VARCHAR(20),
+            revision BIGINT NOT NULL DEFAULT 0,
+            updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        "CREATE INDEX idx_task_board ON task (projectID, statusID, taskID)",
+        "CREATE INDEX idx_task_revision ON task (revision, taskID)",
+        "CREATE INDEX idx_task_project_start ON task (projectID, startDate, taskID)",
+        "CREATE INDEX idx_task_assignee_due ON task (assignedTo, dueDate)",
+        "CREATE UNIQUE INDEX idx_assignment_project ON projectAssignment (projectID, developerID)",
+        "CREATE INDEX idx_user_username ON user (username)",
+        "CREATE INDEX idx_user_name ON user (firstName, lastName)",
+        """CREATE TABLE projectRollup (
+            projectID INT NOT NULL PRIMARY KEY,
+            totalTasks INT NOT NULL DEFAULT 0, pendingTasks INT NOT NULL DEFAULT 0,
+            inProgressTasks INT NOT NULL DEFAULT 0, completedTasks INT NOT NULL DEFAULT 0,
+            cancelledTasks INT NOT NULL DEFAULT 0, revision BIGINT NOT NULL DEFAULT 0,
+            updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        f"CREATE TABLE taskRevision (revision {big_pk}, allocatedAt DATETIME(6) NOT NULL)",
+        f"CREATE TABLE taskTombstone (tombstoneID {pk}, taskID INT NOT NULL, projectID INT, revision BIGINT NOT NULL)",
+        f"""CREATE TABLE userCalendarEvent (
+            eventID {pk}, userID INT NOT NULL, taskID INT, eventTitle VARCHAR(255) NOT NULL,
+            eventDescription TEXT, startDate DATE, endDate DATE, isTaskBased BOOLEAN DEFAULT 0,
+            createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        "CREATE INDEX idx_calendar_event_user_start ON userCalendarEvent (userID, startDate)",
+        f"""CREATE TABLE outboundJob (
+            jobID {pk}, action VARCHAR(32) NOT NULL, payload TEXT NOT NULL,
+            status VARCHAR(16) NOT NULL DEFAULT 'queued', attempts INT NOT NULL DEFAULT 0,
+            maxAttempts INT NOT NULL DEFAULT 5, runAfter DATETIME(6) NOT NULL, lockedAt DATETIME(6) NULL,
+            lastError TEXT NULL, responseText TEXT NULL, createdBy INT NULL,
+            createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        "CREATE INDEX idx_outbound_job_due ON outboundJob (status, runAfter)",
+        """CREATE TABLE calendarFeedKey (
+            userID INT NOT NULL PRIMARY KEY, keyVersion INT NOT NULL DEFAULT 0,
+            rotatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+    ]
+
+
+def create_home_schema(db):
+    with db.cursor() as cursor:
+        for statement in home_schema(db.vendor):
+            cursor.execute(statement)
+
+
+class HomeSchemaTestRunner(DiscoverRunner):
+    """
+    Test runner that builds the home tables from home_schema() instead of
+    running the home app's MySQL-only migrations
+    """
+
+    def setup_databases(self, **kwargs):
+        with override_settings(MIGRATION_MODULES={'home': None}):
+            old_config = super().setup_databases(**kwargs)
+        # Only the test databases actually set up: a run of SimpleTestCases
+        # sets up none, and the real database must not be touched
+        for connection, old_name, destroy in old_config:
+            create_home_schema(connection)
+        return old_config
@@ -1,8 +1,1383 @@
 # -*- encoding: utf-8 -*-
 """
 Copyright (c) 2019 - present AppSeed.us
+
+Performance regression suite for the home views.
+
+Seeds synthetic clients, developers, projects and tasks, then checks the
+SQL query count per view against fixed budgets, so regressions such as a
+per-project query loop fail the run. With PERF_LATENCY=1 the median
+latency of PERF_REPEAT requests is held to a budget as well; wall-clock
+numbers depend on the machine, so that check is opt-in.
+
+    python manage.py test apps.home                                  # local MySQL
+    DATABASE_URL=sqlite:///planny-bench.sqlite3 python manage.py test apps.home
+    DATABASE_URL=mysql://root:pw@127.0.0.1:3307/planny PERF_LATENCY=1 python manage.py test apps.home
+
+Tuning (environment): PERF_PROJECTS, PERF_TASKS_PER_PROJECT, PERF_DEVELOPERS,
+PERF_CLIENTS, PERF_REPEAT, and PERF_BUDGET_SCALE to scale latency budgets
+on slower machines.
+
+Test databases get the home tables from apps/home/test_runner.py.
 """
+import asyncio
+import base64
+import csv
+import gzip
+import io
+import json
+import os
+import statistics
+import time
+from datetime import date, timedelta
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core import signing
+from django.core.checks import run_checks
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.home.broker import ALL_PROJECTS_CHANNEL, get_broker, project_channel, publish_task_event
+from apps.home.calendar_events import MAX_EVENT_SPAN_DAYS
+from apps.home.calendar_sync import (
+    rebuild_calendar_events, remove_project_events, remove_task_events, sync_project_events, task_event_span,
+)
+from apps.home.changefeed import current_revision, next_revision
+from apps.home.ics import FEED_TOKEN_SALT, make_feed_token, rotate_feed_token
+from apps.home.jobs import (
+    BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, JOB_FAILED, JOB_HANDLERS, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED,
+    PermanentJobError, backoff_seconds, claim_next_job, enqueue_job, enqueue_jobs, get_job, requeue_stale_jobs,
+    run_due_jobs,
+)
+from apps.home.models import Client, ProjectAssignment
+from apps.home.outbound_http import CircuitBreaker, CircuitOpenError, OutboundClient, RateLimiter
+from apps.home.push import session_user_id
+from apps.home.query_plans import VIEW_CHECKS, check_views
+from apps.home.reference_cache import get_clients, get_developers, reference_cache_metrics
+from apps.home.repositories import assign_developers, list_developers, list_projects
+from apps.home.rollup import (
+    apply_task_change, delete_project_rollup, find_rollup_drift, get_project_rollup, progress_from_counters,
+    rebuild_project_rollups,
+)
+from apps.home.scheduling import estimate_sprint_count, schedule_tasks, sprint_layout
+from apps.home.sprint_planning import plan_project_tasks
+from apps.home.views import publish_after_commit
+
+PERF_PROJECTS = int(os.environ.get('PERF_PROJECTS', 50))
+PERF_TASKS_PER_PROJECT = int(os.environ.get('PERF_TASKS_PER_PROJECT', 40))
+PERF_DEVELOPERS = int(os.environ.get('PERF_DEVELOPERS', 20))
+PERF_CLIENTS = int(os.environ.get('PERF_CLIENTS', 10))
+PERF_REPEAT = int(os.environ.get('PERF_REPEAT', 5))
+PERF_BUDGET_SCALE = float(os.environ.get('PERF_BUDGET_SCALE', 1.0))
+PERF_LATENCY = os.environ.get('PERF_LATENCY', '') not in ('', '0')
+
+# url name -> (max SQL queries per request, max median latency in ms with PERF_LATENCY).
+# Query budgets include the session and auth user lookups and must not
+# depend on data volume.
+VIEW_BUDGETS = {
+    'projects': (6, 400),
+    'tables': (6, 400),
+    'project_timeline': (5, 300),
+    'kanban_tasks_api': (5, 400),
+    'projects_api': (4, 150),
+    'developers_api': (4, 150),
+}
+
+STATUSES = [(1, 'Pending'), (2, 'In Progress'), (3, 'Completed'), (4, 'Cancelled'), (5, 'On Hold')]
+PRIORITIES = ['Low', 'Medium', 'High']
+
+
+def seed_data(projects, tasks_per_project, developers, clients, first_project_id=1):
+    """
+    Inserts synthetic rows with explicit IDs; returns the seeded project IDs.
+    Calling it again with a higher first_project_id adds more projects.
+    """
+    today = date.today()
+    with connection.cursor() as cursor:
+        if first_project_id == 1:
+            cursor.executemany("INSERT INTO status (statusID, statusDesc) VALUES (%s, %s)", STATUSES)
+            cursor.executemany(
+                "INSERT INTO client (clientID, companyName) VALUES (%s, %s)",
+                [(i, f"Client {i}") for i in range(1, clients + 1)]
+            )
+            cursor.executemany(
+                "INSERT INTO user (userID, username, firstName, lastName, email) VALUES (%s, %s, %s, %s, %s)",
+                [(i, f"dev{i}", f"Dev{i}", "Tester", f"dev{i}@example.com") for i in range(1, developers + 1)]
+            )
+            cursor.executemany(
+                "INSERT INTO developer (developerID) VALUES (%s)", [(i,) for i in range(1, developers + 1)]
+            )
+
+        project_ids = list(range(first_project_id, first_project_id + projects))
+        project_rows, task_rows, rollup_rows = [], [], []
+        cursor.execute("SELECT COALESCE(MAX(revision), 0) FROM taskRevision")
+        revision = cursor.fetchone()[0]
+        for project_id in project_ids:
+            start = today - timedelta(days=30)
+            end = today + timedelta(days=120)
+            counts = {1: 0, 2: 0, 3: 0, 4: 0}
+            for i in range(tasks_per_project):
+                status_id = i % 4 + 1
+                counts[status_id] += 1
+                revision += 1
+                sprint_start = start + timedelta(days=14 * (i % 10))
+                task_rows.append((
+                    project_id, f"Task {project_id}-{i}", "Synthetic task", status_id,
+                    sprint_start, sprint_start + timedelta(days=13),
+                    (i % developers) + 1 if developers else None, PRIORITIES[i % 3], revision,
+                ))
+            done = counts[3] + counts[2] / 2
+            progress = int(done / tasks_per_project * 100) if tasks_per_project else 0
+            project_rows.append((
+                project_id, f"Project {project_id}", 'Web Application', project_id % 3 + 1,
+                start, end, progress, 1, (project_id % clients) + 1 if clients else None,
+            ))
+            rollup_rows.append((
+                project_id, tasks_per_project, counts[1], counts[2], counts[3], counts[4], revision,
+            ))
+
+        cursor.executemany("""
+            INSERT INTO project
+            (projectID, projectName, projectType, statusID, startDate, endDate, projectProgress, createdBy, clientID)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, project_rows)
+        cursor.executemany("""
+            INSERT INTO task
+            (projectID, taskTitle, taskDescription, statusID, startDate, dueDate, assignedTo, priority, revision)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, task_rows)
+        cursor.executemany("""
+            INSERT INTO projectRollup
+            (projectID, totalTasks, pendingTasks, inProgressTasks, completedTasks, cancelledTasks, revision)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, rollup_rows)
+        # Seeded long ago, so the change feed treats these revisions as settled
+        cursor.execute(
+            "INSERT INTO taskRevision (revision, allocatedAt) VALUES (%s, '2000-01-01 00:00:00.000000')", [revision]
+        )
+    return project_ids
+
+
+class ViewPerformanceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project_ids = seed_data(PERF_PROJECTS, PERF_TASKS_PER_PROJECT, PERF_DEVELOPERS, PERF_CLIENTS)
+        cls.user = get_user_model().objects.create_user(username='perf', password='perf-pass', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def measure(self, url):
+        """
+        Returns (last response, max queries per request, median latency in ms)
+        after one warm-up request
+        """
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+
+        timings, query_counts = [], []
+        for _ in range(PERF_REPEAT):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = self.client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            self.assertEqual(response.status_code, 200, url)
+            query_counts.append(len(queries.captured_queries))
+        return response, max(query_counts), statistics.median(timings)
+
+    def assert_within_budget(self, name, url):
+        max_queries, max_ms = VIEW_BUDGETS[name]
+        response, query_count, median_ms = self.measure(url)
+        self.assertLessEqual(
+            query_count, max_queries,
+            f"{name}: {query_count} queries per request, budget is {max_queries}"
+        )
+        if PERF_LATENCY:
+            self.assertLessEqual(
+                median_ms, max_ms * PERF_BUDGET_SCALE,
+                f"{name}: median {median_ms:.1f} ms, budget is {max_ms * PERF_BUDGET_SCALE:.0f} ms"
+            )
+        return response
+
+    def test_projects(self):
+        response = self.assert_within_budget('projects', reverse('projects'))
+        self.assertEqual(len(response.context['projects']), PERF_PROJECTS)
+
+    def test_tables_view(self):
+        response = self.assert_within_budget('tables', reverse('tables'))
+        self.assertEqual(len(response.context['projects']), PERF_PROJECTS)
+
+    def test_project_timeline(self):
+        self.assert_within_budget('project_timeline', reverse('project_timeline', args=[self.project_ids[0]]))
+
+    def test_kanban_tasks_api(self):
+        response = self.assert_within_budget('kanban_tasks_api', reverse('kanban_tasks_api'))
+        self.assertTrue(response.json()['tasks'])
+
+    def test_projects_api(self):
+        response = self.assert_within_budget('projects_api', reverse('projects_api'))
+        self.assertEqual(len(response.json()['projects']), PERF_PROJECTS)
+
+    def test_developers_api(self):
+        response = self.assert_within_budget('developers_api', reverse('developers_api'))
+        self.assertEqual(len(response.json()['developers']), PERF_DEVELOPERS)
+
+    def test_query_counts_do_not_grow_with_data(self):
+        urls = [reverse(name) for name in ('projects', 'tables', 'kanban_tasks_api', 'projects_api')]
+        before = [self.measure(url)[1] for url in urls]
+        seed_data(PERF_PROJECTS, PERF_TASKS_PER_PROJECT, PERF_DEVELOPERS, PERF_CLIENTS,
+                  first_project_id=max(self.project_ids) + 1)
+        after = [self.measure(url)[1] for url in urls]
+        self.assertEqual(before, after, f"Query counts grew with data volume for {urls}")
+
+
+class ModelSchemaTests(TestCase):
+    """
+    The unmanaged models in apps.home.models must match the tables they map
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(3, 4, 2, 2)
+
+    def test_every_model_queries_its_table(self):
+        for model in apps.get_app_config('home').get_models():
+            with self.subTest(model=model.__name__):
+                list(model.objects.all()[:1])
+
+    def test_list_queries_are_joined(self):
+        with self.assertNumQueries(1):
+            projects = list_projects()
+            self.assertTrue(all(p.client.companyName and p.status_id for p in projects))
+        with self.assertNumQueries(1):
+            self.assertTrue(all(d['username'] for d in list_developers()))
+
+    def test_assignment_instances_touch_only_their_row(self):
+        assign_developers(1, [1, 2, 1])
+        assignment = ProjectAssignment.objects.get(project_id=1, developer_id=1)
+        assignment.roleInProject = 'Lead'
+        assignment.save()
+        assignment.delete()
+        self.assertEqual(
+            list(ProjectAssignment.objects.filter(project_id=1).values_list('developer_id', 'roleInProject')),
+            [(2, 'Developer')]
+        )
+
+    def test_system_checks_are_clean(self):
+        self.assertEqual(run_checks(app_configs=[apps.get_app_config('home')]), [])
+
+
+class QueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(3, 4, 2, 2)
+
+    def test_every_checked_view_runs_and_is_explained(self):
+        results = list(check_views())
+        self.assertEqual(len(results), len(VIEW_CHECKS))
+        for label, result in results:
+            with self.subTest(view=label):
+                self.assertNotIsInstance(result, Exception)
+                self.assertTrue(all(plan for sql, plan in result))
+
+
+class ReferenceCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(1, 1, 2, 2)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_second_read_is_a_hit(self):
+        before = reference_cache_metrics()['clients']
+        with self.assertNumQueries(1):
+            get_clients()
+            get_clients()
+        after = reference_cache_metrics()['clients']
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_client_save_invalidates(self):
+        get_clients()
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.create(clientID=99, companyName='New Client')
+        self.assertIn('New Client', [c['companyName'] for c in get_clients()])
+
+    def sign_up(self, url_name, **fields):
+        data = {'username': 'signup', 'email': 'signup@example.com',
+                'password1': 'Sign-up-pass-1', 'password2': 'Sign-up-pass-1', **fields}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse(url_name), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['success'])
+
+    def test_client_sign_up_invalidates(self):
+        # The sign-up writes the client row with raw SQL: no model signal fires
+        get_clients()
+        self.sign_up('register_client', companyName='Signed Up Ltd')
+        self.assertIn('Signed Up Ltd', [c['companyName'] for c in get_clients()])
+
+    def test_developer_sign_up_invalidates(self):
+        get_developers()
+        self.sign_up('register_dev', programmingLanguage='Python')
+        self.assertIn('signup', [d['username'] for d in get_developers()])
+
+
+class ApiResponseTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(5, 40, 3, 2)
+        cls.user = get_user_model().objects.create_user(username='api', password='api-pass')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_matching_etag_gets_304(self):
+        url = reverse('kanban_tasks_api')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+
+    def test_large_bodies_are_gzipped(self):
+        url = reverse('kanban_tasks_api')
+        plain = self.client.get(url)
+        compressed = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn(compressed['Content-Encoding'], ('gzip', 'br'))
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertTrue(compressed['ETag'].startswith('W/'))
+        if compressed['Content-Encoding'] == 'gzip':
+            self.assertEqual(gzip.decompress(compressed.content), plain.content)
+
+    def test_pages_are_not_touched(self):
+        response = self.client.get(reverse('projects'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('ETag', response)
+
+    @override_settings(INSTRUMENTATION_SERVER_TIMING=False)
+    def test_server_timing_is_opt_in(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('kanban_tasks_api')))
+        with self.settings(INSTRUMENTATION_SERVER_TIMING=True):
+            self.client = self.client_class()
+            self.client.force_login(self.user)
+            self.assertIn('db;', self.client.get(reverse('kanban_tasks_api'))['Server-Timing'])
+
+
+class JsonPayloadTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project_ids = seed_data(2, 6, 2, 1)
+        cls.user = get_user_model().objects.create_user(username='json', password='json-pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_kanban_tasks_carry_iso_dates_and_names(self):
+        tasks = self.client.get(reverse('kanban_tasks_api')).json()['tasks']
+        self.assertEqual(len(tasks), 12)
+        for task in tasks:
+            date.fromisoformat(task['dueDate'])
+            self.assertRegex(task['assignedToName'], r'^Dev\d+ Tester$')
+
+    def test_kanban_field_projection(self):
+        tasks = self.client.get(reverse('kanban_tasks_api'), {'fields': 'assignedToName,taskID'}).json()['tasks']
+        self.assertEqual(set(tasks[0]), {'taskID', 'assignedToName'})
+
+    def test_timeline_stream_is_one_json_array(self):
+        response = self.client.get(reverse('project_timeline_api', args=[self.project_ids[0]]))
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 6)
+        for row in rows:
+            date.fromisoformat(row[3])
+            date.fromisoformat(row[4])
+
+
+class TimelineTests(TestCase):
+    """
+    One project of 10 tasks: task k runs from start + 14k to start + 14k + 13
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project_id = seed_data(1, 10, 2, 1)[0]
+        cls.start = date.today() - timedelta(days=30)
+        cls.user = get_user_model().objects.create_user(username='timeline', password='timeline-pass')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get_page(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project_timeline', args=[self.project_id]))
+        self.assertEqual(response.status_code, 200)
+        stats_queries = [q['sql'] for q in queries.captured_queries if 'GROUP BY startDate' in q['sql']]
+        return response, len(stats_queries)
+
+    def test_overview_is_served_from_cache(self):
+        first, first_stats = self.get_page()
+        second, second_stats = self.get_page()
+        self.assertEqual((first_stats, second_stats), (1, 0))
+        self.assertEqual(first.context['gantt_data'], second.context['gantt_data'])
+
+    def test_task_write_bumps_revision_and_rebuilds_overview(self):
+        before, _ = self.get_page()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT MIN(taskID) FROM task WHERE projectID = %s AND statusID = 1", [self.project_id])
+            task_id = cursor.fetchone()[0]
+        response = self.client.patch(
+            reverse('kanban_task_detail_api', args=[task_id]), json.dumps({'statusID': 3}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        after, stats_queries = self.get_page()
+        self.assertEqual(stats_queries, 1)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertNotEqual(after.context['gantt_data'], before.context['gantt_data'])
+
+    def stream(self, **window):
+        response = self.client.get(reverse('project_timeline_api', args=[self.project_id]), window)
+        self.assertEqual(response.status_code, 200)
+        return [row[1] for row in json.loads(b''.join(response.streaming_content))]
+
+    def day(self, offset):
+        return (self.start + timedelta(days=offset)).isoformat()
+
+    def task_titles(self, ks):
+        return [f"Task {self.project_id}-{k}" for k in ks]
+
+    def test_window_returns_overlapping_tasks_in_start_order(self):
+        self.assertEqual(self.stream(**{'from': self.day(42), 'to': self.day(70)}), self.task_titles([3, 4, 5]))
+
+    def test_window_bounds_are_inclusive(self):
+        # Task 2 is due on day 41 and task 6 starts on day 84
+        self.assertEqual(self.stream(**{'from': self.day(41), 'to': self.day(84)}), self.task_titles(range(2, 7)))
+        self.assertEqual(self.stream(**{'from': self.day(42), 'to': self.day(83)}), self.task_titles(range(3, 6)))
+
+    def test_open_ended_windows(self):
+        self.assertEqual(self.stream(**{'from': self.day(112)}), self.task_titles([8, 9]))
+        self.assertEqual(self.stream(to=self.day(13)), self.task_titles([0]))
+        self.assertEqual(self.stream(), self.task_titles(range(10)))
+
+    def test_invalid_window_is_rejected(self):
+        response = self.client.get(reverse('project_timeline_api', args=[self.project_id]), {'from': 'soon'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=7)
+class ExportTests(TestCase):
+    """
+    Chunks of 7 rows, so every export below spans several keyset queries
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project_ids = seed_data(10, 5, 3, 2)
+        for project_id in cls.project_ids:
+            assign_developers(project_id, [1, 2, 3])
+        cls.user = get_user_model().objects.create_user(username='export', password='export-pass')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def download(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_tasks_csv_has_every_row_once(self):
+        rows = list(csv.DictReader(io.StringIO(self.download('export_tasks_api'))))
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(len({row['taskID'] for row in rows}), 50)
+        date.fromisoformat(rows[0]['dueDate'])
+
+    def test_tasks_use_kanban_filters_and_fields(self):
+        body = self.download('export_tasks_api', project=self.project_ids[0], fields='taskID,assignedToName')
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(body.splitlines()[0], 'taskID,assignedToName')
+        self.assertEqual(len(rows), 5)
+
+    def test_projects_ndjson(self):
+        lines = self.download('export_projects_api', format='ndjson').splitlines()
+        projects = [json.loads(line) for line in lines]
+        self.assertEqual(sorted(p['projectID'] for p in projects), self.project_ids)
+        self.assertTrue(all(p['clientName'].startswith('Client ') for p in projects))
+
+    def test_assignments_keyset_across_chunks(self):
+        rows = list(csv.DictReader(io.StringIO(self.download('export_assignments_api'))))
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(len({(row['projectID'], row['developerID']) for row in rows}), 30)
+        filtered = self.download('export_assignments_api', developer='2', format='ndjson').splitlines()
+        self.assertEqual(len(filtered), 10)
+
+    def test_queries_grow_per_chunk_not_per_row(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.download('export_projects_api')
+        # Session, user and status names, then two chunks (a short chunk ends the export)
+        self.assertLessEqual(len(queries), 5)
+
+    def test_bad_input_is_rejected_before_streaming(self):
+        self.assertEqual(self.client.get(reverse('export_tasks_api'), {'format': 'xlsx'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export_tasks_api'), {'fields': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export_projects_api'), {'status': 'x'}).status_code, 400)
+
+
+class RollupTests(TestCase):
+    """
+    Seeded with 8 tasks: two of each status 1-4
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project_id = seed_data(1, 8, 2, 1)[0]
+        cls.user = get_user_model().objects.create_user(username='rollup', password='rollup-pass')
+
+    def add_task(self, status_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO task (projectID, taskTitle, statusID) VALUES (%s, %s, %s)",
+                [self.project_id, 'Extra task', status_id]
+            )
+            cursor.execute("SELECT MAX(taskID) FROM task")
+            return cursor.fetchone()[0]
+
+    def test_create_move_and_delete_deltas(self):
+        apply_task_change(self.project_id, new_status=1, created=True)
+        self.assertEqual(get_project_rollup(self.project_id)['totalTasks'], 9)
+        self.assertEqual(get_project_rollup(self.project_id)['pendingTasks'], 3)
+
+        apply_task_change(self.project_id, old_status=1, new_status=3)
+        counters = get_project_rollup(self.project_id)
+        self.assertEqual((counters['pendingTasks'], counters['completedTasks']), (2, 3))
+
+        apply_task_change(self.project_id, old_status=3, deleted=True)
+        counters = get_project_rollup(self.project_id)
+        self.assertEqual((counters['totalTasks'], counters['completedTasks']), (8, 2))
+
+        project = list_projects()[0]
+        self.assertEqual(project.projectProgress, progress_from_counters(8, 2, 2))
+
+    def test_drift_is_found_and_rebuilt(self):
+        self.assertEqual(find_rollup_drift(), [])
+        self.add_task(2)
+        drift = find_rollup_drift()
+        self.assertEqual([(pid, actual['inProgressTasks']) for pid, _, actual in drift], [(self.project_id, 3)])
+
+        self.assertEqual(rebuild_project_rollups([self.project_id]), 1)
+        self.assertEqual(find_rollup_drift(), [])
+        self.assertEqual(get_project_rollup(self.project_id)['totalTasks'], 9)
+
+    def test_missing_rollup_row_is_rebuilt_on_write(self):
+        delete_project_rollup(self.project_id)
+        self.assertEqual(len(find_rollup_drift()), 1)
+        apply_task_change(self.project_id, old_status=1, new_status=2)
+        self.assertEqual(find_rollup_drift(), [])
+
+    def test_patch_moves_counters_once(self):
+        self.client.force_login(self.user)
+        task_id = self.add_task(1)
+        apply_task_change(self.project_id, new_status=1, created=True)
+        url = reverse('kanban_task_detail_api', args=[task_id])
+        for _ in range(2):
+            response = self.client.patch(url, json.dumps({'statusID': 4}), content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(find_rollup_drift(), [])
+
+    def test_patch_unknown_task_is_404(self):
+        self.client.force_login(self.user)
+        before = current_revision()
+        url = reverse('kanban_task_detail_api', args=[999999])
+        response = self.client.patch(url, json.dumps({'statusID': 2}), content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(current_revision(), before)
+        self.assertEqual(next_revision(), before + 1)
+
+
+class ChangeFeedTests(TestCase):
+    """
+    Seeded with projects 1 (tasks 1-4) and 2 (tasks 5-8)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(2, 4, 2, 1)
+        cls.user = get_user_model().objects.create_user(username='feed', password='feed-pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def changes(self, since, **params):
+        response = self.client.get(reverse('kanban_task_changes_api'), dict(params, since=since))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def put_task(self, task_id, **fields):
+        data = dict({'taskTitle': 'Edited', 'statusID': 1, 'projectID': 1, 'priority': 'Low'}, **fields)
+        response = self.client.put(
+            reverse('kanban_task_detail_api', args=[task_id]), data, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_delete_leaves_tombstone(self):
+        since = current_revision()
+        self.client.delete(reverse('kanban_task_detail_api', args=[3]))
+        changes = self.changes(since)
+        self.assertEqual(changes['tasks'], [])
+        self.assertEqual([(d['taskID'], d['projectID']) for d in changes['deleted']], [(3, 1)])
+        self.assertGreater(changes['watermark'], since)
+        self.assertEqual(self.changes(changes['watermark'])['deleted'], [])
+
+    def test_moved_task_is_delete_plus_create(self):
+        since = current_revision()
+        self.put_task(1, projectID=2)
+
+        old_project = self.changes(since, project=1)
+        self.assertEqual((old_project['tasks'], [d['taskID'] for d in old_project['deleted']]), ([], [1]))
+        new_project = self.changes(since, project=2)
+        self.assertEqual(([t['taskID'] for t in new_project['tasks']], new_project['deleted']), ([1], []))
+        # Unfiltered, the client applies the tombstone first and then the row
+        both = self.changes(since)
+        self.assertEqual(([t['taskID'] for t in both['tasks']], [d['taskID'] for d in both['deleted']]), ([1], [1]))
+
+    def test_since_and_until_bounds(self):
+        since = current_revision()
+        self.put_task(2, statusID=3)
+        watermark = self.changes(since)['watermark']
+        self.assertEqual([t['taskID'] for t in self.changes(since)['tasks']], [2])
+        self.assertEqual(self.changes(watermark)['tasks'], [])
+
+        # A write still in flight holds the watermark back, later commits wait behind it
+        in_flight = next_revision()
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM taskRevision WHERE revision = %s", [in_flight])
+        self.put_task(5, projectID=2)
+        changes = self.changes(watermark)
+        self.assertEqual((changes['watermark'], changes['tasks']), (watermark, []))
+
+    def test_revisions_increase_across_writes(self):
+        since = current_revision()
+        response = self.client.post(
+            reverse('kanban_tasks_api'), {'taskTitle': 'New', 'statusID': 1, 'projectID': 1},
+            content_type='application/json',
+        )
+        task_id = response.json()['taskID']
+        created = self.changes(since, fields='taskID,revision')['tasks'][0]['revision']
+        self.put_task(task_id)
+        updated = self.changes(since, fields='taskID,revision')['tasks'][0]['revision']
+        self.client.delete(reverse('kanban_task_detail_api', args=[task_id]))
+        deleted = self.changes(since)['deleted'][0]['revision']
+        self.assertTrue(since < created < updated < deleted, (since, created, updated, deleted))
+
+    def test_watermark_stops_at_recent_gap(self):
+        settled = current_revision()
+        in_flight, committed = next_revision(), next_revision()
+        self.assertEqual(current_revision(), committed)
+
+        # A revision allocated by a transaction that has not committed yet is invisible
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM taskRevision WHERE revision = %s", [in_flight])
+        self.assertEqual(current_revision(), settled)
+
+        # Once the gap is older than the settle window it counts as rolled back
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE taskRevision SET allocatedAt = '2000-01-02 00:00:00.000000' WHERE revision = %s", [committed]
+            )
+        self.assertEqual(current_revision(), committed)
+
+
+class KanbanEventTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(1, 2, 1, 1)
+        cls.user = get_user_model().objects.create_user(username='events', password='events-pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def open_stream(self, **params):
+        # The test client reports a single-threaded server, which gets no stream
+        response = self.client.get(reverse('kanban_events'), params, **{'wsgi.multithread': True})
+        self.addCleanup(response.close)
+        return response
+
+    def test_single_threaded_server_is_told_to_poll(self):
+        response = self.client.get(reverse('kanban_events'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '60')
+
+    def test_published_task_update_reaches_subscriber(self):
+        response = self.open_stream(project=4)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = iter(response.streaming_content)
+        self.assertEqual(next(body), b'retry: 5000\n\n')
+
+        publish_task_event('task.updated', 4, {'task': {'taskID': 9, 'statusID': 3}})
+        event = next(body).decode()
+        self.assertTrue(event.startswith('event: task.updated\n'))
+        data = json.loads(event.split('data: ', 1)[1])
+        self.assertEqual((data['projectID'], data['task']['taskID']), (4, 9))
+
+    def test_async_subscriber_gets_event(self):
+        async def receive_one():
+            subscription = get_broker().subscribe([project_channel(4)], asyncio.get_running_loop())
+            try:
+                publish_task_event('task.updated', 4, {'task': {'taskID': 9}})
+                return await asyncio.wait_for(subscription.get(), 1)
+            finally:
+                subscription.close()
+
+        self.assertEqual(asyncio.run(receive_one())['type'], 'task.updated')
+
+    @override_settings(KANBAN_EVENTS_MAX_STREAMS=1)
+    def test_streams_are_capped_per_process(self):
+        first = self.open_stream()
+        self.assertEqual(first.status_code, 200)
+        refused = self.open_stream()
+        self.assertEqual(refused.status_code, 503)
+        self.assertEqual(refused['Retry-After'], '60')
+        first.close()
+        self.assertEqual(self.open_stream().status_code, 200)
+        self.assertEqual(get_broker().subscriber_count(ALL_PROJECTS_CHANNEL), 1)
+
+    @mock.patch('apps.home.views.publish_task_event')
+    def test_task_write_publishes_after_commit(self, publish):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT MIN(taskID) FROM task")
+            task_id = cursor.fetchone()[0]
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.patch(
+                reverse('kanban_task_detail_api', args=[task_id]), json.dumps({'statusID': 2}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+            publish.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        publish.assert_called_once()
+        event_type, project_id, payload = publish.call_args.args
+        self.assertEqual((event_type, project_id), ('task.updated', 1))
+        self.assertEqual((payload['task']['taskID'], payload['task']['statusID']), (task_id, 2))
+
+    @mock.patch('apps.home.views.publish_task_event')
+    def test_rolled_back_write_publishes_nothing(self, publish):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    publish_after_commit('task.updated', 1, {'task': {'taskID': 1}})
+                    raise RuntimeError('write failed')
+        self.assertEqual(callbacks, [])
+        publish.assert_not_called()
+
+    @mock.patch('apps.home.views.publish_task_event', side_effect=ConnectionError('broker down'))
+    def test_broker_failure_does_not_fail_the_write(self, publish):
+        with self.assertLogs('apps.home.views', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    publish_after_commit('task.updated', 1, {'task': {'taskID': 1}})
+        publish.assert_called_once()
+
+    def test_stream_session_is_checked_like_a_request(self):
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        self.assertEqual(session_user_id(cookie), self.user.pk)
+        self.assertIsNone(session_user_id(f"{settings.SESSION_COOKIE_NAME}=bogus"))
+
+        # A password change invalidates the session hash
+        self.user.set_password('changed-pass')
+        self.user.save()
+        self.assertIsNone(session_user_id(cookie))
+
+        self.client.force_login(self.user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(session_user_id(cookie))
+
+
+class KanbanPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(3, 7, 2, 1)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO task (projectID, taskTitle, statusID) VALUES (%s, %s, %s)",
+                [(None, 'No project', 1), (2, 'No status', None), (None, 'Neither', None)]
+            )
+        cls.user = get_user_model().objects.create_user(username='pages', password='pages-pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_pages_cover_every_placed_task_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 4, 'fields': 'taskID,taskTitle'}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(reverse('kanban_tasks_api'), params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen.extend(task['taskID'] for task in data['tasks'])
+            self.assertTrue(all(task['taskTitle'].startswith('Task ') for task in data['tasks']))
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 21)
+        self.assertEqual(len(set(seen)), 21)
+
+    def test_columns_page_independently(self):
+        # The board loads each status column on its own, one page at a time
+        seen = []
+        for status_id in range(1, 6):
+            params = {'limit': 2, 'fields': 'taskID,statusID', 'status': status_id, 'project': '1,2,3'}
+            response = self.client.get(reverse('kanban_tasks_api'), params).json()
+            pages = [response['tasks']]
+            while response['next_cursor']:
+                response = self.client.get(
+                    reverse('kanban_tasks_api'), dict(params, cursor=response['next_cursor'])
+                ).json()
+                pages.append(response['tasks'])
+            self.assertTrue(all(len(page) <= 2 for page in pages))
+            column = [task for page in pages for task in page]
+            self.assertTrue(all(task['statusID'] == status_id for task in column))
+            seen.extend(task['taskID'] for task in column)
+        self.assertEqual(sorted(seen), sorted(set(seen)))
+        self.assertEqual(len(seen), 21)
+
+    def test_malformed_cursor_is_400(self):
+        bad = base64.urlsafe_b64encode(b'None:1:5').decode().rstrip('=')
+        response = self.client.get(reverse('kanban_tasks_api'), {'cursor': bad})
+        self.assertEqual(response.status_code, 400)
+
+
+def failing_handler(error):
+    def handler(payload):
+        raise error
+    return handler
+
+
+class CalendarEventTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(1, 1, 1, 1)
+        cls.user = get_user_model().objects.create_user(username='dev1', password='dev1-pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def stored_end_date(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT endDate FROM userCalendarEvent WHERE eventID = %s", [event_id])
+            return cursor.fetchone()[0]
+
+    def test_edit_keeps_missing_end_date(self):
+        url = reverse('user_calendar_events_api')
+        response = self.client.post(
+            url, {'eventTitle': 'Review', 'startDate': '2025-12-10'}, content_type='application/json'
+        )
+        event_id = response.json()['eventID']
+
+        event = self.client.get(url).json()['events'][0]
+        self.assertEqual(event['end'], {'date': None})
+
+        # The calendar page sends every field back as it read it
+        response = self.client.patch(
+            reverse('user_calendar_event_detail_api', args=[event_id]),
+            {'eventTitle': 'Design review', 'startDate': event['start']['date'], 'endDate': event['end']['date']},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIsNone(self.stored_end_date(event_id))
+
+    def test_longest_event_is_found_from_its_last_day(self):
+        url = reverse('user_calendar_events_api')
+        start = date(2025, 1, 1)
+        end = start + timedelta(days=MAX_EVENT_SPAN_DAYS)
+        response = self.client.post(
+            url, {'eventTitle': 'Year', 'startDate': start.isoformat(), 'endDate': end.isoformat()},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        events = self.client.get(url, {'from': end.isoformat(), 'to': (end + timedelta(days=30)).isoformat()})
+        self.assertEqual([e['summary'] for e in events.json()['events']], ['Year'])
+        after = self.client.get(url, {'from': (end + timedelta(days=1)).isoformat()})
+        self.assertEqual(after.json()['events'], [])
+
+    def test_longer_event_is_rejected(self):
+        start = date(2025, 1, 1)
+        response = self.client.post(
+            reverse('user_calendar_events_api'),
+            {'eventTitle': 'Too long', 'startDate': start.isoformat(),
+             'endDate': (start + timedelta(days=MAX_EVENT_SPAN_DAYS + 1)).isoformat()},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class CalendarSyncTests(TestCase):
+    """
+    Seeded with one project of 4 tasks, alternately assigned to users 1 and 2
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(1, 4, 2, 1)
+        cls.user = get_user_model().objects.create_user(username='dev1', password='dev1-pass')
+
+    def task_events(self, **filters):
+        query = "SELECT taskID, userID, startDate, endDate, eventTitle FROM userCalendarEvent WHERE isTaskBased = 1"
+        params = []
+        for column, value in filters.items():
+            query += f" AND {column} = %s"
+            params.append(value)
+        with connection.cursor() as cursor:
+            cursor.execute(query + " ORDER BY taskID", params)
+            return cursor.fetchall()
+
+    def test_event_span(self):
+        day = date(2025, 3, 10)
+        self.assertEqual(task_event_span(day, None), (day, day))
+        self.assertEqual(task_event_span(day + timedelta(days=5), day), (day, day + timedelta(days=5)))
+        long_task = task_event_span(day, day + timedelta(days=MAX_EVENT_SPAN_DAYS + 30))
+        self.assertEqual((long_task[1] - long_task[0]).days, MAX_EVENT_SPAN_DAYS)
+
+    def test_rebuild_projects_tasks_and_drops_orphans(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO userCalendarEvent (userID, taskID, eventTitle, startDate, isTaskBased) "
+                "VALUES (1, 999, 'Gone', '2025-01-01', 1)"
+            )
+        self.assertEqual(rebuild_calendar_events(chunk_size=3), (4, 1))
+        events = self.task_events()
+        self.assertEqual([(task_id, user_id) for task_id, user_id, *_ in events], [(1, 1), (2, 2), (3, 1), (4, 2)])
+        task_id, _, start_date, end_date, title = events[0]
+        self.assertEqual((end_date - start_date).days, 13)
+        self.assertEqual(title, 'Task 1-0')
+
+        # Rebuilding again writes the same rows
+        self.assertEqual(rebuild_calendar_events(), (4, 0))
+        self.assertEqual(self.task_events(), events)
+
+    def test_sync_and_remove(self):
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE task SET assignedTo = NULL WHERE taskID = 2")
+            cursor.execute("UPDATE task SET startDate = NULL, dueDate = NULL WHERE taskID = 4")
+        self.assertEqual(sync_project_events(1), 2)
+        self.assertEqual([row[0] for row in self.task_events()], [1, 3])
+
+        self.assertEqual(remove_task_events([1]), 1)
+        self.assertEqual([row[0] for row in self.task_events()], [3])
+        self.assertEqual(remove_project_events(1), 1)
+        self.assertEqual(self.task_events(), [])
+
+    def test_task_writes_move_the_projection(self):
+        self.client.force_login(self.user)
+        sync_project_events(1)
+        due_date = date.today() + timedelta(days=400)
+        response = self.client.put(
+            reverse('kanban_task_detail_api', args=[1]),
+            {'taskTitle': 'Moved', 'statusID': 2, 'projectID': 1, 'assignedTo': 2,
+             'dueDate': due_date.isoformat(), 'priority': 'High'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.task_events(userID=1, taskID=1), [])
+        [(_, user_id, start_date, end_date, title)] = self.task_events(taskID=1)
+        self.assertEqual((user_id, title, end_date), (2, 'Moved', due_date))
+        # Start clamped to the longest span the window queries allow
+        self.assertEqual((end_date - start_date).days, MAX_EVENT_SPAN_DAYS)
+
+        response = self.client.post(
+            reverse('kanban_tasks_api'),
+            {'taskTitle': 'New', 'statusID': 1, 'projectID': 1, 'assignedTo': 1, 'dueDate': '2025-05-01'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        new_task_id = response.json()['taskID']
+        self.assertEqual(self.task_events(taskID=new_task_id)[0][1:4], (1, date(2025, 5, 1), date(2025, 5, 1)))
+
+        response = self.client.delete(reverse('kanban_task_detail_api', args=[new_task_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.task_events(taskID=new_task_id), [])
+
+
+class CalendarFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(1, 2, 2, 1)
+        cls.user = get_user_model().objects.create_user(username='dev1', password='dev1-pass')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def feed_url(self, token):
+        return reverse('calendar_feed', args=[token])
+
+    def test_rotation_revokes_old_feed_url(self):
+        old_url = self.feed_url(make_feed_token(1))
+        self.assertEqual(self.client.get(old_url).status_code, 200)
+
+        response = self.client.post(reverse('calendar_feed_rotate'))
+        self.assertEqual(response.status_code, 200)
+        new_url = response.json()['feedUrl']
+        self.assertNotEqual(new_url, 'http://testserver' + old_url)
+
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        new_response = self.client.get(new_url)
+        self.assertEqual(new_response.status_code, 200)
+        self.assertEqual(new_response['Content-Type'], 'text/calendar; charset=utf-8')
+
+        self.client.post(reverse('calendar_feed_rotate'))
+        self.assertEqual(self.client.get(new_url).status_code, 404)
+
+    def test_unversioned_token_is_revoked_by_first_rotation(self):
+        legacy_url = self.feed_url(signing.Signer(salt=FEED_TOKEN_SALT).sign('1'))
+        self.assertEqual(self.client.get(legacy_url).status_code, 200)
+        rotate_feed_token(1)
+        self.assertEqual(self.client.get(legacy_url).status_code, 404)
+
+    def test_rotation_revokes_despite_a_cached_feed(self):
+        # As on a worker whose own cache still holds the feed when another rotates
+        url = self.feed_url(make_feed_token(1))
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO calendarFeedKey (userID, keyVersion) VALUES (1, 1)")
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_tampered_token_is_rejected(self):
+        signature = make_feed_token(1).partition(':')[2]
+        self.assertEqual(self.client.get(self.feed_url(f'2.0:{signature}')).status_code, 404)
+
+
+class JobQueueTests(TestCase):
+
+    def run_with(self, handler, **enqueue_options):
+        job_id = enqueue_job('calendar', {'action': 'calendar'}, **enqueue_options)
+        with mock.patch.dict(JOB_HANDLERS, {'calendar': handler}):
+            run_due_jobs()
+        return get_job(job_id)
+
+    def make_due(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE outboundJob SET runAfter = '2000-01-01 00:00:00.000' WHERE jobID = %s", [job_id])
+
+    def test_claim_marks_running_once(self):
+        job_id = enqueue_job('email', {'action': 'email'})
+        job = claim_next_job()
+        self.assertEqual((job[0], job[3]), (job_id, 1))
+        self.assertEqual(get_job(job_id)['status'], JOB_RUNNING)
+        self.assertIsNone(claim_next_job())
+
+    def test_success_stores_response(self):
+        job = self.run_with(lambda payload: 'ok')
+        self.assertEqual((job['status'], job['attempts'], job['response']), (JOB_SUCCEEDED, 1, 'ok'))
+
+    def test_transient_failure_backs_off(self):
+        job = self.run_with(failing_handler(ConnectionError('down')))
+        self.assertEqual((job['status'], job['attempts'], job['lastError']), (JOB_QUEUED, 1, 'down'))
+        # Not due again until the backoff has passed
+        self.assertIsNone(claim_next_job())
+        self.assertGreaterEqual(backoff_seconds(1), BACKOFF_BASE_SECONDS)
+        self.assertLessEqual(backoff_seconds(1), BACKOFF_BASE_SECONDS * 1.1)
+        self.assertLessEqual(backoff_seconds(50), BACKOFF_MAX_SECONDS * 1.1)
+
+    def test_attempts_run_out(self):
+        job = self.run_with(failing_handler(ConnectionError('down')), max_attempts=2)
+        self.make_due(job['jobID'])
+        with mock.patch.dict(JOB_HANDLERS, {'calendar': failing_handler(ConnectionError('still down'))}):
+            run_due_jobs()
+        job = get_job(job['jobID'])
+        self.assertEqual((job['status'], job['attempts'], job['lastError']), (JOB_FAILED, 2, 'still down'))
+
+    def test_permanent_error_fails_at_once(self):
+        job = self.run_with(failing_handler(PermanentJobError('HTTP 400')))
+        self.assertEqual((job['status'], job['attempts']), (JOB_FAILED, 1))
+
+    def test_open_circuit_defers_without_using_an_attempt(self):
+        job = self.run_with(failing_handler(CircuitOpenError('open', retry_after=30)), max_attempts=1)
+        self.assertEqual((job['status'], job['attempts']), (JOB_QUEUED, 0))
+        self.assertIsNone(claim_next_job())
+
+    def test_stale_running_job_is_requeued(self):
+        job_id = enqueue_job('email', {'action': 'email'})
+        claim_next_job()
+        self.assertEqual(requeue_stale_jobs(60), 0)
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE outboundJob SET lockedAt = '2000-01-01 00:00:00.000' WHERE jobID = %s", [job_id])
+        self.assertEqual(requeue_stale_jobs(60), 1)
+        self.assertEqual(claim_next_job()[0], job_id)
+
+
+class BulkInvitationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(0, 0, 2, 0)
+        cls.user = get_user_model().objects.create_user(username='inviter', password='inviter-pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, invitations):
+        return self.client.post(
+            reverse('send_invitations_bulk'), json.dumps({'invitations': invitations}),
+            content_type='application/json'
+        )
+
+    def stored_payloads(self, job_ids):
+        placeholders = ','.join(['%s'] * len(job_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT jobID, payload FROM outboundJob WHERE jobID IN ({placeholders})", job_ids)
+            return {job_id: json.loads(payload) for job_id, payload in cursor.fetchall()}
+
+    def test_partial_failures_are_reported_per_recipient(self):
+        response = self.post([
+            {'email': 'new@example.com', 'role': 'Client'},
+            {'email': 'not-an-email', 'role': 'Client'},
+            {'email': 'NEW@example.com', 'role': 'Developer'},
+            {'email': 'dev1@example.com', 'role': 'Developer'},
+            'garbage',
+            {'email': 'other@example.com', 'role': 'Developer'},
+        ])
+        self.assertEqual(response.status_code, 202)
+        body = response.json()
+        self.assertEqual(
+            [r['status'] for r in body['results']],
+            ['queued', 'invalid', 'duplicate', 'already_registered', 'invalid', 'queued'],
+        )
+        self.assertEqual(body['queued'], 2)
+
+        queued = [r for r in body['results'] if r['status'] == 'queued']
+        payloads = self.stored_payloads([r['jobID'] for r in queued])
+        for result in queued:
+            self.assertEqual(payloads[result['jobID']]['email'], result['email'])
+            self.assertEqual(self.client.get(result['statusUrl']).json()['status'], JOB_QUEUED)
+        self.assertIn('/registerclient.html', payloads[queued[0]['jobID']]['event'])
+        self.assertIn('/registerdev.html', payloads[queued[1]['jobID']]['event'])
+
+    def test_jobs_are_stored_with_one_insert(self):
+        emails = [f"person{i}@example.com" for i in range(25)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post([{'email': email, 'role': 'Developer'} for email in emails])
+        self.assertEqual(response.status_code, 202, response.content)
+        inserts = [q['sql'] for q in queries.captured_queries if 'INSERT INTO outboundJob' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+
+        results = response.json()['results']
+        payloads = self.stored_payloads([r['jobID'] for r in results])
+        self.assertEqual([payloads[r['jobID']]['email'] for r in results], emails)
+
+    def test_chunked_inserts_keep_payload_order(self):
+        with mock.patch('apps.home.jobs.ENQUEUE_CHUNK_SIZE', 4):
+            job_ids = enqueue_jobs('email', [{'n': n} for n in range(10)])
+        self.assertEqual(len(set(job_ids)), 10)
+        payloads = self.stored_payloads(job_ids)
+        self.assertEqual([payloads[job_id]['n'] for job_id in job_ids], list(range(10)))
+
+    def test_nothing_to_queue(self):
+        response = self.post([{'email': 'dev2@example.com'}, {'email': 'bad'}])
+        self.assertEqual(response.json()['queued'], 0)
+        self.assertEqual(self.post([]).status_code, 400)
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic / time.sleep: sleeping advances the clock
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=self.clock)
+
+    def fail(self, times):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.fail(1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.clock.now += 10
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.before_call()
+        self.assertAlmostEqual(raised.exception.retry_after, 20)
+        self.assertEqual(self.breaker.metrics()['opened'], 1)
+        self.assertEqual(self.breaker.metrics()['rejected'], 1)
+
+    def test_half_open_trial_success_closes(self):
+        self.fail(3)
+        self.clock.now += 30
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # Only one trial call at a time
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_half_open_trial_failure_reopens(self):
+        self.fail(3)
+        self.clock.now += 31
+        self.fail(1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.metrics()['opened'], 2)
+        self.clock.now += 29
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_client_counts_5xx_and_429_as_failures(self):
+        client = OutboundClient('https://example.invalid/', breaker=self.breaker)
+        responses = iter([503, 429, 404, 500, 500, 500])
+        client._session = mock.Mock(post=lambda *args, **kwargs: mock.Mock(status_code=next(responses)))
+        client._pid = os.getpid()
+        for _ in range(3):
+            client.post_json('test', {})
+        self.assertEqual(self.breaker.consecutive_failures, 0)
+        for _ in range(3):
+            client.post_json('test', {})
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            client.post_json('test', {})
+        self.assertEqual(client.metrics()['latency']['test']['errors'], 5)
+
+    def test_open_circuit_leaves_rate_limit_tokens(self):
+        limiter = RateLimiter(rate=1, burst=2, clock=self.clock, sleep=self.clock.sleep)
+        client = OutboundClient('https://example.invalid/', breaker=self.breaker, rate_limiter=limiter)
+        client._session = mock.Mock(post=lambda *args, **kwargs: mock.Mock(status_code=200))
+        client._pid = os.getpid()
+        self.fail(3)
+        for _ in range(5):
+            with self.assertRaises(CircuitOpenError):
+                client.post_json('test', {})
+
+        # The rejected calls took nothing from the bucket: a full burst is left
+        self.clock.now += 30
+        client.post_json('test', {})
+        client.post_json('test', {})
+        self.assertEqual(self.clock.sleeps, [])
+
+
+class RateLimiterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_burst_then_blocks(self):
+        limiter = RateLimiter(rate=2, burst=3, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_tokens_refill_up_to_burst(self):
+        limiter = RateLimiter(rate=1, burst=2, clock=self.clock, sleep=self.clock.sleep)
+        limiter.acquire()
+        limiter.acquire()
+        self.clock.now += 60
+        for _ in range(2):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+
+class SprintPlanningTests(SimpleTestCase):
+    start = date(2025, 1, 6)
+    end = date(2025, 3, 3)  # 56 days: four 2-week sprints
+
+    def test_overflow_rounds_sprint_capacity_up(self):
+        # 10 tasks over 4 sprints: 3 per sprint, the overflow lands in the last one
+        layout = sprint_layout(10, self.start, self.end)
+        self.assertEqual(layout, (4, 14, 3))
+        schedule = schedule_tasks(10, self.start, self.end)
+        self.assertEqual(list(schedule.task_sprints), [0, 0, 0, 1, 1, 1, 2, 2, 2, 3])
+
+    def test_overflow_with_fixed_sprint_count(self):
+        schedule = schedule_tasks(10, self.start, self.end, num_sprints_input=3)
+        self.assertEqual(schedule.num_sprints, 3)
+        self.assertEqual([list(schedule.task_sprints).count(i) for i in range(3)], [4, 4, 2])
+        self.assertEqual(schedule.sprint_dates(2)[1], self.end)
+
+    def test_tasks_keep_their_priority_order(self):
+        # Callers pass titles most urgent first; due dates must never go backwards
+        titles = [f"P{i}" for i in range(7)]
+        planned = plan_project_tasks(1, titles, self.start, self.end)
+        self.assertEqual([t['taskTitle'] for t in planned], titles)
+        due_dates = [t['dueDate'] for t in planned]
+        self.assertEqual(due_dates, sorted(due_dates))
+        self.assertEqual(planned[-1]['dueDate'], self.end)
+        self.assertTrue(all(t['startDate'] <= t['dueDate'] for t in planned))
+
+    def test_automatic_layout_leaves_no_sprint_empty(self):
+        schedule = schedule_tasks(2, self.start, self.end)
+        self.assertEqual(schedule.num_sprints, 2)
+        self.assertEqual(list(schedule.task_sprints), [0, 1])
+        self.assertEqual(schedule.sprint_dates(1)[1], self.end)
+
+    def test_fixed_sprint_count_can_leave_trailing_sprints_empty(self):
+        schedule = schedule_tasks(2, self.start, self.end, num_sprints_input=4)
+        self.assertEqual(schedule.num_sprints, 4)
+        self.assertEqual(list(schedule.task_sprints), [0, 1])
+        self.assertEqual(schedule.sprint_dates(3)[1], self.end)
 
-from django.test import TestCase
+    def test_no_tasks(self):
+        self.assertEqual(plan_project_tasks(1, [], self.start, self.end), [])
+        schedule = schedule_tasks(0, self.start, self.end)
+        self.assertEqual(schedule.num_tasks, 0)
+        self.assertEqual(list(schedule.iter_tasks()), [])
 
-# Create your tests here.
+    def test_deadline_before_start_still_gets_one_day(self):
+        self.assertEqual(sprint_layout(3, self.end, self.start), (1, 1, 3))
+        self.assertEqual(estimate_sprint_count(self.end, self.start), 1)
+        self.assertEqual(estimate_sprint_count(None, self.end), 1)
@@ -0,0 +1,156 @@
+"""
+Gantt chart data for the project timeline.
+
+The page itself only carries the sprint overview rows, which are cached
+per project under the project's revision (projectRollup.revision). Every
+task write bumps that revision, so a stale entry is never read again and
+simply expires. Task rows are streamed separately, one date window at a
+time, by iter_gantt_task_json().
+
+Rows are serialized with core.fast_json: dates go to the encoder as they
+come from the cursor, and each streamed chunk is one encoder call.
+"""
+from django.core.cache import cache
+from django.db import connection
+
+from apps.home.scheduling import sprint_number, timeline_sprints
+from core.fast_json import dumps, dumps_array_items
+
+GANTT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Rows pulled from the cursor per round while streaming task rows
+STREAM_CHUNK_SIZE = 500
+
+# 'Percent Complete' is based on status: Completed(3)=100, In Progress(2)=50, Others=0
+COMPLETION_SQL = """
+    CASE
+        WHEN statusID = 3 THEN 100
+        WHEN statusID = 2 THEN 50
+        ELSE 0
+    END
+"""
+
+
+def fetch_sprint_stats(project_id):
+    """
+    Returns (startDate, task_count, sum_completion) per distinct task start date.
+    Generated tasks share their sprint's start date, so this stays small
+    even for projects with thousands of tasks.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT startDate, COUNT(*), SUM({COMPLETION_SQL})
+            FROM task
+            WHERE projectID = %s AND startDate IS NOT NULL
+            GROUP BY startDate
+        """, [project_id])
+        return cursor.fetchall()
+
+
+def build_sprint_overview(project_start, project_end, start_date_stats):
+    """
+    One Google Charts Gantt row per 2-week sprint, with the average
+    completion of the tasks starting in it
+    """
+    gantt_data = []
+    if not (project_start and project_end):
+        return gantt_data
+
+    # --- Calculate Sprint Stats for Progress ---
+    sprint_stats = {}
+    for start_date, task_count, sum_completion in start_date_stats:
+        sprint_num = sprint_number(project_start, start_date)
+        stats = sprint_stats.setdefault(sprint_num, {'total': 0, 'sum_progress': 0})
+        stats['total'] += task_count
+        stats['sum_progress'] += int(sum_completion or 0)
+
+    # --- Add Sprint Overview Rows ---
+    for sprint_num, s_start, s_end in timeline_sprints(project_start, project_end):
+        avg_progress = 0
+        if sprint_num in sprint_stats:
+            stats = sprint_stats[sprint_num]
+            if stats['total'] > 0:
+                avg_progress = stats['sum_progress'] / stats['total']
+
+        gantt_data.append([
+            f"Sprint_{sprint_num}",
+            f"Sprint {sprint_num} (Overview)",
+            f"Sprint {sprint_num}",
+            s_start,
+            s_end,
+            None,
+            avg_progress,
+            None
+        ])
+    return gantt_data
+
+
+def gantt_task_row(project_start, task):
+    """
+    (taskID, taskTitle, startDate, dueDate, completion) -> Gantt row
+    """
+    resource_name = 'General'
+    if project_start:
+        resource_name = f"Sprint {sprint_number(project_start, task[2])}"
+    return [
+        str(task[0]),                       # Task ID
+        task[1],                            # Task Name
+        resource_name,                      # Resource
+        task[2],                            # Start Date
+        task[3],                            # End Date
+        None,                               # Duration
+        task[4],                            # Percent Complete
+        None                                # Dependencies
+    ]
+
+
+def iter_gantt_task_json(project_id, project_start, window_start=None, window_end=None):
+    """
+    Yields a JSON array of Gantt task rows, chunk by chunk, for tasks that
+    overlap [window_start, window_end] (either bound may be None).
+    Tasks without both dates are not drawn and are skipped.
+    """
+    query = f"""
+        SELECT taskID, taskTitle, startDate, dueDate, {COMPLETION_SQL}
+        FROM task
+        WHERE projectID = %s AND startDate IS NOT NULL AND dueDate IS NOT NULL
+    """
+    params = [project_id]
+    if window_end:
+        query += " AND startDate <= %s"
+        params.append(window_end)
+    if window_start:
+        query += " AND dueDate >= %s"
+        params.append(window_start)
+    query += " ORDER BY startDate ASC, taskID ASC"
+
+    yield b'['
+    first = True
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(STREAM_CHUNK_SIZE)
+            if not rows:
+                break
+            chunk = dumps_array_items([gantt_task_row(project_start, row) for row in rows])
+            yield chunk if first else b',' + chunk
+            first = False
+    yield b']'
+
+
+def gantt_cache_key(project_id, revision, project_start, project_end):
+    # Dates are part of the key so a project edit never serves old sprint rows
+    return f"gantt-overview:{project_id}:{revision}:{project_start}:{project_end}"
+
+
+def get_sprint_overview_json(project_id, project_start, project_end, revision):
+    """
+    Returns the serialized sprint overview rows, from cache when the revision matches
+    """
+    key = gantt_cache_key(project_id, revision, project_start, project_end)
+    gantt_json = cache.get(key)
+    if gantt_json is None:
+        stats = fetch_sprint_stats(project_id)
+        gantt_json = dumps(build_sprint_overview(project_start, project_end, stats)).decode('utf-8')
+        cache.set(key, gantt_json, GANTT_CACHE_TIMEOUT)
+    return gantt_json
@@ -24,18 +24,36 @@ urlpatterns = [
 
     # Kanban API endpoints
     path('api/kanban-tasks/', views.kanban_tasks_api, name='kanban_tasks_api'),
+    path('api/kanban-tasks/changes/', views.kanban_task_changes_api, name='kanban_task_changes_api'),
+    path('api/kanban-events/', views.kanban_events, name='kanban_events'),
     path('api/kanban-tasks/<int:task_id>/', views.kanban_task_detail_api, name='kanban_task_detail_api'),
     path('api/projects/', views.projects_api, name='projects_api'),
     path('api/developers/', views.developers_api, name='developers_api'),
+
+    # CSV / NDJSON exports
+    path('api/export/projects/', views.export_projects_api, name='export_projects_api'),
+    path('api/export/tasks/', views.export_tasks_api, name='export_tasks_api'),
+    path('api/export/assignments/', views.export_assignments_api, name='export_assignments_api'),
+    path('api/db-pool-stats/', views.db_pool_stats_api, name='db_pool_stats_api'),
+    path('metrics/', views.metrics_view, name='metrics'),
+    path('api/outbound-http-stats/', views.outbound_http_stats_api, name='outbound_http_stats_api'),
     path('api/create-calendar-event/', views.create_calendar_event, name='create_calendar_event'),
     path('api/send-invitation/', views.send_invitation, name='send_invitation'),
+    path('api/send-invitations/', views.send_invitations_bulk, name='send_invitations_bulk'),
+    path('api/jobs/', views.jobs_status_api, name='jobs_status_api'),
+    path('api/jobs/<int:job_id>/', views.job_status_api, name='job_status_api'),
     path('registerclient.html', views.public_registration, {'template_name': 'registerclient.html'}, name='register_client'),
     path('registerdev.html', views.public_registration, {'template_name': 'registerdev.html'}, name='register_dev'),
     path('calendar/', views.calendar_view, name='calendar'),
+    path('calendar/feed/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
+    path('api/calendar-feed/rotate/', views.calendar_feed_rotate, name='calendar_feed_rotate'),
+    path('api/user-calendar-events/', views.user_calendar_events_api, name='user_calendar_events_api'),
+    path('api/user-calendar-events/<int:event_id>/', views.user_calendar_event_detail_api, name='user_calendar_event_detail_api'),
   
 
 
     path('project/<int:project_id>/timeline/', views.project_timeline, name='project_timeline'),
+    path('api/projects/<int:project_id>/timeline/', views.project_timeline_api, name='project_timeline_api'),
     path('project/<int:project_id>/edit/', views.edit_project, name='edit_project'),
 
     # Matches any html file (MUST be last to avoid catching other routes)
@@ -1,22 +1,62 @@
 """
 Copyright (c) 2019 - present AppSeed.us
 """
-from datetime import timedelta
-from django import template
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
-from django.template import loader, TemplateDoesNotExist
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template import TemplateDoesNotExist
 from django.urls import reverse
 from django.shortcuts import render, redirect
-from django.db import connection
+from django.db import connection, transaction
 from datetime import datetime, time
 from django.views.decorators.http import require_http_methods
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+import base64
 import json
-import math
-from django.core.mail import send_mail
+import logging
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from apps.authentication.forms import ClientSignUpForm, DeveloperSignUpForm
 from apps.home.profile_form import ProfileForm
-import requests
+from apps.home.broker import publish_task_event
+from apps.home.calendar_events import (
+    MAX_BULK_EVENTS, clean_event_fields, create_events, delete_event, fetch_user_events,
+    get_user_id, parse_event_date, update_events,
+)
+from apps.home.calendar_sync import (
+    remove_project_events, remove_task_events, sync_project_events, sync_task_events,
+)
+from apps.home.changefeed import (
+    MAX_CHANGES, current_revision, fetch_tombstones, next_revision,
+    record_project_tombstones, record_task_tombstones,
+)
+from apps.home.exports import export_chunk_size, export_response, parse_export_format
+from apps.home.ics import feed_key_version, get_user_feed, make_feed_token, read_feed_token, rotate_feed_token
+from apps.home.jobs import enqueue_job, enqueue_jobs, get_job, get_jobs
+from apps.home.metrics import render_metrics
+from apps.home.outbound_http import outbound_http_metrics
+from apps.home.push import open_event_stream
+from apps.home.reference_cache import (
+    get_clients, get_developers, get_project_names, get_status_names, invalidate_reference_data,
+)
+from apps.home.repositories import (
+    assign_developers, assigned_developer_ids, delete_project_rows, get_project, iter_assignment_chunks,
+    iter_project_chunks, list_projects,
+)
+from apps.home.rollup import (
+    apply_task_change, delete_project_rollup, get_project_rollup, lock_task, touch_project_revision,
+)
+from apps.home.scheduling import estimate_sprint_count
+from apps.home.sprint_planning import insert_planned_tasks, plan_project_tasks
+from apps.home.timeline import get_sprint_overview_json, iter_gantt_task_json
 import urllib.parse
+from core.db_pool.pool import pool_metrics
+from core.fast_json import FastJsonResponse
+from core.instrumentation import timed
+
+logger = logging.getLogger(__name__)
 
 # ...existing code...
 
@@ -83,78 +123,27 @@ PROJECT_TYPE_TASKS = {
     ]
 }
 
-def generate_tasks_for_project(project_type, project_id, start_date, end_date, num_sprints_input=None):
+def plan_tasks_for_project(project_type, project_id, start_date, end_date, num_sprints_input=None):
     """
-    AI function to automatically generate tasks based on project type.
-    Agile Update: Distributes tasks into Sprints (approx 2 weeks) with parallel execution.
+    Plans (without saving) the template tasks for a project type,
+    distributed into Sprints (approx 2 weeks) with parallel execution.
     """
     # Get task templates for the project type
     task_templates = PROJECT_TYPE_TASKS.get(project_type, PROJECT_TYPE_TASKS['Other'])
-    num_tasks = len(task_templates)
-    
-    # Calculate total duration
-    total_days = (end_date - start_date).days
-    if total_days < 1: total_days = 1
-    
-    if num_sprints_input and num_sprints_input > 0:
-        num_sprints = num_sprints_input
-        sprint_days = total_days // num_sprints
-        if sprint_days < 1: sprint_days = 1
-    else:
-        # Agile Strategy: Target 2-week Sprints (14 days)
-        target_sprint_days = 14
-        
-        # Calculate how many sprints fit in the timeline
-        num_sprints = math.ceil(total_days / target_sprint_days)
-        
-        # Adjust if project is short or very long
-        if num_sprints < 1:
-            num_sprints = 1
-            sprint_days = total_days
-        else:
-            # If we have more sprints than tasks, cap sprints to task count
-            if num_sprints > num_tasks:
-                num_sprints = num_tasks
-            sprint_days = total_days // num_sprints
+    return plan_project_tasks(
+        project_id, task_templates, start_date, end_date, num_sprints_input,
+        description=lambda sprint: f"Sprint {sprint} Task - {project_type}"
+    )
 
-    # Determine tasks per sprint (round up to ensure all tasks are covered)
-    tasks_per_sprint = math.ceil(num_tasks / num_sprints)
-    
-    current_sprint_start = start_date
-    task_idx = 0
-    
-    with connection.cursor() as cursor:
-        for sprint_i in range(num_sprints):
-            # Calculate Sprint End Date
-            if sprint_i == num_sprints - 1:
-                current_sprint_end = end_date
-            else:
-                current_sprint_end = current_sprint_start + timedelta(days=sprint_days - 1)
-            
-            # Get tasks for this sprint
-            sprint_tasks = task_templates[task_idx : task_idx + tasks_per_sprint]
-            task_idx += tasks_per_sprint
 
-            for task_title in sprint_tasks:
-                cursor.execute("""
-                    INSERT INTO task 
-                    (projectID, taskTitle, taskDescription, statusID, startDate, dueDate)
-                    VALUES (%s, %s, %s, 1, %s, %s)
-                """, [
-                project_id,
-                task_title,
-                f"Sprint {sprint_i + 1} Task - {project_type}",
-                current_sprint_start,
-                current_sprint_end
-            ])
-            
-            # Next sprint starts the day after this one ends
-            current_sprint_start = current_sprint_end + timedelta(days=1)
-            
-            if task_idx >= num_tasks:
-                break
-        
-        connection.commit()
+def generate_tasks_for_project(project_type, project_id, start_date, end_date, num_sprints_input=None):
+    """
+    AI function to automatically generate tasks based on project type.
+    Agile Update: Distributes tasks into Sprints (approx 2 weeks) with parallel execution.
+    Returns the generated task rows.
+    """
+    planned = plan_tasks_for_project(project_type, project_id, start_date, end_date, num_sprints_input)
+    return insert_planned_tasks(project_id, planned)
 
 
 @login_required(login_url="/login/")
@@ -185,30 +174,54 @@ def calculate_project_progress(project_id):
     - In Progress (ID 2): 50% value (0.5)
     - Pending/Cancelled (ID 1/4): 0% value (0.0)
     """
-    with connection.cursor() as cursor:
-        # Fetch just the statusID for all tasks in this project
-        cursor.execute("SELECT statusID FROM task WHERE projectID = %s", [project_id])
-        tasks = cursor.fetchall()
+    return calculate_projects_progress([project_id]).get(project_id, 0)
 
-    if not tasks:
-        return 0
 
-    total_tasks = len(tasks)
-    weighted_score = 0.0
+# Keep IN (...) lists well below MySQL's placeholder/packet limits
+PROGRESS_BATCH_SIZE = 1000
 
-    for task in tasks:
-        status_id = task[0]
-        
-        if status_id == 3:      # Completed
-            weighted_score += 1.0
-        elif status_id == 2:    # In Progress
-            weighted_score += 0.5
-        # status 1 (Pending) and 4 (Cancelled) add 0.0
-
-    # Calculate percentage: (Score / Total Count) * 100
-    progress_percent = int((weighted_score / total_tasks) * 100)
-    
-    return progress_percent
+def calculate_projects_progress(project_ids=None):
+    """
+    Bulk version of calculate_project_progress.
+    Returns {projectID: progress_percent} for the given project IDs (or for
+    every project with tasks when project_ids is None) using one grouped
+    aggregate per batch instead of one query per project.
+    Projects without tasks are reported as 0.
+    """
+    # Weights are stored as half-points so the SQL stays integer-only:
+    # Completed = 2, In Progress = 1, everything else = 0
+    query = """
+        SELECT projectID,
+               COUNT(*),
+               SUM(CASE WHEN statusID = 3 THEN 2 WHEN statusID = 2 THEN 1 ELSE 0 END)
+        FROM task
+    """
+    if project_ids is None:
+        batches = [None]
+        progress = {}
+    else:
+        project_ids = list(dict.fromkeys(project_ids))
+        batches = [project_ids[i:i + PROGRESS_BATCH_SIZE]
+                   for i in range(0, len(project_ids), PROGRESS_BATCH_SIZE)]
+        progress = {pid: 0 for pid in project_ids}
+
+    with connection.cursor() as cursor:
+        for batch in batches:
+            if batch is None:
+                cursor.execute(query + " GROUP BY projectID")
+            else:
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(
+                    query + f" WHERE projectID IN ({placeholders}) GROUP BY projectID",
+                    batch
+                )
+            for project_id, total_tasks, half_points in cursor.fetchall():
+                if not total_tasks:
+                    continue
+                weighted_score = float(half_points or 0) / 2
+                progress[project_id] = int((weighted_score / total_tasks) * 100)
+
+    return progress
 # apps/home/views.py
 
 @login_required(login_url="/login/")
@@ -217,57 +230,29 @@ def projects(request):
     Projects page view - Updated to fetch Developers and Clients for the form
     """
     try:
-        with connection.cursor() as cursor:
-            # 1. Fetch Clients
-            cursor.execute("SELECT clientID, companyName FROM client")
-            clients = cursor.fetchall()
-            
-            # 2. Fetch Developers (Users linked to Developer table)
-            cursor.execute("""
-                SELECT u.userID, u.username, u.firstName, u.lastName 
-                FROM user u 
-                JOIN developer d ON u.userID = d.developerID
-            """)
-            developers = cursor.fetchall()
-
-            # 3. Fetch Projects
-            cursor.execute("""
-                SELECT p.projectID, p.projectName, p.startDate, p.endDate, 
-                       p.projectProgress, c.companyName, s.statusDesc
-                FROM project p
-                LEFT JOIN client c ON p.clientID = c.clientID
-                LEFT JOIN status s ON p.statusID = s.statusID
-                ORDER BY p.projectID DESC
-            """)
-            projects_data = cursor.fetchall()
+        clients = get_clients()
+        developers = get_developers()
+        status_names = get_status_names()
 
         projects_list = []
-        for proj in projects_data:
-            # Using the dynamic calculation method we added previously
-            dynamic_progress = calculate_project_progress(proj[0]) 
-
-            # Calculate Est. Sprints (Agile: ~14 days per sprint)
-            sprints_count = 1
-            if proj[2] and proj[3]:
-                days = (proj[3] - proj[2]).days
-                if days > 0:
-                    sprints_count = math.ceil(days / 14)
-            
+        for proj in list_projects():
             projects_list.append({
-                    'projectID': proj[0],
-                    'projectName': proj[1],
-                    'startDate': proj[2],
-                    'endDate': proj[3],
-                    'projectProgress': dynamic_progress, 
-                    'clientName': proj[5] if proj[5] else 'No Client',
-                    'statusDesc': proj[6] if proj[6] else 'No Status',
-                    'sprintsCount': sprints_count
+                    'projectID': proj.projectID,
+                    'projectName': proj.projectName,
+                    'startDate': proj.startDate,
+                    'endDate': proj.endDate,
+                    # projectProgress is kept up to date by apps.home.rollup on every task write
+                    'projectProgress': proj.projectProgress or 0,
+                    'clientName': proj.client.companyName if proj.client else 'No Client',
+                    'statusDesc': status_names.get(proj.status_id) or 'No Status',
+                    # Calculate Est. Sprints (Agile: ~14 days per sprint)
+                    'sprintsCount': estimate_sprint_count(proj.startDate, proj.endDate)
                 })
 
         context = {
             'segment': 'projects',
-            'clients': [{'clientID': c[0], 'companyName': c[1]} for c in clients],
-            'developers': [{'id': d[0], 'name': f"{d[2]} {d[3]} ({d[1]})"} for d in developers],
+            'clients': clients,
+            'developers': [developer_option(d) for d in developers],
             'projects': projects_list
         }
     except Exception as e:
@@ -276,64 +261,51 @@ def projects(request):
     return render(request, 'home/projects.html', context)
 
 
+def developer_option(developer):
+    """
+    {'id', 'name'} entry of the developer selects on the projects and tables pages
+    """
+    return {
+        'id': developer['developerID'],
+        'name': f"{developer['firstName']} {developer['lastName']} ({developer['username']})",
+    }
+
+
 @login_required(login_url="/login/")
 def tables_view(request):
-    print("DEBUG: tables_view() called!")  # Check if view is being called
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT clientID, companyName FROM client")
-            clients = cursor.fetchall()
+        clients = get_clients()
+        status_names = get_status_names()
+        projects_data = list_projects()
+        logger.debug("tables_view: retrieved %d projects", len(projects_data))
 
-            cursor.execute("""
-                SELECT p.projectID, p.projectName, p.startDate, p.endDate, 
-                       p.projectProgress, c.companyName, s.statusDesc
-                FROM project p
-                LEFT JOIN client c ON p.clientID = c.clientID
-                LEFT JOIN status s ON p.statusID = s.statusID
-                ORDER BY p.projectID DESC
-            """)
-            projects_data = cursor.fetchall()
-            
-            print(f"DEBUG: Retrieved {len(projects_data)} projects")  # Debug line
-
-            # Fetch developers for assignment dropdown
-            try:
-                cursor.execute("""
-                    SELECT u.userID, u.username, u.firstName, u.lastName 
-                    FROM user u 
-                    JOIN developer d ON u.userID = d.developerID
-                """)
-                developers = cursor.fetchall()
-            except Exception:
-                developers = []
+        # Fetch developers for assignment dropdown
+        try:
+            developers = get_developers()
+        except Exception:
+            developers = []
 
         projects_list = []
         for proj in projects_data:
-            print(f"DEBUG: Processing project {proj[0]}: {proj[1]}")  # Debug line
-            dynamic_progress = calculate_project_progress(proj[0])
             projects_list.append({
-                'projectID': proj[0],
-                'projectName': proj[1],
-                'startDate': proj[2],
-                'endDate': proj[3],
-                'daysLeft': calculate_daysleft(proj[3]),
-                'projectProgress': dynamic_progress,
-                'clientName': proj[5] if proj[5] else 'No Client',
-                'statusDesc': proj[6] if proj[6] else 'No Status'
+                'projectID': proj.projectID,
+                'projectName': proj.projectName,
+                'startDate': proj.startDate,
+                'endDate': proj.endDate,
+                'daysLeft': calculate_daysleft(proj.endDate),
+                'projectProgress': proj.projectProgress or 0,
+                'clientName': proj.client.companyName if proj.client else 'No Client',
+                'statusDesc': status_names.get(proj.status_id) or 'No Status'
             })
 
-        print(f"DEBUG: Final projects_list has {len(projects_list)} items")  # Debug line
-        
         context = {
             'segment': 'tables',
-            'clients': [{'clientID': c[0], 'companyName': c[1]} for c in clients],
-            'developers': [{'id': d[0], 'name': f"{d[2]} {d[3]} ({d[1]})"} for d in developers],
+            'clients': clients,
+            'developers': [developer_option(d) for d in developers],
             'projects': projects_list
         }
     except Exception as e:
-        print(f"ERROR in tables_view: {e}")  # Debug line
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in tables_view")
         context = {'segment': 'tables', 'projects': [], 'error': str(e)}
 
     return render(request, 'home/tables.html', context)
@@ -346,23 +318,23 @@ def delete_project(request, project_id):
     """
     if request.method == 'POST':
         try:
-            with connection.cursor() as cursor:
-                # Delete all tasks associated with this project
-                cursor.execute("DELETE FROM task WHERE projectID = %s", [project_id])
-                
-                # Delete all project assignments
-                cursor.execute("DELETE FROM projectAssignment WHERE projectID = %s", [project_id])
-                
-                # Delete the project itself
-                cursor.execute("DELETE FROM project WHERE projectID = %s", [project_id])
-                
-                connection.commit()
+            with transaction.atomic():
+                # Leave tombstones so open kanban boards drop these tasks
+                record_project_tombstones(project_id, next_revision())
+
+                # Drop the tasks' calendar projections
+                remove_project_events(project_id)
+
+                # Drop the task counters
+                delete_project_rollup(project_id)
+
+                # Delete the tasks, the assignments and the project itself
+                delete_project_rows(project_id)
+                invalidate_reference_data('project_names')
             
             return redirect('tables')
-        except Exception as e:
-            print(f"Error deleting project: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error deleting project %s", project_id)
             return redirect('tables')
     
     return redirect('tables')
@@ -414,91 +386,38 @@ def create_project(request):
                     VALUES (%s, %s, 1, %s, %s, 0, %s, %s)
                 """, [project_name, project_type, start_date, end_date, created_by, client_id])
                 
-                # Get the new Project ID
-                cursor.execute("SELECT LAST_INSERT_ID()")
-                new_project_id = cursor.fetchone()[0]
+                new_project_id = cursor.lastrowid
 
                 # 3. Assign Developers (Insert into projectAssignment)
-                for dev_id in developer_ids:
-                    cursor.execute("""
-                        INSERT INTO projectAssignment (projectID, developerID, roleInProject)
-                        VALUES (%s, %s, 'Developer')
-                    """, [new_project_id, dev_id])
+                assign_developers(new_project_id, developer_ids)
 
                 connection.commit()
+            invalidate_reference_data('project_names')
 
             # 4. AUTO-TIMELINE GENERATION USING AI
             # Always generate tasks based on project type
-            generate_tasks_for_project(project_type, new_project_id, start_date, end_date, num_sprints_input)
-            
-            # Also support custom features if provided
-            try:
-                with connection.cursor() as cursor:
-                    if features_text:
-                        # Split features by new line
-                        features = [f.strip() for f in features_text.split('\n') if f.strip()]
-                        
-                        if features:
-                            # AGILE CALCULATION FOR CUSTOM FEATURES
-                            # Distribute features into Sprints (approx 2 weeks)
-                            
-                            total_days = (end_date - start_date).days
-                            if total_days < 1: total_days = 1
-                            
-                            if num_sprints_input and num_sprints_input > 0:
-                                num_sprints = num_sprints_input
-                                sprint_days = total_days // num_sprints
-                                if sprint_days < 1: sprint_days = 1
-                            else:
-                                target_sprint_days = 14
-                                num_sprints = math.ceil(total_days / target_sprint_days)
-                                
-                                # If we have more sprints than features, cap sprints to feature count to avoid empty sprints
-                                if num_sprints > len(features):
-                                    num_sprints = len(features)
-                                if num_sprints < 1: num_sprints = 1
-                                    
-                                sprint_days = total_days // num_sprints
-                                if sprint_days < 1: sprint_days = 1
-                            
-                            tasks_per_sprint = math.ceil(len(features) / num_sprints)
-                            
-                            current_task_start = start_date
-                            feature_idx = 0
-                            
-                            for sprint_i in range(num_sprints):
-                                if sprint_i == num_sprints - 1:
-                                    current_sprint_end = end_date
-                                else:
-                                    current_sprint_end = current_task_start + timedelta(days=sprint_days - 1)
-
-                                sprint_features = features[feature_idx : feature_idx + tasks_per_sprint]
-                                feature_idx += tasks_per_sprint
-
-                                for feature in sprint_features:
-                                    cursor.execute("""
-                                        INSERT INTO task 
-                                        (projectID, taskTitle, taskDescription, statusID, startDate, dueDate)
-                                        VALUES (%s, %s, %s, 1, %s, %s)
-                                    """, [new_project_id, feature, f"Sprint {sprint_i + 1} - Custom Feature", current_task_start, current_sprint_end])
-                                
-                                # Set next task to start the day after this one ends
-                                current_task_start = current_task_end + timedelta(days=1)
-                    
-                    # Explicitly commit after all inserts
-                    connection.commit()
+            planned = plan_tasks_for_project(project_type, new_project_id, start_date, end_date, num_sprints_input)
 
-            except Exception as e:
-                print(f"Error creating custom features tasks: {e}")
-                import traceback
-                traceback.print_exc()
+            # Also support custom features if provided (split by new line),
+            # distributed into their own Sprints (approx 2 weeks)
+            features = [f.strip() for f in features_text.split('\n') if f.strip()]
+            planned += plan_project_tasks(
+                new_project_id, features, start_date, end_date, num_sprints_input,
+                description=lambda sprint: f"Sprint {sprint} - Custom Feature"
+            )
+
+            # Save the whole schedule in one transaction
+            try:
+                with transaction.atomic():
+                    insert_planned_tasks(new_project_id, planned)
+                    sync_project_events(new_project_id)
+            except Exception:
+                logger.exception("Error creating tasks for project %s", new_project_id)
 
             return redirect('tables')
             
-        except Exception as e:
-            print(f"Error creating project: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error creating project")
             return redirect('tables')
 
     return redirect('tables')
@@ -506,116 +425,43 @@ def create_project(request):
 @login_required(login_url="/login/")
 def project_timeline(request, project_id):
     """
-    Displays the Gantt Chart Timeline for a specific project
+    Displays the Gantt Chart Timeline for a specific project.
+    Only the sprint overview rows are inlined (cached per project revision);
+    task rows are lazy-loaded per sprint window from project_timeline_api.
+    The page supports conditional GET (ETag / Last-Modified), so unchanged
+    projects cost a 304.
     """
     try:
         with connection.cursor() as cursor:
-            # 1. Fetch Project Details
+            # 1. Fetch Project Details (+ revision, bumped on every task write)
             cursor.execute("""
-                SELECT projectID, projectName, startDate, endDate, projectProgress 
-                FROM project 
-                WHERE projectID = %s
+                SELECT p.projectID, p.projectName, p.startDate, p.endDate, p.projectProgress,
+                       r.revision, r.updatedAt
+                FROM project p
+                LEFT JOIN projectRollup r ON r.projectID = p.projectID
+                WHERE p.projectID = %s
             """, [project_id])
             project = cursor.fetchone()
 
             if not project:
                 return redirect('projects')
 
-            # 2. Fetch Tasks for this Project
-            # We calculate 'Percent Complete' based on status: 
-            # Completed(3)=100, In Progress(2)=50, Others=0
-            cursor.execute("""
-                SELECT 
-                    taskID, 
-                    taskTitle, 
-                    startDate, 
-                    dueDate,
-                    CASE 
-                        WHEN statusID = 3 THEN 100
-                        WHEN statusID = 2 THEN 50
-                        ELSE 0 
-                    END as completion
-                FROM task 
-                WHERE projectID = %s
-                ORDER BY startDate ASC
-            """, [project_id])
-            tasks_db = cursor.fetchall()
+        revision = project[5] or 0
 
-        # 3. Format Data for Google Charts
-        gantt_data = []
-        
-        # --- NEW: Calculate Sprint Stats for Progress ---
-        sprint_stats = {}
-        if project[2]: # If project has start date
-            for t in tasks_db:
-                if t[2]: # Task start date
-                    days_from_start = (t[2] - project[2]).days
-                    sprint_num = (days_from_start // 14) + 1
-                    if sprint_num < 1: sprint_num = 1
-                    
-                    if sprint_num not in sprint_stats:
-                        sprint_stats[sprint_num] = {'total': 0, 'sum_progress': 0}
-                    
-                    sprint_stats[sprint_num]['total'] += 1
-                    sprint_stats[sprint_num]['sum_progress'] += t[4]
-
-        # --- NEW: Add Sprint Overview Rows ---
-        if project[2] and project[3]:
-            total_days = (project[3] - project[2]).days
-            if total_days < 1: total_days = 1
-            num_sprints = math.ceil(total_days / 14)
-            if num_sprints < 1: num_sprints = 1
-            
-            for i in range(num_sprints):
-                sprint_num = i + 1
-                s_start = project[2] + timedelta(days=i*14)
-                s_end = s_start + timedelta(days=14)
-                if s_end > project[3]:
-                    s_end = project[3]
-                
-                avg_progress = 0
-                if sprint_num in sprint_stats:
-                    stats = sprint_stats[sprint_num]
-                    if stats['total'] > 0:
-                        avg_progress = stats['sum_progress'] / stats['total']
-
-                gantt_data.append([
-                    f"Sprint_{sprint_num}",
-                    f"Sprint {sprint_num} (Overview)",
-                    f"Sprint {sprint_num}",
-                    s_start.strftime('%Y-%m-%d'),
-                    s_end.strftime('%Y-%m-%d'),
-                    None,
-                    avg_progress,
-                    None
-                ])
-
-        # --- Add Task Rows ---
-        for t in tasks_db:
-            start_str = t[2].strftime('%Y-%m-%d') if t[2] else ''
-            end_str = t[3].strftime('%Y-%m-%d') if t[3] else ''
-            
-            resource_name = 'General'
-            if t[2] and project[2]:
-                days_from_start = (t[2] - project[2]).days
-                sprint_num = (days_from_start // 14) + 1
-                if sprint_num < 1: sprint_num = 1
-                resource_name = f"Sprint {sprint_num}"
-
-            if start_str and end_str:
-                gantt_data.append([
-                    str(t[0]),      # Task ID
-                    t[1],           # Task Name
-                    resource_name,  # Resource
-                    start_str,      # Start Date
-                    end_str,        # End Date
-                    None,           # Duration
-                    t[4],           # Percent Complete
-                    None            # Dependencies
-                ])
-        
-        # Sort by start date
-        gantt_data.sort(key=lambda x: x[3])
+        # 'days left' changes at midnight and the page is per user, so both
+        # go into the validators alongside the project revision
+        today = datetime.now().date()
+        etag = quote_etag(f"timeline-{project[0]}-{revision}-{request.user.pk}-{today.isoformat()}")
+        last_modified = int(datetime.combine(today, time.min).timestamp())
+        if project[6]:
+            last_modified = max(last_modified, int(project[6].timestamp()))
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        # 2. Sprint overview rows for Google Charts (cached under the project revision)
+        gantt_json = get_sprint_overview_json(project[0], project[2], project[3], revision)
 
         context = {
             'segment': 'projects',
@@ -627,58 +473,73 @@ def project_timeline(request, project_id):
                 'progress': project[4],
                 'days_left': calculate_daysleft(project[3])
             },
-            'gantt_data': json.dumps(gantt_data) # Pass as JSON to template
+            'gantt_data': gantt_json # Pass as JSON to template
         }
-        return render(request, 'home/project_timeline.html', context)
+        response = render(request, 'home/project_timeline.html', context)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
     except Exception:
         return redirect('projects')
 
 @login_required(login_url="/login/")
-def edit_project(request, project_id):
+@require_http_methods(["GET"])
+def project_timeline_api(request, project_id):
     """
-    Edit project details (GET shows form, POST updates)
+    GET: Streams the Gantt task rows of a project as a JSON array.
+         ?from=YYYY-MM-DD&to=YYYY-MM-DD limits it to tasks overlapping that window
     """
     try:
-        with connection.cursor() as cursor:
-            # Fetch project
-            cursor.execute("""
-                SELECT projectID, projectName, projectType, statusID, startDate, endDate, projectProgress, createdBy, clientID
-                FROM project
-                WHERE projectID = %s
-            """, [project_id])
-            proj = cursor.fetchone()
+        window_start = datetime.strptime(request.GET['from'], '%Y-%m-%d').date() if request.GET.get('from') else None
+        window_end = datetime.strptime(request.GET['to'], '%Y-%m-%d').date() if request.GET.get('to') else None
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date format'}, status=400)
 
-            if not proj:
-                return redirect('projects')
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT startDate FROM project WHERE projectID = %s", [project_id])
+            project = cursor.fetchone()
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
 
-            # Fetch clients and developers for selects
-            cursor.execute("SELECT clientID, companyName FROM client ORDER BY companyName")
-            clients = cursor.fetchall()
+    if not project:
+        return JsonResponse({'error': 'Project not found'}, status=404)
 
-            cursor.execute("SELECT d.developerID, u.firstName, u.lastName FROM developer d LEFT JOIN user u ON d.developerID = u.userID ORDER BY u.firstName, u.lastName")
-            developers = cursor.fetchall()
+    return StreamingHttpResponse(
+        iter_gantt_task_json(project_id, project[0], window_start, window_end),
+        content_type='application/json'
+    )
 
-            # Fetch assigned developers for this project
-            cursor.execute("SELECT developerID FROM projectAssignment WHERE projectID = %s", [project_id])
-            assigned_rows = cursor.fetchall()
-            assigned_ids = [r[0] for r in assigned_rows]
+@login_required(login_url="/login/")
+def edit_project(request, project_id):
+    """
+    Edit project details (GET shows form, POST updates)
+    """
+    try:
+        proj = get_project(project_id)
+        if not proj:
+            return redirect('projects')
 
         # Prepare context
         context = {
             'segment': 'projects',
             'project': {
-                'projectID': proj[0],
-                'projectName': proj[1],
-                'projectType': proj[2] if len(proj) > 2 else '',
-                'statusID': proj[3],
-                'startDate': proj[4],
-                'endDate': proj[5],
-                'projectProgress': proj[6]
+                'projectID': proj.projectID,
+                'projectName': proj.projectName,
+                'projectType': proj.projectType or '',
+                'statusID': proj.status_id,
+                'startDate': proj.startDate,
+                'endDate': proj.endDate,
+                'projectProgress': proj.projectProgress
             },
-            'clients': [{'clientID': c[0], 'companyName': c[1]} for c in clients],
-            'developers': [{'developerID': d[0], 'firstName': d[1] or '', 'lastName': d[2] or ''} for d in developers],
-            'assigned_ids': assigned_ids
+            'clients': get_clients(order_by_name=True),
+            'developers': [
+                {'developerID': d['developerID'], 'firstName': d['firstName'] or '', 'lastName': d['lastName'] or ''}
+                for d in get_developers()
+            ],
+            'assigned_ids': assigned_developer_ids(project_id)
         }
 
         if request.method == 'POST':
@@ -689,7 +550,6 @@ def edit_project(request, project_id):
             start_date_str = request.POST.get('startDate')
             end_date_str = request.POST.get('deadline')
             developer_ids = request.POST.getlist('developers')
-            main_features = request.POST.get('mainFeatures', '').strip()
 
             # Basic validation
             if not project_name or not start_date_str or not end_date_str:
@@ -719,6 +579,12 @@ def edit_project(request, project_id):
                             # ignore individual insert errors
                             pass
 
+                # Name/dates changed: invalidate the cached timeline and
+                # refresh the project name carried by the task calendar events
+                touch_project_revision(project_id)
+                sync_project_events(project_id)
+                invalidate_reference_data('project_names')
+
                 return redirect('projects')
             except Exception as e:
                 context['error'] = str(e)
@@ -749,6 +615,19 @@ def pages(request):
         return render(request, 'home/page-500.html')
 
 
+def queued_job_response(job_id, message):
+    """
+    Body returned when an outbound call has been handed to the job queue
+    """
+    return {
+        'success': True,
+        'message': message,
+        'jobID': job_id,
+        'status': 'queued',
+        'statusUrl': reverse('job_status_api', args=[job_id]),
+    }
+
+
 @login_required(login_url="/login/")
 def create_calendar_event(request):
     """
@@ -775,10 +654,6 @@ def create_calendar_event(request):
                 except Exception:
                     pass # Fallback to using the string as-is if parsing fails
 
-            # Your Google Apps Script Web App URL
-            # Replace with the actual URL from your Google Script deployment
-            gas_url = "https://script.google.com/macros/s/AKfycbxSsqctRAjksqA2oKixnFnqiwMsodEfNu8ytMlw70X3l1of0OpOLmRMvSNbiIgzdfXp/exec"
-
             # Payload for Google Apps Script
             payload = {
                 "action": "calendar",
@@ -788,11 +663,9 @@ def create_calendar_event(request):
                 "calendarId": calendar_id
             }
 
-            # Send POST request to Google Apps Script
-            response = requests.post(gas_url, json=payload)
-
-            # Return the response from GAS to the frontend
-            return HttpResponse(response.text, content_type='text/plain')
+            # The Apps Script call runs in the outbound job worker, not in this request
+            job_id = enqueue_job('calendar', payload, created_by=request.user.pk)
+            return JsonResponse(queued_job_response(job_id, 'Calendar event queued'), status=202)
 
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
@@ -800,6 +673,24 @@ def create_calendar_event(request):
     return JsonResponse({'error': 'Invalid request method'}, status=405)
 
 
+def invitation_payload(request, email, role):
+    """
+    Apps Script payload for one invitation email
+    """
+    # Determine registration page based on role
+    reg_page = 'registerclient.html' if str(role).lower() == 'client' else 'registerdev.html'
+    invite_link = request.build_absolute_uri(f'/{reg_page}')
+
+    # The GAS script uses 'event' for the email body: "You are invited to " + data.event
+    message_context = f"Join Planny as a {role}. Register here: {invite_link}"
+
+    return {
+        "action": "email",
+        "email": email,
+        "event": message_context
+    }
+
+
 @login_required(login_url="/login/")
 def send_invitation(request):
     """
@@ -810,26 +701,12 @@ def send_invitation(request):
             data = json.loads(request.body)
             email = data.get('email')
             role = data.get('role', 'User')
-            
-            # Determine registration page based on role
-            reg_page = 'registerclient.html' if str(role).lower() == 'client' else 'registerdev.html'
-            invite_link = request.build_absolute_uri(f'/{reg_page}')
-            
-            # The GAS script uses 'event' for the email body: "You are invited to " + data.event
-            message_context = f"Join Planny as a {role}. Register here: {invite_link}"
 
-            gas_url = "https://script.google.com/macros/s/AKfycbxSsqctRAjksqA2oKixnFnqiwMsodEfNu8ytMlw70X3l1of0OpOLmRMvSNbiIgzdfXp/exec"
+            payload = invitation_payload(request, email, role)
+            job_id = enqueue_job('email', payload, created_by=request.user.pk)
 
-            payload = {
-                "action": "email",
-                "email": email,
-                "event": message_context 
-            }
-
-            response = requests.post(gas_url, json=payload)
-            
             # Return JSON as expected by the profile.html JS
-            return JsonResponse({'success': True, 'message': response.text})
+            return JsonResponse(queued_job_response(job_id, 'Invitation queued for sending'), status=202)
 
         except Exception as e:
             return JsonResponse({'success': False, 'error': str(e)})
@@ -837,68 +714,581 @@ def send_invitation(request):
     return JsonResponse({'success': False, 'error': 'Invalid request method'})
 
 
+# Most recipients accepted by one bulk invitation request
+MAX_BULK_INVITATIONS = 500
+
+
+def find_existing_user_emails(emails):
+    """
+    Lower-cased emails, among `emails`, that already belong to a user row
+    """
+    emails = list(emails)
+    if not emails:
+        return set()
+    placeholders = ','.join(['%s'] * len(emails))
+    with connection.cursor() as cursor:
+        # The column collation is case-insensitive, so this matches regardless of case
+        cursor.execute(f"SELECT email FROM user WHERE email IN ({placeholders})", emails)
+        return {row[0].lower() for row in cursor.fetchall() if row[0]}
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["POST"])
+def send_invitations_bulk(request):
+    """
+    POST: Queue many invitation emails at once.
+    Body: {"invitations": [{"email": "...", "role": "Client"}, ...]}
+    Recipients already registered (user.email) or repeated in the list are
+    skipped; the rest get one outbound job each, sent by the job worker on a
+    bounded, rate-limited thread pool. Returns one result per recipient.
+    """
+    try:
+        data = json.loads(request.body)
+        invitations = data.get('invitations')
+        if not isinstance(invitations, list) or not invitations:
+            return JsonResponse({'success': False, 'error': 'invitations must be a non-empty list'}, status=400)
+        if len(invitations) > MAX_BULK_INVITATIONS:
+            return JsonResponse({
+                'success': False,
+                'error': f'At most {MAX_BULK_INVITATIONS} invitations per request'
+            }, status=400)
+
+        results = []
+        seen = set()
+        for item in invitations:
+            item = item if isinstance(item, dict) else {}
+            email = str(item.get('email') or '').strip()
+            role = item.get('role') or 'User'
+            result = {'email': email, 'role': role}
+            try:
+                validate_email(email)
+            except ValidationError:
+                result['status'] = 'invalid'
+            else:
+                if email.lower() in seen:
+                    result['status'] = 'duplicate'
+                seen.add(email.lower())
+            results.append(result)
+
+        existing = find_existing_user_emails(
+            r['email'] for r in results if 'status' not in r
+        )
+        to_queue = []
+        for result in results:
+            if 'status' in result:
+                continue
+            if result['email'].lower() in existing:
+                result['status'] = 'already_registered'
+            else:
+                to_queue.append(result)
+
+        job_ids = enqueue_jobs(
+            'email',
+            [invitation_payload(request, r['email'], r['role']) for r in to_queue],
+            created_by=request.user.pk,
+        )
+        for result, job_id in zip(to_queue, job_ids):
+            result.update({
+                'status': 'queued',
+                'jobID': job_id,
+                'statusUrl': reverse('job_status_api', args=[job_id]),
+            })
+
+        return JsonResponse({'success': True, 'queued': len(job_ids), 'results': results}, status=202)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# Sign-up pages the invitation emails link to (see invitation_payload)
+REGISTRATION_FORMS = {
+    'registerclient.html': ClientSignUpForm,
+    'registerdev.html': DeveloperSignUpForm,
+}
+
+
+def create_member_rows(account, company_name=None):
+    """
+    The application's `user` row for a new login account, plus its `client`
+    row when company_name is given, its `developer` row otherwise.
+    Raw SQL sends no model signals, so the cached lists are dropped here
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO user (username, email) VALUES (%s, %s)", [account.username, account.email])
+        user_id = cursor.lastrowid
+        if company_name is not None:
+            cursor.execute("INSERT INTO client (companyName) VALUES (%s)", [company_name])
+            invalidate_reference_data('clients')
+        else:
+            cursor.execute("INSERT INTO developer (developerID) VALUES (%s)", [user_id])
+            invalidate_reference_data('developers')
+
+
 def public_registration(request, template_name):
-    return render(request, f'home/{template_name}')
+    form_class = REGISTRATION_FORMS[template_name]
+    msg = None
+    success = False
+
+    if request.method == "POST":
+        form = form_class(request.POST)
+        if form.is_valid():
+            with transaction.atomic():
+                account = form.save()
+                create_member_rows(account, form.cleaned_data.get('companyName'))
+
+            msg = 'User created - please <a href="/login">login</a>.'
+            success = True
+        else:
+            msg = 'Form is not valid'
+    else:
+        form = form_class()
+
+    return render(request, f'accounts/{template_name}', {"form": form, "msg": msg, "success": success})
 
 
 @login_required(login_url="/login/")
 def calendar_view(request):
     context = {'segment': 'calendar'}
+    user_id = get_user_id(request.user.username)
+    if user_id is not None:
+        context['feed_url'] = request.build_absolute_uri(
+            reverse('calendar_feed', args=[make_feed_token(user_id)])
+        )
     return render(request, 'home/calender.html', context)
 
 
+@require_http_methods(["GET", "HEAD"])
+def calendar_feed(request, token):
+    """
+    GET: iCalendar feed of a user's events and assigned tasks, for calendar clients.
+    Authenticated by the signed token in the URL (see calendar_view); tokens of an
+    older key version (see calendar_feed_rotate) get a 404. Past that one key lookup,
+    polls are answered from the cache, with a 304 when the client's ETag still matches.
+    """
+    try:
+        user_id, token_version = read_feed_token(token)
+    except (signing.BadSignature, ValueError):
+        return HttpResponse('Feed not found', status=404, content_type='text/plain')
+
+    try:
+        # Checked on every poll, so a rotation elsewhere takes effect at once
+        if token_version != feed_key_version(user_id):
+            return HttpResponse('Feed not found', status=404, content_type='text/plain')
+        etag, body = get_user_feed(user_id)
+    except Exception as e:
+        return HttpResponse(str(e), status=500, content_type='text/plain')
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="planny.ics"'
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["POST"])
+def calendar_feed_rotate(request):
+    """
+    POST: Revokes the user's calendar feed URL and returns a new one
+    """
+    user_id = get_user_id(request.user.username)
+    if user_id is None:
+        return JsonResponse({'success': False, 'error': 'User not found'}, status=404)
+    try:
+        token = rotate_feed_token(user_id)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    return JsonResponse({
+        'success': True,
+        'feedUrl': request.build_absolute_uri(reverse('calendar_feed', args=[token])),
+    })
+
+
+# ==================== USER CALENDAR EVENTS API ====================
+
+def _calendar_user_id(request):
+    user_id = get_user_id(request.user.username)
+    if user_id is None:
+        raise PermissionError('No user record for this account')
+    return user_id
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET", "POST", "PATCH"])
+def user_calendar_events_api(request):
+    """
+    GET: The user's events, optionally limited to a window (?from=YYYY-MM-DD&to=YYYY-MM-DD)
+    POST: Create one event, or many with {"events": [...]}
+    PATCH: Bulk update with {"events": [{"eventID": 1, ...fields}, ...]}
+    """
+    try:
+        user_id = _calendar_user_id(request)
+
+        if request.method == 'GET':
+            window_start = parse_event_date(request.GET['from'], 'from') if request.GET.get('from') else None
+            window_end = parse_event_date(request.GET['to'], 'to') if request.GET.get('to') else None
+            return JsonResponse({'events': fetch_user_events(user_id, window_start, window_end)})
+
+        data = json.loads(request.body)
+
+        if request.method == 'POST':
+            if 'events' not in data:
+                event_ids = create_events(user_id, [clean_event_fields(data)])
+                return JsonResponse({
+                    'success': True,
+                    'eventID': event_ids[0],
+                    'message': 'Calendar event created successfully'
+                }, status=201)
+
+            events = data['events']
+            if not isinstance(events, list) or len(events) > MAX_BULK_EVENTS:
+                raise ValueError(f'events must be a list of at most {MAX_BULK_EVENTS} events')
+            event_ids = create_events(user_id, [clean_event_fields(event) for event in events])
+            return JsonResponse({
+                'success': True,
+                'eventIDs': event_ids,
+                'message': f'{len(event_ids)} calendar events created successfully'
+            }, status=201)
+
+        # PATCH
+        events = data.get('events')
+        if not isinstance(events, list) or len(events) > MAX_BULK_EVENTS:
+            raise ValueError(f'events must be a list of at most {MAX_BULK_EVENTS} events')
+        updates = [(int(event['eventID']), clean_event_fields(event, partial=True)) for event in events]
+        found = update_events(user_id, updates)
+        missing = [event_id for event_id, _ in updates if event_id not in found]
+        return JsonResponse({
+            'success': True,
+            'updated': len(updates) - len(missing),
+            'notFound': missing,
+            'message': 'Events updated successfully'
+        })
+
+    except PermissionError as e:
+        return JsonResponse({'error': str(e)}, status=403)
+    except (KeyError, ValueError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["PATCH", "DELETE"])
+def user_calendar_event_detail_api(request, event_id):
+    """
+    PATCH: Partial update of one of the user's events
+    DELETE: Delete one of the user's events
+    """
+    try:
+        user_id = _calendar_user_id(request)
+
+        if request.method == 'PATCH':
+            values = clean_event_fields(json.loads(request.body), partial=True)
+            if event_id not in update_events(user_id, [(event_id, values)]):
+                return JsonResponse({'error': 'Event not found'}, status=404)
+            return JsonResponse({'success': True, 'message': 'Event updated successfully'})
+
+        if not delete_event(user_id, event_id):
+            return JsonResponse({'error': 'Event not found'}, status=404)
+        return JsonResponse({'success': True, 'message': 'Event deleted successfully'})
+
+    except PermissionError as e:
+        return JsonResponse({'error': str(e)}, status=403)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 # ==================== KANBAN API ENDPOINTS ====================
 
+def publish_after_commit(event_type, project_id, payload):
+    """
+    Pushes a kanban event to connected boards once the write is committed.
+    A broker failure never fails the write itself.
+    """
+    def _publish():
+        try:
+            publish_task_event(event_type, project_id, payload)
+        except Exception:
+            logger.exception("Error publishing %s event", event_type)
+
+    transaction.on_commit(_publish)
+
+
+KANBAN_PAGE_SIZE = 500
+KANBAN_MAX_PAGE_SIZE = 2000
+
+# Output field -> (SELECT expressions, join needed)
+KANBAN_TASK_FIELDS = {
+    'taskID': (['t.taskID'], None),
+    'taskTitle': (['t.taskTitle'], None),
+    'taskDescription': (['t.taskDescription'], None),
+    'statusID': (['t.statusID'], None),
+    'dueDate': (['t.dueDate'], None),
+    'projectID': (['t.projectID'], None),
+    'projectName': (['p.projectName'], 'project'),
+    'assignedTo': (['t.assignedTo'], None),
+    'assignedToName': (['u.firstName', 'u.lastName'], 'user'),
+    'priority': (['t.priority'], None),
+    'revision': (['t.revision'], None),
+}
+
+KANBAN_TASK_JOINS = {
+    'project': "LEFT JOIN project p ON t.projectID = p.projectID",
+    'user': "LEFT JOIN developer d ON t.assignedTo = d.developerID LEFT JOIN user u ON d.developerID = u.userID",
+}
+
+
+def _encode_kanban_cursor(project_id, status_id, task_id):
+    raw = f"{project_id}:{status_id}:{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_kanban_cursor(cursor_str):
+    """
+    Returns (projectID, statusID, taskID) or raises ValueError
+    """
+    padded = cursor_str + '=' * (-len(cursor_str) % 4)
+    parts = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+    if len(parts) != 3:
+        raise ValueError('Invalid cursor')
+    return tuple(int(part) for part in parts)
+
+
+def _parse_id_list(value):
+    """
+    '1,2, 3' -> [1, 2, 3]; raises ValueError on anything that is not an int
+    """
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def build_kanban_task_filters(params):
+    """
+    Translates query-string filters into a WHERE fragment and its parameters.
+    Supported: project, status, assignee, priority (comma separated lists),
+    due_from / due_to (YYYY-MM-DD, inclusive).
+    Raises ValueError on malformed input.
+    """
+    clauses = []
+    values = []
+
+    for param, column in (('project', 't.projectID'), ('status', 't.statusID'), ('assignee', 't.assignedTo')):
+        if params.get(param):
+            ids = _parse_id_list(params[param])
+            if ids:
+                clauses.append(f"{column} IN ({', '.join(['%s'] * len(ids))})")
+                values.extend(ids)
+
+    if params.get('priority'):
+        priorities = [p.strip() for p in params['priority'].split(',') if p.strip()]
+        if priorities:
+            clauses.append(f"t.priority IN ({', '.join(['%s'] * len(priorities))})")
+            values.extend(priorities)
+
+    if params.get('due_from'):
+        clauses.append("t.dueDate >= %s")
+        values.append(datetime.strptime(params['due_from'], '%Y-%m-%d').date())
+
+    if params.get('due_to'):
+        clauses.append("t.dueDate <= %s")
+        values.append(datetime.strptime(params['due_to'], '%Y-%m-%d').date())
+
+    return clauses, values
+
+
+def _parse_kanban_fields(params):
+    if not params.get('fields'):
+        return list(KANBAN_TASK_FIELDS)
+    fields = [f.strip() for f in params['fields'].split(',') if f.strip()]
+    unknown = [f for f in fields if f not in KANBAN_TASK_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def _kanban_task_select(leading_columns, fields):
+    """
+    Returns (columns, joins) for the requested fields, after leading_columns
+    """
+    columns = list(leading_columns)
+    joins = []
+    # assignedToName spans two columns; keeping it last lets every other
+    # field map 1:1 onto the row (see _kanban_rows_to_tasks)
+    for field in sorted(fields, key=lambda f: f == 'assignedToName'):
+        exprs, join = KANBAN_TASK_FIELDS[field]
+        columns.extend(exprs)
+        if join and KANBAN_TASK_JOINS[join] not in joins:
+            joins.append(KANBAN_TASK_JOINS[join])
+    return columns, joins
+
+
+def _kanban_rows_to_tasks(rows, fields, offset):
+    """
+    Converts rows built by _kanban_task_select into task dicts,
+    skipping the first `offset` (leading) columns. Values are passed
+    through as the cursor returns them (dueDate stays a date, encoded by
+    core.fast_json), so only assignedToName needs per-row work.
+    """
+    keys = [field for field in fields if field != 'assignedToName']
+    if len(keys) == len(fields):
+        return [dict(zip(keys, row[offset:])) for row in rows]
+
+    name_at = offset + len(keys)
+    tasks = []
+    for row in rows:
+        task = dict(zip(keys, row[offset:name_at]))
+        first_name, last_name = row[name_at], row[name_at + 1]
+        task['assignedToName'] = f"{first_name} {last_name}" if first_name and last_name else None
+        tasks.append(task)
+    return tasks
+
+
+def fetch_kanban_task_changes(params):
+    """
+    Returns the tasks written and deleted after ?since=<watermark>, filtered
+    like fetch_kanban_task_page. The result carries the new watermark, or
+    reset=True when too much changed and the client should reload instead.
+    Raises ValueError on malformed input.
+    """
+    since = int(params.get('since') or 0)
+    if since < 0:
+        raise ValueError('since must not be negative')
+    fields = _parse_kanban_fields(params)
+
+    # Read the watermark first: anything committed after this is picked up next time
+    watermark = current_revision()
+    if since >= watermark:
+        return {'watermark': watermark, 'reset': False, 'tasks': [], 'deleted': []}
+
+    columns, joins = _kanban_task_select(['t.revision'], fields)
+    clauses, values = build_kanban_task_filters(params)
+    clauses = ["t.revision > %s", "t.revision <= %s"] + clauses
+    values = [since, watermark] + values
+
+    query = f"SELECT {', '.join(columns)} FROM task t {' '.join(joins)} WHERE {' AND '.join(clauses)}"
+    query += " ORDER BY t.revision, t.taskID LIMIT %s"
+    values.append(MAX_CHANGES + 1)
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, values)
+        rows = cursor.fetchall()
+
+    project_ids = _parse_id_list(params['project']) if params.get('project') else None
+    deleted = fetch_tombstones(since, watermark, project_ids)
+
+    if len(rows) > MAX_CHANGES or len(deleted) > MAX_CHANGES:
+        return {'watermark': watermark, 'reset': True, 'tasks': [], 'deleted': []}
+
+    return {
+        'watermark': watermark,
+        'reset': False,
+        'tasks': _kanban_rows_to_tasks(rows, fields, 1),
+        'deleted': deleted,
+    }
+
+
+def fetch_kanban_task_page(params):
+    """
+    Returns one keyset page of kanban tasks ordered by (projectID, statusID, taskID).
+    Returns (tasks, next_cursor); next_cursor is None on the last page.
+    Tasks without a project or status have no board column and no place in
+    the keyset order (NULL compares as unknown), so they are left out.
+    Raises ValueError on malformed filters, fields, limit or cursor.
+    """
+    fields = _parse_kanban_fields(params)
+
+    limit = int(params.get('limit') or KANBAN_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    limit = min(limit, KANBAN_MAX_PAGE_SIZE)
+
+    # The keyset columns are always selected so the next cursor can be built
+    columns, joins = _kanban_task_select(['t.projectID', 't.statusID', 't.taskID'], fields)
+
+    clauses, values = build_kanban_task_filters(params)
+    # IS NOT NULL keeps the range scan on idx_task_board, unlike COALESCE
+    clauses += ["t.projectID IS NOT NULL", "t.statusID IS NOT NULL"]
+
+    if params.get('cursor'):
+        last_project, last_status, last_task = _decode_kanban_cursor(params['cursor'])
+        # Expanded row comparison so MySQL can use a range scan on the index
+        clauses.append("""
+            (t.projectID > %s
+             OR (t.projectID = %s AND (t.statusID > %s
+                                       OR (t.statusID = %s AND t.taskID > %s))))
+        """)
+        values.extend([last_project, last_project, last_status, last_status, last_task])
+
+    query = f"SELECT {', '.join(columns)} FROM task t {' '.join(joins)}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY t.projectID, t.statusID, t.taskID LIMIT %s"
+    values.append(limit + 1)
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, values)
+        rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    tasks = _kanban_rows_to_tasks(rows, fields, 3)
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = _encode_kanban_cursor(last[0], last[1], last[2])
+
+    return tasks, next_cursor
+
+
+def iter_kanban_task_chunks(params, chunk_size):
+    """
+    Yields every task matching the kanban filters, page by page
+    (fetch_kanban_task_page with limit=chunk_size), for the exports
+    """
+    page_params = params.dict() if hasattr(params, 'dict') else dict(params)
+    page_params.pop('cursor', None)
+    page_params['limit'] = chunk_size
+    while True:
+        tasks, next_cursor = fetch_kanban_task_page(page_params)
+        if tasks:
+            yield tasks
+        if next_cursor is None:
+            return
+        page_params['cursor'] = next_cursor
+
 @login_required(login_url="/login/")
 @require_http_methods(["GET", "POST"])
 def kanban_tasks_api(request):
     """
-    GET: Retrieve all tasks for kanban board
+    GET: Retrieve one page of tasks for the kanban board
+         ?project=&status=&assignee=&priority=&due_from=&due_to= filters,
+         ?fields= projection, ?limit= page size, ?cursor= from next_cursor
     POST: Create a new task
     """
     if request.method == 'GET':
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        t.taskID, 
-                        t.taskTitle, 
-                        t.taskDescription, 
-                        t.statusID, 
-                        t.dueDate, 
-                        t.projectID,
-                        p.projectName,
-                        t.assignedTo,
-                        u.firstName,
-                        u.lastName,
-                        t.priority
-                    FROM task t
-                    LEFT JOIN project p ON t.projectID = p.projectID
-                    LEFT JOIN developer d ON t.assignedTo = d.developerID
-                    LEFT JOIN user u ON d.developerID = u.userID
-                    ORDER BY t.projectID, t.statusID, t.taskID
-                """)
-                tasks = cursor.fetchall()
-                
-            task_list = []
-            for task in tasks:
-                task_list.append({
-                    'taskID': task[0],
-                    'taskTitle': task[1],
-                    'taskDescription': task[2],
-                    'statusID': task[3],
-                    'dueDate': task[4].strftime('%Y-%m-%d') if task[4] else None,
-                    'projectID': task[5],
-                    'projectName': task[6],
-                    'assignedTo': task[7],
-                    'assignedToName': f"{task[8]} {task[9]}" if task[8] and task[9] else None,
-                    'priority': task[10]
-                })
-            
-            return JsonResponse({'tasks': task_list})
+            # Read before the page so later writes show up in the next delta sync
+            watermark = current_revision()
+            tasks, next_cursor = fetch_kanban_task_page(request.GET)
+        except (ValueError, TypeError) as e:
+            return JsonResponse({'error': str(e)}, status=400)
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
 
+        with timed('serialize'):
+            return FastJsonResponse({
+                'tasks': tasks,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None,
+                'watermark': watermark,
+            })
+
     elif request.method == 'POST':
         try:
             data = json.loads(request.body)
@@ -929,16 +1319,30 @@ def kanban_tasks_api(request):
                 except ValueError:
                     return JsonResponse({'error': 'Invalid date format'}, status=400)
             
-            with connection.cursor() as cursor:
+            with transaction.atomic(), connection.cursor() as cursor:
+                revision = next_revision()
                 cursor.execute("""
                     INSERT INTO task 
-                    (taskTitle, taskDescription, statusID, dueDate, assignedTo, projectID, priority)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, [task_title, task_description, status_id, due_date_obj, assigned_to, project_id, priority])
+                    (taskTitle, taskDescription, statusID, dueDate, assignedTo, projectID, priority, revision)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, [task_title, task_description, status_id, due_date_obj, assigned_to, project_id, priority, revision])
                 
-                # Get the last inserted task ID
-                cursor.execute("SELECT LAST_INSERT_ID()")
-                last_id = cursor.fetchone()[0]
+                last_id = cursor.lastrowid
+
+                apply_task_change(project_id, new_status=status_id, created=True, revision=revision)
+                sync_task_events([last_id])
+
+                publish_after_commit('task.created', project_id, {'task': {
+                    'taskID': last_id,
+                    'taskTitle': task_title,
+                    'taskDescription': task_description,
+                    'statusID': status_id,
+                    'dueDate': due_date_obj.strftime('%Y-%m-%d') if due_date_obj else None,
+                    'projectID': project_id,
+                    'assignedTo': assigned_to,
+                    'priority': priority,
+                    'revision': revision,
+                }})
             
             return JsonResponse({'success': True, 'taskID': last_id, 'message': 'Task created successfully'})
         except json.JSONDecodeError:
@@ -947,6 +1351,55 @@ def kanban_tasks_api(request):
             return JsonResponse({'error': str(e)}, status=500)
 
 
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def kanban_task_changes_api(request):
+    """
+    GET: Tasks created/updated/deleted since ?since=<watermark>
+         (accepts the same filters and ?fields= as kanban_tasks_api)
+    """
+    try:
+        changes = fetch_kanban_task_changes(request.GET)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+    with timed('serialize'):
+        return FastJsonResponse(changes)
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def kanban_events(request):
+    """
+    GET: Live kanban events as Server-Sent Events, ?project= for one project.
+         Under ASGI core/asgi.py serves this path itself (see apps/home/push.py).
+         503 when the server is single-threaded or at its stream cap; the board then polls
+    """
+    try:
+        project_id = int(request.GET['project']) if request.GET.get('project') else None
+    except ValueError:
+        return JsonResponse({'error': 'Invalid project'}, status=400)
+
+    # A single-threaded worker would spend itself on one open board; refuse so
+    # the board polls the change feed instead
+    stream = open_event_stream(project_id) if request.META.get('wsgi.multithread') else None
+    if stream is None:
+        response = JsonResponse({'error': 'Live events unavailable, poll the change feed'}, status=503)
+        response['Retry-After'] = '60'
+        return response
+
+    # The stream never touches the database: hand the connection back to the pool
+    if not connection.in_atomic_block:
+        connection.close()
+
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required(login_url="/login/")
 @require_http_methods(["PATCH", "PUT", "DELETE"])
 def kanban_task_detail_api(request, task_id):
@@ -963,27 +1416,35 @@ def kanban_task_detail_api(request, task_id):
             if not status_id:
                 return JsonResponse({'error': 'Status is required'}, status=400)
             
-            with connection.cursor() as cursor:
-                # 1. Update the Task
-                cursor.execute("UPDATE task SET statusID = %s WHERE taskID = %s", [status_id, task_id])
-                
-                # 2. Find the project ID for this task
-                cursor.execute("SELECT projectID FROM task WHERE taskID = %s", [task_id])
-                row = cursor.fetchone()
-                if row:
-                    project_id = row[0]
-                    
-                    # 3. LOGIC: If task is 'In Progress' (2), set Project to 'In Progress' (2)
-                    # You can make this more complex (e.g., check if ALL are done)
-                    if int(status_id) == 2:
-                        cursor.execute("UPDATE project SET statusID = 2 WHERE projectID = %s", [project_id])
-                    
-                    # 4. LOGIC: If task is 'Completed' (3), check if ALL tasks are completed
-                    elif int(status_id) == 3:
-                        cursor.execute("SELECT count(*) FROM task WHERE projectID = %s AND statusID != 3", [project_id])
-                        remaining = cursor.fetchone()[0]
-                        if remaining == 0:
-                            cursor.execute("UPDATE project SET statusID = 3 WHERE projectID = %s", [project_id])
+            with transaction.atomic(), connection.cursor() as cursor:
+                # 1. Find the project ID and current status for this task (row stays locked)
+                row = lock_task(task_id)
+                if not row:
+                    return JsonResponse({'error': 'Task not found'}, status=404)
+
+                # 2. Update the Task
+                revision = next_revision()
+                cursor.execute("UPDATE task SET statusID = %s, revision = %s WHERE taskID = %s", [status_id, revision, task_id])
+
+                project_id = row[0]
+                apply_task_change(project_id, old_status=row[1], new_status=status_id, revision=revision)
+                publish_after_commit('task.updated', project_id, {'task': {
+                    'taskID': task_id,
+                    'statusID': status_id,
+                    'projectID': project_id,
+                    'revision': revision,
+                }})
+
+                # 3. LOGIC: If task is 'In Progress' (2), set Project to 'In Progress' (2)
+                # You can make this more complex (e.g., check if ALL are done)
+                if int(status_id) == 2:
+                    cursor.execute("UPDATE project SET statusID = 2 WHERE projectID = %s", [project_id])
+
+                # 4. LOGIC: If task is 'Completed' (3), check if ALL tasks are completed
+                elif int(status_id) == 3:
+                    counters = get_project_rollup(project_id)
+                    if counters and counters['completedTasks'] == counters['totalTasks']:
+                        cursor.execute("UPDATE project SET statusID = 3 WHERE projectID = %s", [project_id])
 
             return JsonResponse({'success': True, 'message': 'Task updated successfully'})
 
@@ -1022,12 +1483,44 @@ def kanban_task_detail_api(request, task_id):
                 except ValueError:
                     return JsonResponse({'error': 'Invalid date format'}, status=400)
             
-            with connection.cursor() as cursor:
+            with transaction.atomic(), connection.cursor() as cursor:
+                old = lock_task(task_id)
+                if not old:
+                    return JsonResponse({'error': 'Task not found'}, status=404)
+
+                revision = next_revision()
+                moved = str(old[0]) != str(project_id)
+                if moved:
+                    # Delta sync of the old project sees the task leave
+                    record_task_tombstones([task_id], revision)
                 cursor.execute("""
                     UPDATE task 
-                    SET taskTitle = %s, taskDescription = %s, statusID = %s, dueDate = %s, assignedTo = %s, projectID = %s, priority = %s
+                    SET taskTitle = %s, taskDescription = %s, statusID = %s, dueDate = %s, assignedTo = %s, projectID = %s, priority = %s, revision = %s
                     WHERE taskID = %s
-                """, [task_title, task_description, status_id, due_date_obj, assigned_to, project_id, priority, task_id])
+                """, [task_title, task_description, status_id, due_date_obj, assigned_to, project_id, priority, revision, task_id])
+
+                # Dates, title or assignee may have changed
+                sync_task_events([task_id])
+
+                task_payload = {'task': {
+                    'taskID': task_id,
+                    'taskTitle': task_title,
+                    'taskDescription': task_description,
+                    'statusID': status_id,
+                    'dueDate': due_date_obj.strftime('%Y-%m-%d') if due_date_obj else None,
+                    'projectID': project_id,
+                    'assignedTo': assigned_to,
+                    'priority': priority,
+                    'revision': revision,
+                }}
+                if moved:
+                    apply_task_change(old[0], old_status=old[1], deleted=True, revision=revision)
+                    apply_task_change(project_id, new_status=status_id, created=True, revision=revision)
+                    publish_after_commit('task.deleted', old[0], {'taskID': task_id, 'revision': revision})
+                    publish_after_commit('task.created', project_id, task_payload)
+                else:
+                    apply_task_change(old[0], old_status=old[1], new_status=status_id, revision=revision)
+                    publish_after_commit('task.updated', project_id, task_payload)
             
             return JsonResponse({'success': True, 'taskID': task_id, 'message': 'Task updated successfully'})
         except json.JSONDecodeError:
@@ -1037,8 +1530,18 @@ def kanban_task_detail_api(request, task_id):
 
     elif request.method == 'DELETE':
         try:
-            with connection.cursor() as cursor:
+            with transaction.atomic(), connection.cursor() as cursor:
+                old = lock_task(task_id)
+
+                if old:
+                    revision = next_revision()
+                    record_task_tombstones([task_id], revision)
+                remove_task_events([task_id])
                 cursor.execute("DELETE FROM task WHERE taskID = %s", [task_id])
+
+                if old:
+                    apply_task_change(old[0], old_status=old[1], deleted=True, revision=revision)
+                    publish_after_commit('task.deleted', old[0], {'taskID': task_id, 'revision': revision})
             
             return JsonResponse({'success': True, 'message': 'Task deleted successfully'})
         except Exception as e:
@@ -1051,16 +1554,7 @@ def projects_api(request):
     GET: Retrieve all projects
     """
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT projectID, projectName 
-                FROM project 
-                ORDER BY projectName
-            """)
-            projects = cursor.fetchall()
-        
-        projects_list = [{'projectID': p[0], 'projectName': p[1]} for p in projects]
-        return JsonResponse({'projects': projects_list})
+        return JsonResponse({'projects': get_project_names()})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -1071,23 +1565,171 @@ def developers_api(request):
     GET: Retrieve all developers
     """
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT d.developerID, u.firstName, u.lastName, u.email
-                FROM developer d
-                LEFT JOIN user u ON d.developerID = u.userID
-                ORDER BY u.firstName, u.lastName
-            """)
-            developers = cursor.fetchall()
-        
         developers_list = [
             {
-                'developerID': d[0], 
-                'firstName': d[1] if d[1] else '',
-                'lastName': d[2] if d[2] else '',
-                'email': d[3] if d[3] else ''
-            } for d in developers
+                'developerID': d['developerID'],
+                'firstName': d['firstName'] or '',
+                'lastName': d['lastName'] or '',
+                'email': d['email'] or ''
+            } for d in get_developers()
         ]
         return JsonResponse({'developers': developers_list})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
+
+
+PROJECT_EXPORT_COLUMNS = [
+    'projectID', 'projectName', 'clientName', 'statusDesc', 'startDate', 'endDate', 'daysLeft', 'projectProgress',
+]
+
+ASSIGNMENT_EXPORT_COLUMNS = [
+    'projectID', 'projectName', 'developerID', 'username', 'firstName', 'lastName', 'roleInProject',
+]
+
+
+def project_export_row(proj, status_names):
+    """
+    A project as listed on the tables page
+    """
+    return {
+        'projectID': proj.projectID,
+        'projectName': proj.projectName,
+        'clientName': proj.client.companyName if proj.client else None,
+        'statusDesc': status_names.get(proj.status_id),
+        'startDate': proj.startDate,
+        'endDate': proj.endDate,
+        'daysLeft': calculate_daysleft(proj.endDate),
+        'projectProgress': proj.projectProgress or 0,
+    }
+
+
+# Exports: filters are checked before the response starts, so a bad
+# request still gets a 400; rows are then read while the body is sent.
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def export_projects_api(request):
+    """
+    GET: Download the projects of the tables page.
+         ?format=csv|ndjson, ?status=&client= filters (comma separated IDs)
+    """
+    try:
+        export_format = parse_export_format(request.GET)
+        status_ids = _parse_id_list(request.GET.get('status', ''))
+        client_ids = _parse_id_list(request.GET.get('client', ''))
+        status_names = get_status_names()
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+    chunks = (
+        [project_export_row(proj, status_names) for proj in chunk]
+        for chunk in iter_project_chunks(export_chunk_size(), status_ids, client_ids)
+    )
+    return export_response(export_format, 'projects', PROJECT_EXPORT_COLUMNS, chunks)
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def export_tasks_api(request):
+    """
+    GET: Download the kanban tasks.
+         ?format=csv|ndjson, the kanban_tasks_api filters and ?fields= projection
+    """
+    try:
+        export_format = parse_export_format(request.GET)
+        fields = _parse_kanban_fields(request.GET)
+        build_kanban_task_filters(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    chunks = iter_kanban_task_chunks(request.GET, min(export_chunk_size(), KANBAN_MAX_PAGE_SIZE))
+    return export_response(export_format, 'tasks', fields, chunks)
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def export_assignments_api(request):
+    """
+    GET: Download the developer assignments of all projects.
+         ?format=csv|ndjson, ?project=&developer= filters (comma separated IDs)
+    """
+    try:
+        export_format = parse_export_format(request.GET)
+        project_ids = _parse_id_list(request.GET.get('project', ''))
+        developer_ids = _parse_id_list(request.GET.get('developer', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    chunks = iter_assignment_chunks(export_chunk_size(), project_ids, developer_ids)
+    return export_response(export_format, 'assignments', ASSIGNMENT_EXPORT_COLUMNS, chunks)
+
+
+@login_required(login_url="/login/")
+def db_pool_stats_api(request):
+    """
+    GET: Connection pool metrics of this worker process (staff only)
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    return JsonResponse({'pools': pool_metrics()})
+
+
+@login_required(login_url="/login/")
+def outbound_http_stats_api(request):
+    """
+    GET: Circuit breaker state and latency histograms of outbound HTTP calls in this process (staff only)
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    return JsonResponse({'clients': outbound_http_metrics()})
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def job_status_api(request, job_id):
+    """
+    GET: Status of an outbound job (calendar event / invitation email).
+    Only the user who queued the job, or staff, may see it.
+    """
+    try:
+        job = get_job(job_id)
+        if job is None or (job['createdBy'] != request.user.pk and not request.user.is_staff):
+            return JsonResponse({'error': 'Job not found'}, status=404)
+        return JsonResponse(job)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required(login_url="/login/")
+@require_http_methods(["GET"])
+def jobs_status_api(request):
+    """
+    GET ?ids=1,2,3: Status of several outbound jobs at once (e.g. after a bulk invitation).
+    Jobs queued by other users are left out unless the caller is staff.
+    """
+    try:
+        job_ids = _parse_id_list(request.GET.get('ids', ''))[:MAX_BULK_INVITATIONS]
+        jobs = [
+            job for job in get_jobs(job_ids)
+            if job['createdBy'] == request.user.pk or request.user.is_staff
+        ]
+        return JsonResponse({'jobs': jobs})
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+def metrics_view(request):
+    """
+    GET: Prometheus metrics of this worker process.
+    Staff sessions, or `Authorization: Bearer <METRICS_TOKEN>` for the scraper.
+    """
+    token = settings.METRICS_TOKEN
+    authorized = bool(token) and request.META.get('HTTP_AUTHORIZATION') == f'Bearer {token}'
+    if not (authorized or (request.user.is_authenticated and request.user.is_staff)):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
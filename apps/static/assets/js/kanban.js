@@ -19,14 +19,39 @@ document.addEventListener('DOMContentLoaded', function() {
   loadKanbanData();
   loadProjects();
   loadDevelopers();
+  connectKanbanEvents();
   
-  // Add event listener for project filter
-  document.getElementById('projectFilter').addEventListener('change', filterKanbanByProject);
+  // Pages are fetched per project, so a new filter reloads the board
+  document.getElementById('projectFilter').addEventListener('change', loadKanbanData);
 });
 
-// Load kanban data from the server
-function loadKanbanData() {
-  fetch('/api/kanban-tasks/', {
+// Fields the board actually renders
+const KANBAN_FIELDS = [
+  'taskID', 'taskTitle', 'taskDescription', 'statusID', 'dueDate',
+  'projectID', 'projectName', 'assignedTo', 'assignedToName', 'priority'
+].join(',');
+
+// Cards fetched per column at a time; further pages load as the end of a
+// column scrolls into view, or from its "Load more" button
+const KANBAN_COLUMN_PAGE_SIZE = 50;
+// How far below the viewport a column's end may be when its next page is fetched
+const KANBAN_SCROLL_MARGIN_PX = 200;
+
+// Load one page of a column; the API is keyset-paginated via next_cursor
+function fetchKanbanPage(statusId, cursor) {
+  const params = new URLSearchParams({
+    fields: KANBAN_FIELDS,
+    limit: String(KANBAN_COLUMN_PAGE_SIZE),
+    status: statusId
+  });
+  const projectId = document.getElementById('projectFilter').value;
+  if (projectId) {
+    params.set('project', projectId);
+  }
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  return fetch(`/api/kanban-tasks/?${params.toString()}`, {
     method: 'GET',
     headers: {
       'Content-Type': 'application/json',
@@ -38,11 +63,35 @@ function loadKanbanData() {
       throw new Error('Failed to load tasks');
     }
     return response.json();
-  })
-  .then(data => {
-    // Store all tasks globally for filtering
-    window.allTasks = data.tasks;
-    renderKanban(data.tasks);
+  });
+}
+
+// Bumped by every full load so pages requested before it are dropped
+let kanbanLoadGeneration = 0;
+// statusID -> next_cursor of the column, null once it is fully loaded
+window.kanbanColumnCursors = {};
+const kanbanColumnsLoading = {};
+
+// Load the first page of every column
+function loadKanbanData() {
+  const generation = ++kanbanLoadGeneration;
+  const statusIds = Object.keys(statusMap);
+
+  Promise.all(statusIds.map(statusId => fetchKanbanPage(statusId, null)))
+  .then(pages => {
+    if (generation !== kanbanLoadGeneration) {
+      return;
+    }
+    // Store the loaded tasks globally for filtering
+    window.allTasks = [];
+    window.kanbanColumnCursors = {};
+    pages.forEach((data, i) => {
+      window.allTasks.push(...data.tasks);
+      window.kanbanColumnCursors[statusIds[i]] = data.next_cursor;
+    });
+    // Refreshes fetch changes since the oldest of the snapshots
+    window.kanbanWatermark = Math.min(...pages.map(data => data.watermark));
+    filterKanbanByProject();
   })
   .catch(error => {
     console.error('Error loading kanban data:', error);
@@ -50,6 +99,147 @@ function loadKanbanData() {
   });
 }
 
+// Load the next page of one column
+function loadMoreKanbanColumn(statusId) {
+  const cursor = window.kanbanColumnCursors[statusId];
+  if (!cursor || kanbanColumnsLoading[statusId]) {
+    return;
+  }
+  kanbanColumnsLoading[statusId] = true;
+  const generation = kanbanLoadGeneration;
+
+  fetchKanbanPage(statusId, cursor)
+  .then(data => {
+    if (generation !== kanbanLoadGeneration) {
+      return;
+    }
+    // A live update may have brought some of these cards in already
+    const byId = new Map(window.allTasks.map(task => [task.taskID, task]));
+    data.tasks.forEach(task => byId.set(task.taskID, task));
+    window.allTasks = Array.from(byId.values());
+    window.kanbanColumnCursors[statusId] = data.next_cursor;
+    filterKanbanByProject();
+  })
+  .catch(error => {
+    console.error('Error loading more tasks:', error);
+    showErrorMessage('Failed to load more tasks.');
+  })
+  .finally(() => {
+    kanbanColumnsLoading[statusId] = false;
+  });
+}
+
+// Apply only what changed since the last load/refresh
+function refreshKanbanData() {
+  if (window.kanbanWatermark === undefined || window.kanbanWatermark === null) {
+    loadKanbanData();
+    return;
+  }
+
+  const params = new URLSearchParams({ since: window.kanbanWatermark, fields: KANBAN_FIELDS });
+  fetch(`/api/kanban-tasks/changes/?${params.toString()}`, {
+    method: 'GET',
+    headers: {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': getCookie('csrftoken')
+    }
+  })
+  .then(response => {
+    if (!response.ok) {
+      throw new Error('Failed to load task changes');
+    }
+    return response.json();
+  })
+  .then(data => {
+    if (data.reset) {
+      // Too much changed: a full reload is cheaper
+      loadKanbanData();
+      return;
+    }
+
+    const byId = new Map(window.allTasks.map(task => [task.taskID, task]));
+    data.deleted.forEach(tombstone => byId.delete(tombstone.taskID));
+    data.tasks.forEach(task => byId.set(task.taskID, task));
+
+    window.allTasks = Array.from(byId.values());
+    window.kanbanWatermark = data.watermark;
+    filterKanbanByProject();
+  })
+  .catch(error => {
+    console.error('Error refreshing kanban data:', error);
+    loadKanbanData();
+  });
+}
+
+// Without a live stream the board polls the change feed instead
+const KANBAN_POLL_MS = 15000;
+// ...and tries the stream again after this long
+const KANBAN_STREAM_RETRY_MS = 60000;
+let kanbanPollTimer = null;
+
+function startKanbanPolling() {
+  if (kanbanPollTimer === null) {
+    kanbanPollTimer = setInterval(refreshKanbanData, KANBAN_POLL_MS);
+  }
+}
+
+function stopKanbanPolling() {
+  if (kanbanPollTimer !== null) {
+    clearInterval(kanbanPollTimer);
+    kanbanPollTimer = null;
+  }
+}
+
+// Live updates pushed by teammates' edits
+function connectKanbanEvents() {
+  if (!window.EventSource) {
+    startKanbanPolling();
+    return;
+  }
+
+  const source = new EventSource('/api/kanban-events/');
+
+  source.onopen = () => {
+    stopKanbanPolling();
+    // Catch up on anything written while the stream was down
+    if (window.kanbanWatermark !== undefined && window.kanbanWatermark !== null) {
+      refreshKanbanData();
+    }
+  };
+
+  source.addEventListener('task.updated', event => {
+    const patch = JSON.parse(event.data).task;
+    const current = (window.allTasks || []).find(task => task.taskID === patch.taskID);
+    if (!current || (current.assignedTo !== undefined && patch.assignedTo !== undefined && current.assignedTo !== patch.assignedTo)
+        || current.projectID !== patch.projectID) {
+      // Display names are not part of the event, fetch the row instead
+      refreshKanbanData();
+      return;
+    }
+    Object.assign(current, patch);
+    filterKanbanByProject();
+  });
+
+  source.addEventListener('task.created', () => refreshKanbanData());
+
+  source.addEventListener('task.deleted', event => {
+    const data = JSON.parse(event.data);
+    window.allTasks = (window.allTasks || []).filter(task => task.taskID !== data.taskID);
+    filterKanbanByProject();
+  });
+
+  source.addEventListener('resync', () => loadKanbanData());
+
+  source.onerror = () => {
+    // A non-200 response (e.g. 503 when the server is at its stream limit)
+    // closes it for good: poll, and try the stream again later
+    if (source.readyState === EventSource.CLOSED) {
+      startKanbanPolling();
+      setTimeout(connectKanbanEvents, KANBAN_STREAM_RETRY_MS);
+    }
+  };
+}
+
 // Filter kanban by selected project
 function filterKanbanByProject() {
   const selectedProjectId = document.getElementById('projectFilter').value;
@@ -66,22 +256,28 @@ function filterKanbanByProject() {
   }
 }
 
+// Watch the "Load more" buttons of the rendered columns
+let kanbanLoadMoreObservers = [];
+
 // Render the kanban board
 function renderKanban(tasks) {
   const container = document.getElementById('kanbanContainer');
   container.innerHTML = '';
+  kanbanLoadMoreObservers.forEach(observer => observer.disconnect());
+  kanbanLoadMoreObservers = [];
 
   const statusOrder = ['1', '2', '3', '4', '5'];
 
   statusOrder.forEach(statusId => {
     const statusTasks = tasks.filter(task => task.statusID === parseInt(statusId));
+    const hasMore = Boolean(window.kanbanColumnCursors[statusId]);
     
     const column = document.createElement('div');
     column.className = 'kanban-column';
     column.innerHTML = `
       <div class="kanban-column-header">
         <span>${statusMap[statusId]}</span>
-        <span class="badge">${statusTasks.length}</span>
+        <span class="badge">${statusTasks.length}${hasMore ? '+' : ''}</span>
       </div>
       <div class="kanban-cards" id="column-${statusId}">
         ${statusTasks.map(task => `
@@ -120,6 +316,7 @@ function renderKanban(tasks) {
           </div>
         `).join('')}
       </div>
+      ${hasMore ? `<button class="kanban-load-more" onclick="loadMoreKanbanColumn('${statusId}')">Load more</button>` : ''}
     `;
 
     // Add drag-over listeners
@@ -128,6 +325,19 @@ function renderKanban(tasks) {
     cardsContainer.addEventListener('drop', drop);
 
     container.appendChild(column);
+
+    // Fetch the next page once the end of the column comes into view
+    const loadMoreButton = column.querySelector('.kanban-load-more');
+    if (loadMoreButton && window.IntersectionObserver) {
+      const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+          observer.disconnect();
+          loadMoreKanbanColumn(statusId);
+        }
+      }, { rootMargin: `${KANBAN_SCROLL_MARGIN_PX}px` });
+      observer.observe(loadMoreButton);
+      kanbanLoadMoreObservers.push(observer);
+    }
   });
 }
 
@@ -192,12 +402,12 @@ function updateTaskStatus(taskId, newStatusId) {
   .then(data => {
     console.log('Task updated:', data);
     // Reload the kanban board
-    loadKanbanData();
+    refreshKanbanData();
   })
   .catch(error => {
     console.error('Error updating task status:', error);
     // Reload to revert the UI change
-    loadKanbanData();
+    refreshKanbanData();
   });
 }
 
@@ -205,9 +415,10 @@ function updateTaskStatus(taskId, newStatusId) {
 function updateColumnBadges() {
   document.querySelectorAll('.kanban-cards').forEach(column => {
     const cards = column.querySelectorAll('.kanban-card').length;
+    const hasMore = Boolean(window.kanbanColumnCursors[column.id.split('-')[1]]);
     const badge = column.parentElement.querySelector('.badge');
     if (badge) {
-      badge.textContent = cards;
+      badge.textContent = `${cards}${hasMore ? '+' : ''}`;
     }
   });
 }
@@ -340,7 +551,7 @@ function deleteTask(taskId, taskName) {
       return response.json();
     })
     .then(data => {
-      loadKanbanData();
+      refreshKanbanData();
     })
     .catch(error => {
       console.error('Error deleting task:', error);
@@ -440,7 +651,7 @@ document.getElementById('editTaskForm').addEventListener('submit', function(e) {
     document.getElementById('editSuccessMessage').classList.add('active');
     setTimeout(() => {
       closeEditTaskModal();
-      loadKanbanData();
+      refreshKanbanData();
     }, 1500);
   })
   .catch(error => {
@@ -575,7 +786,7 @@ document.getElementById('taskForm').addEventListener('submit', function(event) {
       // Get the created task ID from response if available, or fetch it
       createCalendarEvent(data.taskID || 'latest');
       closeTaskModal();
-      loadKanbanData();
+      refreshKanbanData();
     }, 1500);
   })
   .catch(error => {
@@ -0,0 +1,128 @@
+"""
+Conditional GET and compression for the JSON API (paths under API_PATH_PREFIX).
+
+Successful GET/HEAD responses get an ETag from the hash of their body
+unless the view set one, and a request whose If-None-Match matches is
+answered with an empty 304. Bodies of at least API_COMPRESSION_MIN_BYTES
+(and every streamed body) are compressed with brotli when the client
+accepts it and the optional `brotli` package is installed, otherwise with
+gzip. A compressed response's ETag is made weak, as its bytes differ from
+the identity encoding.
+
+Pages are left alone: their HTML carries the CSRF token, which compression
+would expose to BREACH-style guessing.
+"""
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+from core.instrumentation import timed
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+# Fast levels: the bodies are dynamic and compressed on every request
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(header):
+    """
+    Content codings an Accept-Encoding header allows (q > 0)
+    """
+    encodings = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        # Flush per chunk so streamed rows still reach the client as they come
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class ApiResponseMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = getattr(settings, 'API_PATH_PREFIX', '/api/')
+        self.min_bytes = getattr(settings, 'API_COMPRESSION_MIN_BYTES', 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith(self.prefix):
+            return response
+
+        if request.method in ('GET', 'HEAD') and response.status_code == 200:
+            response = self.conditional(request, response)
+        if response.status_code in (200, 304):
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if response.status_code == 200:
+            self.compress(request, response)
+        return response
+
+    def conditional(self, request, response):
+        if not response.streaming and not response.has_header('ETag'):
+            response['ETag'] = '"%s"' % hashlib.md5(response.content).hexdigest()
+        if not response.has_header('ETag'):
+            return response
+        if not response.has_header('Cache-Control'):
+            # Let browsers keep the body, but always revalidate it
+            patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(request, etag=response['ETag'], response=response)
+
+    def compress(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return
+
+        encodings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in encodings:
+            encoding = 'br'
+        elif 'gzip' in encodings:
+            encoding = 'gzip'
+        else:
+            return
+
+        with timed('compress'):
+            if response.streaming:
+                if encoding == 'br':
+                    response.streaming_content = brotli_sequence(response.streaming_content)
+                else:
+                    response.streaming_content = compress_sequence(response.streaming_content)
+                del response['Content-Length']
+            else:
+                if encoding == 'br':
+                    compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+                else:
+                    compressed = compress_string(response.content)
+                if len(compressed) >= len(response.content):
+                    return
+                response.content = compressed
+                response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag', '')
+        if etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
@@ -9,4 +9,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from apps.home.push import KANBAN_EVENTS_PATH, kanban_events_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Live kanban events are streamed outside Django's request cycle
+    if scope['type'] == 'http' and scope['path'] == KANBAN_EVENTS_PATH:
+        await kanban_events_app(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,17 @@
+"""
+MySQL database backend with a per-process connection pool.
+
+Use it as the ENGINE of a database and tune it with a POOL dict:
+
+    DATABASES['default'] = {
+        'ENGINE': 'core.db_pool',
+        ...
+        'POOL': {
+            'SIZE': 5,                # idle connections kept per process
+            'MAX_OVERFLOW': 5,        # extra connections allowed under load
+            'TIMEOUT': 10,            # seconds to wait for a free connection
+            'MAX_LIFETIME': 1800,     # seconds before a connection is recycled
+            'HEALTH_CHECK_AFTER': 30, # ping connections idle longer than this
+        },
+    }
+"""
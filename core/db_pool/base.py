@@ -0,0 +1,51 @@
+"""
+MySQL backend whose connections come from, and go back to, a ConnectionPool.
+
+Django still opens and closes "its" connection around each request (or
+keeps it for CONN_MAX_AGE seconds); closing just hands the socket back to
+the pool, so requests skip the connect/auth/init_command round trips.
+"""
+import functools
+
+from django.db.backends.mysql.base import Database, DatabaseWrapper as MySQLDatabaseWrapper
+
+from core.db_pool.pool import get_pool
+
+
+def connect(conn_params):
+    """
+    A new MySQLdb connection, made the way MySQLDatabaseWrapper.get_new_connection() does
+    """
+    connection = Database.connect(**conn_params)
+    if connection.encoders.get(bytes) is bytes:
+        connection.encoders.pop(bytes)
+    return connection
+
+
+def settings_key(conn_params):
+    # conv is the same module-level mapping for every connection
+    return repr(sorted((key, value) for key, value in conn_params.items() if key != 'conv'))
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    # The pool the current connection came from: it goes back there even if
+    # the alias has been pointed elsewhere since
+    _pool = None
+
+    def get_new_connection(self, conn_params):
+        self._pool = get_pool(
+            self.alias,
+            connect=functools.partial(connect, dict(conn_params)),
+            ping=lambda connection: connection.ping(),
+            options=self.settings_dict.get('POOL'),
+            settings_key=settings_key(conn_params),
+        )
+        return self._pool.acquire()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Never hand an open transaction to the next request
+        rollback = self.in_atomic_block or self.needs_rollback or not self.autocommit
+        discard = self.errors_occurred and not self.is_usable()
+        self._pool.release(self.connection, discard=discard, rollback=rollback)
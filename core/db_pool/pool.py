@@ -0,0 +1,247 @@
+"""
+Thread-safe pool of raw DB-API connections, one pool per process.
+
+Gunicorn forks workers after the app may already have touched the
+database (preload_app), so a pool notices when it is used from a new
+process and drops the inherited connections instead of sharing sockets.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_POOL_OPTIONS = {
+    'SIZE': 5,
+    'MAX_OVERFLOW': 5,
+    'TIMEOUT': 10,
+    'MAX_LIFETIME': 1800,
+    'HEALTH_CHECK_AFTER': 30,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class _PooledConnection:
+    __slots__ = ('connection', 'created_at', 'released_at')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    connect: zero-argument callable returning a new DB-API connection
+    ping: callable(connection) raising if the connection is dead
+    """
+
+    def __init__(self, connect, ping, options=None):
+        options = dict(DEFAULT_POOL_OPTIONS, **(options or {}))
+        self.size = int(options['SIZE'])
+        self.max_overflow = int(options['MAX_OVERFLOW'])
+        self.timeout = float(options['TIMEOUT'])
+        self.max_lifetime = float(options['MAX_LIFETIME'])
+        self.health_check_after = float(options['HEALTH_CHECK_AFTER'])
+
+        self._connect = connect
+        self._ping = ping
+        self._lock = threading.Condition()
+        self._reset_state()
+
+    def _reset_state(self):
+        self.pid = os.getpid()
+        self._idle = deque()
+        self._in_use = {}
+        # ids of connections dropped at fork; see release()
+        self._inherited = set()
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'health_check_failures': 0,
+            'discarded': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'timeouts': 0,
+        }
+
+    def _check_fork(self):
+        if self.pid != os.getpid():
+            # Inherited from the parent process: never reuse its sockets
+            inherited = set(self._in_use) | {id(pooled.connection) for pooled in self._idle}
+            self._reset_state()
+            self._inherited = inherited
+
+    @property
+    def max_connections(self):
+        return self.size + self.max_overflow
+
+    def acquire(self):
+        with self._lock:
+            self._check_fork()
+            deadline = None
+            while True:
+                while self._idle:
+                    pooled = self._idle.pop()
+                    if self._is_reusable(pooled):
+                        self._in_use[id(pooled.connection)] = pooled
+                        self.stats['reused'] += 1
+                        return pooled.connection
+
+                if len(self._in_use) < self.max_connections:
+                    # Reserve the slot, connect outside the lock
+                    placeholder = object()
+                    self._in_use[id(placeholder)] = None
+                    break
+
+                if deadline is None:
+                    deadline = time.monotonic() + self.timeout
+                    self.stats['waits'] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f"No database connection available within {self.timeout}s "
+                        f"({self.max_connections} in use)"
+                    )
+                waited_from = time.monotonic()
+                self._lock.wait(remaining)
+                self.stats['wait_seconds'] += time.monotonic() - waited_from
+
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._lock:
+                del self._in_use[id(placeholder)]
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            del self._in_use[id(placeholder)]
+            self._in_use[id(connection)] = _PooledConnection(connection)
+            self.stats['created'] += 1
+        return connection
+
+    def _is_reusable(self, pooled):
+        """
+        Called with the lock held; closes and forgets unusable connections
+        """
+        now = time.monotonic()
+        if now - pooled.created_at > self.max_lifetime:
+            self.stats['recycled'] += 1
+            self._close_quietly(pooled.connection)
+            return False
+        if now - pooled.released_at > self.health_check_after:
+            try:
+                self._ping(pooled.connection)
+            except Exception:
+                self.stats['health_check_failures'] += 1
+                self._close_quietly(pooled.connection)
+                return False
+        return True
+
+    def release(self, connection, discard=False, rollback=False):
+        """
+        Returns a connection to the pool. rollback=True ends whatever
+        transaction it still has open first; if that fails the connection
+        is closed instead, so no transaction is handed to the next user.
+        """
+        with self._lock:
+            self._check_fork()
+            owned = id(connection) in self._in_use
+            if not owned:
+                if id(connection) in self._inherited:
+                    # Checked out by the parent before fork: closing it here
+                    # would shut the parent's socket, so just forget it
+                    self._inherited.discard(id(connection))
+                else:
+                    # Not ours (e.g. acquired before close_all())
+                    self._close_quietly(connection)
+                self._lock.notify()
+                return
+
+        # Outside the lock, but the slot stays counted as in use meanwhile
+        if rollback and not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        with self._lock:
+            pooled = self._in_use.pop(id(connection), None)
+            if pooled is None:
+                # The process forked during the rollback
+                return
+            if discard or len(self._idle) >= self.size:
+                self.stats['discarded'] += 1
+                self._close_quietly(connection)
+            else:
+                pooled.released_at = time.monotonic()
+                self._idle.append(pooled)
+            self._lock.notify()
+
+    def close_all(self):
+        with self._lock:
+            while self._idle:
+                self._close_quietly(self._idle.pop().connection)
+
+    def retire(self):
+        """
+        Closes the idle connections, and every checked-out one as it is released
+        """
+        with self._lock:
+            self.size = 0
+        self.close_all()
+
+    def metrics(self):
+        with self._lock:
+            self._check_fork()
+            return dict(
+                self.stats,
+                pid=self.pid,
+                size=self.size,
+                max_overflow=self.max_overflow,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+            )
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, connect, ping, options=None, settings_key=None):
+    """
+    Returns the process-wide pool for a database alias, creating it on first use.
+
+    The pool outlives the DatabaseWrapper (one per thread) that created it,
+    so `connect` must carry its own connection parameters. settings_key
+    identifies those parameters: when it changes (the alias now points at
+    another server or account) the old pool is retired and a new one built.
+    """
+    entry = _pools.get(alias)
+    if entry is None or entry[0] != settings_key:
+        with _pools_lock:
+            entry = _pools.get(alias)
+            if entry is None or entry[0] != settings_key:
+                if entry is not None:
+                    entry[1].retire()
+                entry = _pools[alias] = (settings_key, ConnectionPool(connect, ping, options))
+    return entry[1]
+
+
+def pool_metrics():
+    """
+    {alias: metrics} for every pool created in this process
+    """
+    return {alias: pool.metrics() for alias, (settings_key, pool) in list(_pools.items())}
@@ -0,0 +1,145 @@
+"""
+Tests for the connection pool, with fake DB-API connections.
+
+    python manage.py test core.db_pool
+"""
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.db_pool.pool import ConnectionPool, PoolTimeout, get_pool, pool_metrics
+
+
+class FakeConnection:
+
+    def __init__(self, rollback_fails=False):
+        self.closed = False
+        self.rollbacks = 0
+        self.rollback_fails = rollback_fails
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.rollback_fails:
+            raise OSError('server has gone away')
+
+    def close(self):
+        self.closed = True
+
+
+def fake_pool(connect=FakeConnection, ping=lambda connection: None, **options):
+    return ConnectionPool(connect, ping, dict({'SIZE': 2, 'MAX_OVERFLOW': 1, 'TIMEOUT': 0.05}, **options))
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def test_released_connection_is_reused(self):
+        pool = fake_pool()
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        metrics = pool.metrics()
+        self.assertEqual((metrics['created'], metrics['reused'], metrics['in_use']), (1, 1, 1))
+
+    def test_checkout_is_bounded_by_size_plus_overflow(self):
+        pool = fake_pool()
+        held = [pool.acquire() for _ in range(3)]
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.metrics()['timeouts'], 1)
+
+        # A release wakes a waiting thread
+        pool.timeout = 5
+        waiter = []
+        thread = threading.Thread(target=lambda: waiter.append(pool.acquire()))
+        thread.start()
+        pool.release(held.pop())
+        thread.join()
+        self.assertEqual(len(waiter), 1)
+
+    def test_overflow_connections_are_closed_on_release(self):
+        pool = fake_pool()
+        held = [pool.acquire() for _ in range(3)]
+        for connection in held:
+            pool.release(connection)
+        self.assertEqual(pool.metrics()['idle'], 2)
+        self.assertEqual(sum(c.closed for c in held), 1)
+
+    def test_release_rolls_back_open_transaction(self):
+        pool = fake_pool()
+        connection = pool.acquire()
+        pool.release(connection, rollback=True)
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertIs(pool.acquire(), connection)
+
+    def test_failed_rollback_discards_connection(self):
+        pool = fake_pool(connect=lambda: FakeConnection(rollback_fails=True))
+        connection = pool.acquire()
+        pool.release(connection, rollback=True)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.metrics()['idle'], 0)
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_dead_idle_connection_is_replaced(self):
+        def ping(connection):
+            raise OSError('gone')
+
+        pool = fake_pool(ping=ping, HEALTH_CHECK_AFTER=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.metrics()['health_check_failures'], 1)
+
+    def test_old_connection_is_recycled(self):
+        pool = fake_pool(MAX_LIFETIME=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertEqual(pool.metrics()['recycled'], 1)
+
+    def test_forked_process_never_reuses_parent_connections(self):
+        pool = fake_pool()
+        parent_connection = pool.acquire()
+        idle_connection = pool.acquire()
+        pool.release(idle_connection)
+
+        with mock.patch('core.db_pool.pool.os.getpid', return_value=pool.pid + 1):
+            child_connection = pool.acquire()
+            self.assertNotIn(child_connection, (parent_connection, idle_connection))
+            metrics = pool.metrics()
+            self.assertEqual((metrics['created'], metrics['in_use'], metrics['idle']), (1, 1, 0))
+            # Returning a connection checked out before the fork leaves the child pool alone
+            pool.release(parent_connection)
+            self.assertEqual(pool.metrics()['in_use'], 1)
+        # Inherited sockets are dropped, not closed: the parent still uses them
+        self.assertFalse(parent_connection.closed or idle_connection.closed)
+
+
+@mock.patch.dict('core.db_pool.pool._pools', clear=True)
+class GetPoolTests(SimpleTestCase):
+
+    def get(self, settings_key, connect=FakeConnection):
+        return get_pool('default', connect, lambda connection: None, {'SIZE': 2}, settings_key=settings_key)
+
+    def test_pool_is_shared_per_alias_and_settings(self):
+        pool = self.get('primary')
+        self.assertIs(self.get('primary', connect=mock.Mock()), pool)
+        self.assertEqual(list(pool_metrics()), ['default'])
+
+    def test_changed_settings_retire_the_old_pool(self):
+        old_pool = self.get('primary')
+        idle, held = old_pool.acquire(), old_pool.acquire()
+        old_pool.release(idle)
+
+        replica = FakeConnection()
+        new_pool = self.get('replica', connect=lambda: replica)
+        self.assertIsNot(new_pool, old_pool)
+        # New connections use the new pool's own connect, not the first caller's
+        self.assertIs(new_pool.acquire(), replica)
+        self.assertTrue(idle.closed)
+
+        # A connection checked out before the switch is closed on its way back
+        old_pool.release(held)
+        self.assertTrue(held.closed)
+        self.assertEqual(old_pool.metrics()['idle'], 0)
@@ -0,0 +1,57 @@
+"""
+JSON encoding for large API payloads.
+
+Uses orjson when it is installed and the standard library otherwise; both
+produce the same compact output. Dates are encoded natively as
+"YYYY-MM-DD" (datetimes as ISO 8601), so DB rows can be passed through as
+they come from the cursor without formatting each value in Python.
+"""
+import datetime
+import decimal
+import json
+
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+
+def _default(value):
+    # Only reached for types neither encoder handles natively
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(default=_default, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps(value):
+    """
+    Serializes `value` to UTF-8 encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return _encoder.encode(value).encode('utf-8')
+
+
+def dumps_array_items(values):
+    """
+    Items of a list as JSON without the enclosing brackets, for streaming
+    an array chunk by chunk with one encoder call per chunk
+    """
+    return dumps(values)[1:-1]
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    JsonResponse counterpart encoded with dumps()
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,240 @@
+"""
+Per-request query and latency instrumentation.
+
+InstrumentationMiddleware wraps every request and records, per URL name:
+the number of SQL queries and the time spent in them (through
+connection.execute_wrapper), the time spent rendering templates (through
+InstrumentedDjangoTemplates, the TEMPLATES backend) and in code wrapped by
+timed('serialize') or timed('compress'). The per-process totals are
+available in Prometheus text format from render_request_metrics()
+(served by apps.home at /metrics/). With INSTRUMENTATION_SERVER_TIMING on,
+each response also carries these numbers in a Server-Timing header; that
+exposes query counts and DB timings to whoever made the request, so it is
+off by default and meant for development.
+
+A request that runs the same SQL statement more than
+INSTRUMENTATION_NPLUSONE_THRESHOLD times is logged as a likely N+1 query.
+
+Queries issued while a StreamingHttpResponse is consumed happen after the
+middleware has returned and are not counted.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger('planny.instrumentation')
+
+# Upper bounds (seconds) of the request duration histogram
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ('render', 'serialize', 'compress')
+
+_current = contextvars.ContextVar('planny_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_seconds', 'phases', 'statements')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.statements = Counter()
+
+    def record_query(self, sql, seconds):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[sql] += 1
+
+
+@contextmanager
+def timed(phase):
+    """
+    Adds the time spent in the block to `phase` of the current request, if any
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] = metrics.phases.get(phase, 0.0) + time.perf_counter() - started
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+class _TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timed('render'):
+            return super().render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    DjangoTemplates backend whose templates report their render time
+    """
+
+    def from_string(self, template_code):
+        return _TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return _TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+class _ViewStats:
+    __slots__ = ('responses', 'duration_buckets', 'duration_sum', 'queries', 'db_seconds', 'phases', 'n_plus_one')
+
+    def __init__(self):
+        self.responses = Counter()
+        self.duration_buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.n_plus_one = 0
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _observe(view, method, status, duration, metrics, n_plus_one):
+    bucket = 0
+    while bucket < len(DURATION_BUCKETS) and duration > DURATION_BUCKETS[bucket]:
+        bucket += 1
+    with _stats_lock:
+        stats = _stats.get(view)
+        if stats is None:
+            stats = _stats[view] = _ViewStats()
+        stats.responses[(method, status)] += 1
+        stats.duration_buckets[bucket] += 1
+        stats.duration_sum += duration
+        stats.queries += metrics.queries
+        stats.db_seconds += metrics.db_seconds
+        for phase, seconds in metrics.phases.items():
+            stats.phases[phase] = stats.phases.get(phase, 0.0) + seconds
+        if n_plus_one:
+            stats.n_plus_one += 1
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.view_name
+
+
+def _server_timing(metrics, duration):
+    entries = [f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"']
+    for phase, seconds in metrics.phases.items():
+        if seconds:
+            entries.append(f'{phase};dur={seconds * 1000:.1f}')
+    entries.append(f'total;dur={duration * 1000:.1f}')
+    return ', '.join(entries)
+
+
+class InstrumentationMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', False)
+        self.n_plus_one_threshold = getattr(settings, 'INSTRUMENTATION_NPLUSONE_THRESHOLD', 20)
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - started
+
+        view = _view_name(request)
+        n_plus_one = False
+        if metrics.statements:
+            sql, count = metrics.statements.most_common(1)[0]
+            if count > self.n_plus_one_threshold:
+                n_plus_one = True
+                logger.warning(
+                    "Possible N+1 in %s (%s %s): %d queries, one statement ran %d times: %s",
+                    view, request.method, request.path, metrics.queries, count, ' '.join(sql.split())[:300]
+                )
+        _observe(view, request.method, response.status_code, duration, metrics, n_plus_one)
+
+        if self.server_timing:
+            response['Server-Timing'] = _server_timing(metrics, duration)
+        return response
+
+
+def format_metric(name, metric_type, help_text, samples):
+    """
+    Prometheus text exposition for one metric.
+    samples: [(labels dict, value)] or [(suffix, labels dict, value)]
+    """
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+    for sample in samples:
+        suffix, labels, value = sample if len(sample) == 3 else ('', *sample)
+        label_text = ','.join(
+            '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for k, v in labels.items()
+        )
+        lines.append(f'{name}{suffix}{{{label_text}}} {value}' if label_text else f'{name}{suffix} {value}')
+    return '\n'.join(lines)
+
+
+def render_request_metrics():
+    """
+    Per-view request metrics of this process in Prometheus text format
+    """
+    with _stats_lock:
+        snapshot = list(_stats.items())
+        responses, durations, queries, db_seconds, phases, n_plus_one = [], [], [], [], [], []
+        for view, stats in snapshot:
+            for (method, status), count in sorted(stats.responses.items()):
+                responses.append(({'view': view, 'method': method, 'status': status}, count))
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ('+Inf',), stats.duration_buckets):
+                cumulative += count
+                durations.append(('_bucket', {'view': view, 'le': bound}, cumulative))
+            durations.append(('_sum', {'view': view}, round(stats.duration_sum, 6)))
+            durations.append(('_count', {'view': view}, cumulative))
+            queries.append(({'view': view}, stats.queries))
+            db_seconds.append(({'view': view}, round(stats.db_seconds, 6)))
+            for phase, seconds in stats.phases.items():
+                phases.append(({'view': view, 'phase': phase}, round(seconds, 6)))
+            n_plus_one.append(({'view': view}, stats.n_plus_one))
+
+    return '\n'.join([
+        format_metric('planny_http_responses_total', 'counter', 'Responses by view, method and status', responses),
+        format_metric('planny_http_request_duration_seconds', 'histogram', 'Request wall time by view', durations),
+        format_metric('planny_db_queries_total', 'counter', 'SQL queries issued by view', queries),
+        format_metric('planny_db_query_seconds_total', 'counter', 'Time spent in SQL by view', db_seconds),
+        format_metric('planny_phase_seconds_total', 'counter', 'Template render / serialize / compress time by view', phases),
+        format_metric('planny_n_plus_one_requests_total', 'counter', 'Requests flagged as likely N+1', n_plus_one),
+    ])
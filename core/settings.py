@@ -4,6 +4,7 @@ Copyright (c) 2019 - present AppSeed.us
 """
 
 import os
+import dj_database_url
 from decouple import config
 from unipath import Path
 
@@ -41,6 +42,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.instrumentation.InstrumentationMiddleware',
+    'core.api_middleware.ApiResponseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -56,7 +59,8 @@ TEMPLATE_DIR = os.path.join(CORE_DIR, "apps/templates")  # ROOT dir for template
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that also reports render time (see core/instrumentation.py)
+        'BACKEND': 'core.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [TEMPLATE_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -79,7 +83,7 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'core.db_pool',   # MySQL with a per-process connection pool (see core/db_pool)
         'NAME': 'planny',           # database name (use 'planny', not a .sql filename)
         'USER': 'root',
         'PASSWORD': 'atiqah03',
@@ -88,9 +92,57 @@ DATABASES = {
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
         },
+        # Closing a connection returns it to the pool, so Django can release it after every request
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+        'POOL': {
+            'SIZE': config('DB_POOL_SIZE', default=5, cast=int),
+            'MAX_OVERFLOW': config('DB_POOL_MAX_OVERFLOW', default=5, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=int),
+            'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=1800, cast=int),
+            'HEALTH_CHECK_AFTER': config('DB_POOL_HEALTH_CHECK_AFTER', default=30, cast=int),
+        },
     }
 }
 
+# Point at another database (e.g. sqlite:///planny-bench.sqlite3 for the test suite) without editing this file
+if config('DATABASE_URL', default=''):
+    DATABASES['default'] = dj_database_url.parse(config('DATABASE_URL'))
+
+# ETags, 304s and compression for the JSON API (see core/api_middleware.py).
+# Brotli is used when the optional brotli package is installed, gzip otherwise.
+API_PATH_PREFIX = '/api/'
+API_COMPRESSION_MIN_BYTES = config('API_COMPRESSION_MIN_BYTES', default=1024, cast=int)
+
+# Rows per query of the CSV / NDJSON exports (see apps/home/exports.py)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=1000, cast=int)
+
+# Shared by the reference-data, timeline and ICS feed caches. Per-process memory
+# by default; CACHE_URL=redis://host:6379/1 shares one cache between all
+# workers (needs the optional django-redis package)
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'planny',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Seconds clients, developers, statuses and project names stay cached
+# (see apps/home/reference_cache.py); writes through Django drop them sooner
+REFERENCE_CACHE_TIMEOUT = config('REFERENCE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Builds the raw home tables for test databases
+TEST_RUNNER = 'apps.home.test_runner.HomeSchemaTestRunner'
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
@@ -147,3 +199,48 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_USE_SSL = config('EMAIL_USE_SSL', default=False, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+
+# Live kanban updates (see apps/home/broker.py)
+# Empty = in-process fan-out; set to redis://host:6379/0 for multi-process deployments
+BROKER_URL = config('BROKER_URL', default='')
+# WSGI event streams (apps/home/push.py): each holds a worker thread, so they
+# are capped per process and end after a while for the browser to reconnect.
+# Boards over the cap get a 503 and poll the change feed instead (kanban.js)
+KANBAN_EVENTS_MAX_STREAMS = config('KANBAN_EVENTS_MAX_STREAMS', default=2, cast=int)
+KANBAN_EVENTS_MAX_SECONDS = config('KANBAN_EVENTS_MAX_SECONDS', default=300, cast=int)
+
+# Google Apps Script web app used for calendar events and invitation emails
+# (called from the outbound job worker, see apps/home/jobs.py)
+GAS_WEBAPP_URL = config(
+    'GAS_WEBAPP_URL',
+    default='https://script.google.com/macros/s/AKfycbxSsqctRAjksqA2oKixnFnqiwMsodEfNu8ytMlw70X3l1of0OpOLmRMvSNbiIgzdfXp/exec'
+)
+GAS_CONNECT_TIMEOUT = config('GAS_CONNECT_TIMEOUT', default=3.05, cast=float)
+GAS_READ_TIMEOUT = config('GAS_READ_TIMEOUT', default=30, cast=float)
+# Consecutive failures before failing fast, and seconds before a trial call
+GAS_CIRCUIT_FAILURES = config('GAS_CIRCUIT_FAILURES', default=5, cast=int)
+GAS_CIRCUIT_RESET_SECONDS = config('GAS_CIRCUIT_RESET_SECONDS', default=30, cast=float)
+# Outbound calls per second per worker process (0 = unlimited), and worker threads
+GAS_RATE_LIMIT = config('GAS_RATE_LIMIT', default=5, cast=float)
+OUTBOUND_JOB_CONCURRENCY = config('OUTBOUND_JOB_CONCURRENCY', default=4, cast=int)
+
+# Request instrumentation (core/instrumentation.py)
+# Server-Timing response header with the query count and DB time: visible to
+# every client, so off unless asked for
+INSTRUMENTATION_SERVER_TIMING = config('INSTRUMENTATION_SERVER_TIMING', default=False, cast=bool)
+# Executions of one SQL statement in a request above which it is logged as an N+1
+INSTRUMENTATION_NPLUSONE_THRESHOLD = config('INSTRUMENTATION_NPLUSONE_THRESHOLD', default=20, cast=int)
+# Bearer token for the Prometheus scraper on /metrics/ (empty = staff sessions only)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps': {'handlers': ['console'], 'level': config('APP_LOG_LEVEL', default='INFO')},
+        'planny': {'handlers': ['console'], 'level': config('APP_LOG_LEVEL', default='INFO')},
+    },
+}
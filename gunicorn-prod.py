@@ -0,0 +1,167 @@
+# -*- encoding: utf-8 -*-
+"""
+Production gunicorn profile.
+
+    gunicorn --config gunicorn-prod.py
+
+Opt-in: the Dockerfile and Procfile keep the single sync worker until a
+load_test run against production-like hardware shows this profile winning.
+
+Workers are sized from the CPUs and memory available to the container
+(cgroup limits included); threads let one worker keep serving while a
+request waits on MySQL. Every value can be pinned through the environment:
+
+    GUNICORN_WORKER_CLASS   gthread (default) | uvicorn | sync
+    GUNICORN_WORKERS        default: min(2 * CPUs + 1, memory / GUNICORN_WORKER_MEMORY_MB)
+    GUNICORN_THREADS        gthread threads per worker (default 4, capped at the DB pool size)
+    GUNICORN_WORKER_MEMORY_MB   expected resident size of one worker (default 200)
+    GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER   worker recycling (default 1000 / 100)
+    GUNICORN_BIND, GUNICORN_TIMEOUT, GUNICORN_LOGLEVEL
+
+uvicorn workers (pip install uvicorn) serve core.asgi, where the live kanban
+stream at /api/kanban-events/ costs no worker thread. Under gthread the
+stream is a regular view holding one thread per open board, capped by
+KANBAN_EVENTS_MAX_STREAMS per worker; sync workers refuse it and boards
+poll. Django 3.2 runs sync views one at a time per ASGI worker, so uvicorn
+needs more workers for the same page throughput.
+
+With more than one worker, live events only reach boards connected to the
+worker that handled the write unless BROKER_URL points at Redis; the
+master logs a warning at startup when it is missing.
+
+`python manage.py load_test` compares this profile with gunicorn-cfg.py.
+"""
+import multiprocessing
+import os
+
+# Not `from decouple import config`: gunicorn reads every module-level name
+# here as a setting, and `config` is one
+import decouple
+
+
+def _env_int(name, default):
+    value = os.environ.get(name, '')
+    return int(value) if value.strip() else default
+
+
+def cpu_count():
+    """
+    CPUs this process may use: affinity mask, then the cgroup v2 / v1 quota
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+
+    quota = None
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            limit, period = f.read().split()
+            if limit != 'max':
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+                limit = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota:
+        cpus = min(cpus, max(1, int(quota + 0.5)))
+    return max(1, cpus)
+
+
+def memory_mb():
+    """
+    Memory available to this container in MB (cgroup limit, else MemTotal), or None
+    """
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+            # cgroup v1 reports "unlimited" as a huge number
+            if value != 'max' and int(value) < 1 << 60:
+                return int(value) // (1024 * 1024)
+        except (OSError, ValueError):
+            continue
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def autotune_workers(cpus, mem_mb, worker_mem_mb):
+    workers = 2 * cpus + 1
+    if mem_mb:
+        # Leave a quarter of the memory to the master, page cache and spikes
+        workers = min(workers, int(mem_mb * 0.75) // worker_mem_mb)
+    return max(1, workers)
+
+
+WORKER_CLASSES = {
+    'gthread': 'gthread',
+    'sync': 'sync',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+_worker_kind = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread').strip().lower()
+if _worker_kind not in WORKER_CLASSES:
+    raise ValueError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, got {_worker_kind!r}")
+
+worker_class = WORKER_CLASSES[_worker_kind]
+wsgi_app = 'core.asgi:application' if _worker_kind == 'uvicorn' else 'core.wsgi:application'
+
+# $PORT is what Heroku-style platforms assign
+bind = os.environ.get('GUNICORN_BIND') or '0.0.0.0:%s' % os.environ.get('PORT', '5005')
+
+workers = _env_int('GUNICORN_WORKERS', 0) or autotune_workers(
+    cpu_count(), memory_mb(), _env_int('GUNICORN_WORKER_MEMORY_MB', 200)
+)
+
+# Each thread holds its own DB connection, so more threads than the pool
+# can hand out (core/db_pool) would only queue on the pool timeout
+_db_pool_capacity = _env_int('DB_POOL_SIZE', 5) + _env_int('DB_POOL_MAX_OVERFLOW', 5)
+threads = min(_env_int('GUNICORN_THREADS', 4), _db_pool_capacity) if _worker_kind == 'gthread' else 1
+
+# Import the app once in the master; workers share its pages copy-on-write.
+# core/db_pool and the outbound HTTP client drop anything inherited across fork.
+preload_app = True
+
+# Recycle workers to bound slow memory growth; the jitter keeps them from
+# all restarting at the same moment
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = 30
+# Behind nginx, which keeps its own client connections
+keepalive = 5
+
+# Heartbeat files on tmpfs: a disk-backed /tmp can stall workers under Docker
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+capture_output = True
+
+
+def when_ready(server):
+    server.log.info(
+        "Serving %s with %d %s worker(s) x %d thread(s), max_requests=%d (+%d jitter)",
+        wsgi_app, workers, _worker_kind, threads, max_requests, max_requests_jitter,
+    )
+    if workers > 1 and not decouple.config('BROKER_URL', default=''):
+        server.log.warning(
+            "BROKER_URL is not set: with %d workers, live kanban events only reach boards "
+            "connected to the worker that handled the change. Set BROKER_URL=redis://... "
+            "(or GUNICORN_WORKERS=1).", workers,
+        )